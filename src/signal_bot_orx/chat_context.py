@@ -4,15 +4,16 @@ import time
 from dataclasses import dataclass
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ChatTurn:
     role: str
     content: str
 
 
-@dataclass
+@dataclass(slots=True)
 class _Conversation:
-    turns: list[ChatTurn]
+    # Rebuilt on append so get_history can hand out the same tuple unchanged.
+    turns: tuple[ChatTurn, ...]
     expires_at: float
 
 
@@ -31,7 +32,7 @@ class ChatContextStore:
             return ()
 
         conversation.expires_at = now + self._ttl_seconds
-        return tuple(conversation.turns)
+        return conversation.turns
 
     def append_turn(
         self,
@@ -45,19 +46,15 @@ class ChatContextStore:
 
         conversation = self._conversations.get(conversation_key)
         if conversation is None:
-            conversation = _Conversation(turns=[], expires_at=now + self._ttl_seconds)
+            conversation = _Conversation(turns=(), expires_at=now + self._ttl_seconds)
             self._conversations[conversation_key] = conversation
 
-        conversation.turns.extend(
-            (
-                ChatTurn(role="user", content=user_text),
-                ChatTurn(role="assistant", content=assistant_text),
-            )
-        )
-
         max_messages = self._max_turns * 2
-        if len(conversation.turns) > max_messages:
-            conversation.turns = conversation.turns[-max_messages:]
+        conversation.turns = (
+            *conversation.turns,
+            ChatTurn(role="user", content=user_text),
+            ChatTurn(role="assistant", content=assistant_text),
+        )[-max_messages:]
 
         conversation.expires_at = now + self._ttl_seconds
 
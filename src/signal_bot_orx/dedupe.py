@@ -4,22 +4,42 @@ import time
 
 
 class DedupeCache:
+    """Remembers keys for at least ``ttl_seconds`` and less than twice that.
+
+    Keys live in two generations that rotate on a fixed ``ttl_seconds`` grid
+    measured from construction, so expiry drops a whole set at once instead of
+    scanning every key on each call.
+    """
+
     def __init__(self, ttl_seconds: int = 300) -> None:
         self._ttl_seconds = ttl_seconds
-        self._seen: dict[str, float] = {}
+        self._current: set[str] = set()
+        self._previous: set[str] = set()
+        self._rotate_at = time.monotonic() + ttl_seconds
 
     def mark_once(self, key: str) -> bool:
-        now = time.monotonic()
-        self._purge(now)
+        self._rotate(time.monotonic())
 
-        expires_at = self._seen.get(key)
-        if expires_at and expires_at > now:
+        if key in self._current or key in self._previous:
             return False
 
-        self._seen[key] = now + self._ttl_seconds
+        self._current.add(key)
         return True
 
-    def _purge(self, now: float) -> None:
-        expired = [key for key, expires_at in self._seen.items() if expires_at <= now]
-        for key in expired:
-            del self._seen[key]
+    def clear(self) -> None:
+        self._current.clear()
+        self._previous.clear()
+
+    def _rotate(self, now: float) -> None:
+        if now < self._rotate_at:
+            return
+        # Whole generations elapsed since the boundary that was due.
+        missed = int((now - self._rotate_at) // self._ttl_seconds)
+        if missed:
+            # Idle past a full generation: everything remembered has expired.
+            self._previous = set()
+        else:
+            self._previous = self._current
+        self._current = set()
+        # Stay on the grid so a late call cannot stretch a generation.
+        self._rotate_at += (missed + 1) * self._ttl_seconds
@@ -11,7 +11,7 @@ import httpx
 from signal_bot_orx.parsing import first_non_empty_str
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ResolvedGroupRecipients:
     recipients: tuple[str, ...]
     cache_refreshed: bool
@@ -32,17 +32,25 @@ class GroupResolver:
         self._refresh_ttl_seconds = refresh_ttl_seconds
         self._alias_to_canonical: dict[str, str] = {}
         self._last_refresh_monotonic: float | None = None
+        # group_id -> cache-hit result; rebuilt whenever the alias map changes.
+        self._resolved_hits: dict[str, ResolvedGroupRecipients] = {}
 
     async def resolve(self, group_id: str) -> ResolvedGroupRecipients:
+        cached = self._resolved_hits.get(group_id)
+        if cached is not None:
+            return cached
+
         resolved = self._lookup(group_id)
         if resolved is not None:
-            return ResolvedGroupRecipients(
+            hit = ResolvedGroupRecipients(
                 recipients=_merge_candidates(
                     resolved,
                     _compat_group_recipients(group_id),
                 ),
                 cache_refreshed=False,
             )
+            self._resolved_hits[group_id] = hit
+            return hit
 
         refreshed = await self._refresh_alias_cache()
         if refreshed:
@@ -91,6 +99,7 @@ class GroupResolver:
 
             if updated_aliases:
                 self._alias_to_canonical = updated_aliases
+                self._resolved_hits.clear()
 
         self._last_refresh_monotonic = now
         return refreshed
@@ -20,13 +20,18 @@ from signal_bot_orx.weather_client import OpenWeatherClient
 from signal_bot_orx.webhook import WebhookHandler, build_router
 from signal_bot_orx.whatsapp_client import WhatsAppClient
 
+# Text, image and follow-up sends often go out back to back; keep connections
+# warm and let HTTPS upstreams multiplex over HTTP/2.
+_HTTP_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+
 
 def create_app(settings: Settings) -> FastAPI:
-    http_client = httpx.AsyncClient()
+    http_client = httpx.AsyncClient(http2=True, limits=_HTTP_LIMITS)
 
     @asynccontextmanager
     async def lifespan(_: FastAPI):
         yield
+        await search_service.aclose()
         await http_client.aclose()
 
     app = FastAPI(title="signal-bot-orx", version="2.0", lifespan=lifespan)
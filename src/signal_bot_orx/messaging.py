@@ -1,9 +1,14 @@
 from __future__ import annotations
 
+import asyncio
+import base64
 from typing import Protocol
 
 from signal_bot_orx.types import Target
 
+# Below this size encoding inline is cheaper than a thread hop.
+_BASE64_OFFLOAD_THRESHOLD = 64 * 1024
+
 
 class MessageSendError(Exception):
     pass
@@ -27,3 +32,10 @@ class MessengerClient(Protocol):
         caption: str | None = None,
         fallback_recipient: str | None = None,
     ) -> None: ...
+
+
+async def encode_base64(data: bytes) -> bytes:
+    if len(data) <= _BASE64_OFFLOAD_THRESHOLD:
+        return base64.b64encode(data)
+    # Multi-megabyte images would otherwise stall the event loop while encoding.
+    return await asyncio.to_thread(base64.b64encode, data)
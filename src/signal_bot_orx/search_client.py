@@ -27,7 +27,7 @@ class SearchError(Exception):
         self.user_message = user_message
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class SearchResult:
     mode: SearchMode
     title: str
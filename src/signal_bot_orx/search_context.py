@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import time
+from collections import OrderedDict
 from dataclasses import dataclass
 
 from signal_bot_orx.search_client import SearchMode, SearchResult
@@ -54,15 +55,22 @@ class PendingJmailSelectionState:
 
 
 class SearchContextStore:
+    # Every entry shares one TTL and timestamps come from time.monotonic(), so
+    # keeping each map in write order (move_to_end on write) also keeps it in
+    # expiry order: purging only pops stale entries off the front.
     def __init__(
         self, *, ttl_seconds: int, max_records_per_conversation: int = 40
     ) -> None:
         self._ttl_seconds = max(1, ttl_seconds)
         self._max_records_per_conversation = max(1, max_records_per_conversation)
-        self._records: dict[str, list[SourceRecord]] = {}
-        self._pending_followups: dict[str, PendingFollowupState] = {}
-        self._pending_video_selections: dict[str, PendingVideoSelectionState] = {}
-        self._pending_jmail_selections: dict[str, PendingJmailSelectionState] = {}
+        self._records: OrderedDict[str, list[SourceRecord]] = OrderedDict()
+        self._pending_followups: OrderedDict[str, PendingFollowupState] = OrderedDict()
+        self._pending_video_selections: OrderedDict[str, PendingVideoSelectionState] = (
+            OrderedDict()
+        )
+        self._pending_jmail_selections: OrderedDict[str, PendingJmailSelectionState] = (
+            OrderedDict()
+        )
 
     def remember_results(
         self,
@@ -78,6 +86,7 @@ class SearchContextStore:
             return
 
         bucket = self._records.setdefault(conversation_key, [])
+        self._records.move_to_end(conversation_key)
         for result in results:
             claim_key = _claim_key(result)
             bucket.append(
@@ -106,7 +115,7 @@ class SearchContextStore:
         now = time.monotonic()
         self._purge(now)
 
-        records = self._records.get(conversation_key, [])
+        records = self._live_records(conversation_key, now)
         if not records:
             return []
 
@@ -139,7 +148,7 @@ class SearchContextStore:
         now = time.monotonic()
         self._purge(now)
 
-        records = self._records.get(conversation_key, [])
+        records = self._live_records(conversation_key, now)
         if not records:
             return []
 
@@ -163,6 +172,7 @@ class SearchContextStore:
             created_at=now,
             attempts=0,
         )
+        self._pending_followups.move_to_end(conversation_key)
 
     def get_pending_followup(
         self,
@@ -218,6 +228,7 @@ class SearchContextStore:
             results=tuple(selections),
             created_at=now,
         )
+        self._pending_video_selections.move_to_end(conversation_key)
 
     def get_pending_video_selection(
         self,
@@ -255,6 +266,7 @@ class SearchContextStore:
             results=tuple(selections),
             created_at=now,
         )
+        self._pending_jmail_selections.move_to_end(conversation_key)
 
     def get_pending_jmail_selection(
         self,
@@ -267,45 +279,49 @@ class SearchContextStore:
     def clear_pending_jmail_selection(self, conversation_key: str) -> None:
         self._pending_jmail_selections.pop(conversation_key, None)
 
-    def _purge(self, now: float) -> None:
-        expired_keys: list[str] = []
-        for conversation_key, records in self._records.items():
-            kept = [
-                record
-                for record in records
-                if record.created_at + self._ttl_seconds > now
-            ]
-            if kept:
-                self._records[conversation_key] = kept
-            else:
-                expired_keys.append(conversation_key)
+    def _live_records(self, conversation_key: str, now: float) -> list[SourceRecord]:
+        records = self._records.get(conversation_key)
+        if not records:
+            return []
+
+        # Records within a bucket are appended oldest-first; drop the expired
+        # prefix only when this conversation is read.
+        expired = 0
+        while (
+            expired < len(records)
+            and records[expired].created_at + self._ttl_seconds <= now
+        ):
+            expired += 1
+        if expired:
+            del records[:expired]
+        return records
 
-        for conversation_key in expired_keys:
+    def _purge(self, now: float) -> None:
+        # A bucket's newest record is its last one, so a bucket at the front is
+        # fully expired exactly when that record is.
+        while self._records:
+            conversation_key, records = next(iter(self._records.items()))
+            if records[-1].created_at + self._ttl_seconds > now:
+                break
             del self._records[conversation_key]
 
-        pending_expired = [
-            key
-            for key, pending in self._pending_followups.items()
-            if pending.created_at + self._ttl_seconds <= now
-        ]
-        for key in pending_expired:
-            del self._pending_followups[key]
-
-        pending_video_expired = [
-            key
-            for key, pending in self._pending_video_selections.items()
-            if pending.created_at + self._ttl_seconds <= now
-        ]
-        for key in pending_video_expired:
-            del self._pending_video_selections[key]
-
-        pending_jmail_expired = [
-            key
-            for key, pending in self._pending_jmail_selections.items()
-            if pending.created_at + self._ttl_seconds <= now
-        ]
-        for key in pending_jmail_expired:
-            del self._pending_jmail_selections[key]
+        _purge_pending(self._pending_followups, now, self._ttl_seconds)
+        _purge_pending(self._pending_video_selections, now, self._ttl_seconds)
+        _purge_pending(self._pending_jmail_selections, now, self._ttl_seconds)
+
+
+def _purge_pending(
+    pending: OrderedDict[str, PendingFollowupState]
+    | OrderedDict[str, PendingVideoSelectionState]
+    | OrderedDict[str, PendingJmailSelectionState],
+    now: float,
+    ttl_seconds: int,
+) -> None:
+    while pending:
+        key, state = next(iter(pending.items()))
+        if state.created_at + ttl_seconds > now:
+            break
+        del pending[key]
 
 
 def _claim_key(result: SearchResult) -> str:
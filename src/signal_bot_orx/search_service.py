@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 import re
+import time
+from collections import OrderedDict
 from dataclasses import dataclass
 from typing import Protocol
 
@@ -34,6 +37,13 @@ _FOLLOWUP_CLARIFICATION_TEXT = "Who are you referring to?"
 _FOLLOWUP_CONFIDENCE_THRESHOLD = 0.7
 _PENDING_REPLY_MAX_WORDS = 6
 _FOLLOWUP_SUBJECT_PLACEHOLDER = "{subject}"
+_THUMBNAIL_CACHE_MAX_ENTRIES = 128
+_THUMBNAIL_CACHE_TTL_SECONDS = 600.0
+_THUMBNAIL_PREFETCH_CONCURRENCY = 5
+# Only the top results are likely picks; the rest are fetched on demand.
+_THUMBNAIL_PREFETCH_LIMIT = 3
+_ROUTE_CACHE_MAX_ENTRIES = 256
+_ROUTE_CACHE_TTL_SECONDS = 300.0
 
 _FOLLOWUP_RESOLUTION_SYSTEM_PROMPT = """Resolve ambiguous follow-up references.
 
@@ -198,7 +208,7 @@ _FOLLOWUP_SUBJECT_PATTERNS: tuple[re.Pattern[str], ...] = (
 )
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class SearchRouteDecision:
     should_search: bool
     mode: SearchMode
@@ -206,7 +216,7 @@ class SearchRouteDecision:
     reason: str = ""
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class FollowupResolutionDecision:
     resolved_prompt: str
     needs_clarification: bool
@@ -245,8 +255,52 @@ class SearchService:
         self._search_context = search_context
         self._openrouter_client = openrouter_client
         self._http_client = http_client
+        # url -> (image bytes, content type, fetched_at), least recently used first.
+        self._thumbnail_cache: OrderedDict[str, tuple[bytes, str, float]] = (
+            OrderedDict()
+        )
+        self._thumbnail_prefetches: dict[
+            str, asyncio.Task[tuple[bytes, str] | None]
+        ] = {}
+        self._thumbnail_semaphore = asyncio.Semaphore(_THUMBNAIL_PREFETCH_CONCURRENCY)
+        # normalized prompt -> (decision, decided_at), least recently used first.
+        # Shared by every conversation on purpose: the router only ever sees
+        # the prompt, and follow-ups are resolved to standalone prompts first.
+        self._route_cache: OrderedDict[str, tuple[SearchRouteDecision, float]] = (
+            OrderedDict()
+        )
 
     async def decide_auto_search(self, prompt: str) -> SearchRouteDecision:
+        route_key = " ".join(prompt.split())
+        cached = self._cached_route_decision(route_key)
+        if cached is not None:
+            self._debug_log("router_cache_hit", mode=cached.mode)
+            return cached
+
+        decision = await self._request_route_decision(prompt)
+        if decision is None:
+            # Transport and parse failures are not cached so the next message
+            # gets a fresh attempt.
+            return SearchRouteDecision(False, "search", "")
+
+        self._route_cache[route_key] = (decision, time.monotonic())
+        self._route_cache.move_to_end(route_key)
+        while len(self._route_cache) > _ROUTE_CACHE_MAX_ENTRIES:
+            self._route_cache.popitem(last=False)
+        return decision
+
+    def _cached_route_decision(self, route_key: str) -> SearchRouteDecision | None:
+        cached = self._route_cache.get(route_key)
+        if cached is None:
+            return None
+        decision, decided_at = cached
+        if time.monotonic() - decided_at > _ROUTE_CACHE_TTL_SECONDS:
+            del self._route_cache[route_key]
+            return None
+        self._route_cache.move_to_end(route_key)
+        return decision
+
+    async def _request_route_decision(self, prompt: str) -> SearchRouteDecision | None:
         try:
             raw = await self._openrouter_client.generate_reply(
                 [
@@ -259,13 +313,13 @@ class SearchService:
                 "router_fallback",
                 reason_code="chat_reply_error",
             )
-            return SearchRouteDecision(False, "search", "")
+            return None
         except Exception:
             self._debug_log(
                 "router_fallback",
                 reason_code="unexpected_exception",
             )
-            return SearchRouteDecision(False, "search", "")
+            return None
 
         payload = _extract_json_object(raw)
         if payload is None:
@@ -274,7 +328,7 @@ class SearchService:
                 reason_code="json_parse_failed",
                 response_len=len(raw),
             )
-            return SearchRouteDecision(False, "search", "")
+            return None
 
         should_search = bool(payload.get("should_search"))
         mode = _coerce_mode(payload.get("mode"))
@@ -791,6 +845,12 @@ class SearchService:
             )
         raise SearchError("I found images but could not download one right now.")
 
+    async def aclose(self) -> None:
+        prefetches = list(self._thumbnail_prefetches.values())
+        for task in prefetches:
+            task.cancel()
+        await asyncio.gather(*prefetches, return_exceptions=True)
+
     async def video_list_reply(
         self,
         *,
@@ -803,6 +863,10 @@ class SearchService:
             query=query,
             results=results,
         )
+        pending = self._search_context.get_pending_video_selection(conversation_key)
+        if pending is not None:
+            for selection in pending.results[:_THUMBNAIL_PREFETCH_LIMIT]:
+                self._prefetch_thumbnail(selection.thumbnail_url)
         lines = ["Videos:"]
         for index, result in enumerate(results, start=1):
             lines.append(f"{index}. {result.title}")
@@ -829,20 +893,84 @@ class SearchService:
         if not thumbnail_url or not thumbnail_url.startswith(("http://", "https://")):
             return None, None, selected.url, selected.title
 
+        thumbnail = self._cached_thumbnail(thumbnail_url)
+        if thumbnail is None:
+            in_flight = self._thumbnail_prefetches.get(thumbnail_url)
+            if in_flight is not None:
+                try:
+                    # Shielded so cancelling this pick leaves the prefetch alone.
+                    thumbnail = await asyncio.shield(in_flight)
+                except asyncio.CancelledError:
+                    if not in_flight.cancelled():
+                        raise
+                    thumbnail = await self._fetch_thumbnail(thumbnail_url)
+            else:
+                thumbnail = await self._fetch_thumbnail(thumbnail_url)
+        if thumbnail is not None:
+            image_bytes, content_type = thumbnail
+            return image_bytes, content_type, selected.url, selected.title
+
+        return None, None, selected.url, selected.title
+
+    def _prefetch_thumbnail(self, thumbnail_url: str | None) -> None:
+        if not thumbnail_url or not thumbnail_url.startswith(("http://", "https://")):
+            return
+        if (
+            thumbnail_url in self._thumbnail_prefetches
+            or self._cached_thumbnail(thumbnail_url) is not None
+        ):
+            return
+        task = asyncio.create_task(self._fetch_thumbnail(thumbnail_url, prefetch=True))
+        self._thumbnail_prefetches[thumbnail_url] = task
+        task.add_done_callback(
+            lambda _: self._thumbnail_prefetches.pop(thumbnail_url, None)
+        )
+
+    def _cached_thumbnail(self, thumbnail_url: str) -> tuple[bytes, str] | None:
+        cached = self._thumbnail_cache.get(thumbnail_url)
+        if cached is None:
+            return None
+        image_bytes, content_type, fetched_at = cached
+        if time.monotonic() - fetched_at > _THUMBNAIL_CACHE_TTL_SECONDS:
+            del self._thumbnail_cache[thumbnail_url]
+            return None
+        self._thumbnail_cache.move_to_end(thumbnail_url)
+        return image_bytes, content_type
+
+    async def _fetch_thumbnail(
+        self, thumbnail_url: str, *, prefetch: bool = False
+    ) -> tuple[bytes, str] | None:
         timeout = max(1.0, float(self._settings.bot_search_timeout_seconds))
         try:
-            response = await self._http_client.get(thumbnail_url, timeout=timeout)
-            if response.status_code == 200 and response.content:
-                content_type = (
-                    response.headers.get("content-type", "image/jpeg")
-                    .split(";", maxsplit=1)[0]
-                    .strip()
-                )
-                return response.content, content_type, selected.url, selected.title
+            if prefetch:
+                # Only speculative fetches queue; a user's pick never waits here.
+                async with self._thumbnail_semaphore:
+                    response = await self._http_client.get(
+                        thumbnail_url, timeout=timeout
+                    )
+            else:
+                response = await self._http_client.get(thumbnail_url, timeout=timeout)
         except Exception:
             logger.debug("Failed to download video thumbnail", exc_info=True)
+            return None
 
-        return None, None, selected.url, selected.title
+        if response.status_code != 200 or not response.content:
+            return None
+
+        content_type = (
+            response.headers.get("content-type", "image/jpeg")
+            .split(";", maxsplit=1)[0]
+            .strip()
+        )
+        self._thumbnail_cache[thumbnail_url] = (
+            response.content,
+            content_type,
+            time.monotonic(),
+        )
+        self._thumbnail_cache.move_to_end(thumbnail_url)
+        while len(self._thumbnail_cache) > _THUMBNAIL_CACHE_MAX_ENTRIES:
+            self._thumbnail_cache.popitem(last=False)
+        return response.content, content_type
 
     async def jmail_list_reply(
         self,
@@ -1,18 +1,31 @@
 from __future__ import annotations
 
 import asyncio
-import base64
 import logging
 from typing import Protocol
 
 import httpx
+import orjson
 
 from signal_bot_orx.group_resolver import GroupResolver, ResolvedGroupRecipients
-from signal_bot_orx.messaging import MessageSendError
+from signal_bot_orx.messaging import MessageSendError, encode_base64
 from signal_bot_orx.types import Target
 
 logger = logging.getLogger(__name__)
 
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+_STATUS_ERROR_TEMPLATE = (
+    "Signal send failed with status {status_code} (recipient={recipient}): {detail}"
+)
+_NETWORK_ERROR_TEMPLATE = (
+    "Signal send failed due to network error (recipient={recipient})"
+)
+_GROUP_ERROR_TEMPLATE = (
+    "{error} (resolver_cache_refreshed={cache_refreshed}, "
+    "candidate_count={candidate_count}, final_candidate={recipient})"
+)
+
 
 class SignalSendError(MessageSendError):
     def __init__(
@@ -21,10 +34,16 @@ class SignalSendError(MessageSendError):
         *,
         status_code: int | None = None,
         recipient: str | None = None,
+        detail: str | None = None,
+        cache_refreshed: bool | None = None,
+        candidate_count: int | None = None,
     ) -> None:
         super().__init__(message)
         self.status_code = status_code
         self.recipient = recipient
+        self.detail = detail
+        self.cache_refreshed = cache_refreshed
+        self.candidate_count = candidate_count
 
 
 class GroupResolverLike(Protocol):
@@ -48,6 +67,8 @@ class SignalClient:
             sender_number=sender_number,
             http_client=http_client,
         )
+        # group_id -> last resolver candidate that accepted a send.
+        self._working_group_recipients: dict[str, str] = {}
 
     async def send_text(
         self,
@@ -76,11 +97,8 @@ class SignalClient:
         if caption:
             payload["message"] = caption
 
-        ext = _suffix_for_content_type(content_type)
-        payload["base64_attachments"] = [
-            f"data:{content_type};filename=image.{ext};base64,"
-            f"{base64.b64encode(image_bytes).decode('ascii')}"
-        ]
+        encoded = await encode_base64(image_bytes)
+        payload["base64_attachments"] = [_data_uri(encoded, content_type)]
         await self._post_with_retry(
             target=target,
             payload=payload,
@@ -94,15 +112,20 @@ class SignalClient:
         payload: dict[str, object],
         fallback_recipient: str | None = None,
     ) -> None:
+        encoded_payload = orjson.dumps(payload)
         if target.group_id:
             resolved = await self._group_resolver.resolve(target.group_id)
             last_error: SignalSendError | None = None
-            for recipient in resolved.recipients:
+            for recipient in _prefer_candidate(
+                resolved.recipients,
+                self._working_group_recipients.get(target.group_id),
+            ):
                 try:
                     await self._post_to_recipient(
                         recipient=recipient,
-                        payload=payload,
+                        encoded_payload=encoded_payload,
                     )
+                    self._working_group_recipients[target.group_id] = recipient
                     return
                 except SignalSendError as exc:
                     last_error = exc
@@ -124,7 +147,7 @@ class SignalClient:
                     try:
                         await self._post_to_recipient(
                             recipient=fallback_recipient,
-                            payload=payload,
+                            encoded_payload=encoded_payload,
                         )
                         logger.info(
                             "group_send_dm_fallback_succeeded sender=%s group_id=%s "
@@ -143,41 +166,48 @@ class SignalClient:
                             fallback_recipient,
                         )
 
+                candidate_count = len(resolved.recipients)
                 raise SignalSendError(
-                    f"{last_error} (resolver_cache_refreshed={resolved.cache_refreshed}, "
-                    f"candidate_count={len(resolved.recipients)}, "
-                    f"final_candidate={last_error.recipient})",
+                    _GROUP_ERROR_TEMPLATE.format_map(
+                        {
+                            "error": last_error,
+                            "cache_refreshed": resolved.cache_refreshed,
+                            "candidate_count": candidate_count,
+                            "recipient": last_error.recipient,
+                        }
+                    ),
                     status_code=last_error.status_code,
                     recipient=last_error.recipient,
+                    detail=last_error.detail,
+                    cache_refreshed=resolved.cache_refreshed,
+                    candidate_count=candidate_count,
                 ) from last_error
             raise SignalSendError("Signal send failed unexpectedly")
 
         if target.recipient:
             await self._post_to_recipient(
                 recipient=target.recipient,
-                payload=payload,
+                encoded_payload=encoded_payload,
             )
             return
 
         raise SignalSendError("Missing target recipient")
 
     async def _post_to_recipient(
-        self, *, recipient: str, payload: dict[str, object]
+        self, *, recipient: str, encoded_payload: bytes
     ) -> None:
         url = f"{self._base_url}/v2/send"
-        body = {
-            "number": self._sender_number,
-            "recipients": [recipient],
-            **payload,
-        }
+        content = _send_body(self._sender_number, recipient, encoded_payload)
 
         for attempt in range(2):
             try:
-                response = await self._http_client.post(url, json=body, timeout=30)
+                response = await self._http_client.post(
+                    url, content=content, headers=_JSON_HEADERS, timeout=30
+                )
             except (httpx.TimeoutException, httpx.NetworkError) as exc:
                 if attempt == 1:
                     raise SignalSendError(
-                        f"Signal send failed due to network error (recipient={recipient})",
+                        _NETWORK_ERROR_TEMPLATE.format_map({"recipient": recipient}),
                         recipient=recipient,
                     ) from exc
                 await asyncio.sleep(0.5)
@@ -192,13 +222,47 @@ class SignalClient:
 
             detail = _extract_response_detail(response)
             raise SignalSendError(
-                f"Signal send failed with status {response.status_code} "
-                f"(recipient={recipient}): {detail}",
+                _STATUS_ERROR_TEMPLATE.format_map(
+                    {
+                        "status_code": response.status_code,
+                        "recipient": recipient,
+                        "detail": detail,
+                    }
+                ),
                 status_code=response.status_code,
                 recipient=recipient,
+                detail=detail,
             )
 
 
+def _prefer_candidate(
+    candidates: tuple[str, ...], preferred: str | None
+) -> tuple[str, ...]:
+    # Candidates are aliases of one group, so they must stay sequential (a
+    # multi-recipient send would deliver once per alias); trying the alias
+    # that last worked first keeps repeat sends to a single round-trip.
+    if preferred is None or preferred not in candidates or candidates[0] == preferred:
+        return candidates
+    return (preferred, *(item for item in candidates if item != preferred))
+
+
+def _send_body(sender_number: str, recipient: str, encoded_payload: bytes) -> bytes:
+    # The payload is serialized once per send; each candidate only splices its
+    # own head on, so retries never re-serialize a large base64 attachment.
+    head = orjson.dumps({"number": sender_number, "recipients": [recipient]})
+    if encoded_payload == b"{}":
+        return head
+    return head[:-1] + b"," + encoded_payload[1:]
+
+
+def _data_uri(encoded: bytes, content_type: str) -> str:
+    ext = _suffix_for_content_type(content_type)
+    prefix = f"data:{content_type};filename=image.{ext};base64,".encode()
+    # Join as bytes and decode once instead of decoding the base64 body to an
+    # intermediate str before concatenating.
+    return (prefix + encoded).decode()
+
+
 def _suffix_for_content_type(content_type: str) -> str:
     if "png" in content_type:
         return "png"
@@ -212,7 +276,7 @@ def _suffix_for_content_type(content_type: str) -> str:
 def _extract_response_detail(response: httpx.Response) -> str:
     detail = ""
     try:
-        payload = response.json()
+        payload = orjson.loads(response.content)
         if isinstance(payload, dict):
             detail = str(
                 payload.get("error")
@@ -222,7 +286,7 @@ def _extract_response_detail(response: httpx.Response) -> str:
             )
         else:
             detail = str(payload)
-    except ValueError:
+    except orjson.JSONDecodeError:
         detail = response.text
 
     detail = " ".join(detail.strip().split())
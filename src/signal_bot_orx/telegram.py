@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import sys
+from functools import lru_cache
 from typing import Any
 
 from signal_bot_orx.parsing import as_dict, first_non_empty_str
@@ -56,11 +58,11 @@ def _is_directed_to_bot(
     text: str,
     bot_username: str | None,
 ) -> bool:
-    normalized_username = _normalize_username(bot_username)
+    normalized_username = _normalize_bot_username(bot_username)
     if normalized_username and _entities_mention_username(
         message=message,
         text=text,
-        normalized_username=normalized_username,
+        mention_token=_bot_mention_token(normalized_username),
     ):
         return True
 
@@ -80,7 +82,7 @@ def _entities_mention_username(
     *,
     message: dict[str, Any],
     text: str,
-    normalized_username: str,
+    mention_token: str,
 ) -> bool:
     entities = message.get("entities")
     if not isinstance(entities, list):
@@ -99,8 +101,8 @@ def _entities_mention_username(
         end = offset + length
         if end > len(text):
             continue
-        mention_text = text[offset:end].strip().lower()
-        if mention_text == f"@{normalized_username}":
+        mention_text = text[offset:end].strip().casefold()
+        if mention_text == mention_token:
             return True
 
     return False
@@ -124,10 +126,22 @@ def _as_int(value: object) -> int | None:
     return None
 
 
+@lru_cache(maxsize=4)
+def _normalize_bot_username(value: str | None) -> str | None:
+    # The configured bot username is identical across updates; cache it.
+    normalized = _normalize_username(value)
+    return sys.intern(normalized) if normalized else None
+
+
+@lru_cache(maxsize=4)
+def _bot_mention_token(normalized_username: str) -> str:
+    return sys.intern(f"@{normalized_username}")
+
+
 def _normalize_username(value: str | None) -> str | None:
     if value is None:
         return None
-    normalized = value.strip().lower().removeprefix("@")
+    normalized = value.strip().casefold().removeprefix("@")
     if not normalized:
         return None
     return normalized
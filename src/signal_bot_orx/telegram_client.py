@@ -1,10 +1,13 @@
 from __future__ import annotations
 
 import httpx
+import orjson
 
 from signal_bot_orx.messaging import MessageSendError
 from signal_bot_orx.types import Target
 
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
 
 class TelegramSendError(MessageSendError):
     pass
@@ -67,7 +70,12 @@ class TelegramClient:
     async def _post_json(self, *, method: str, payload: dict[str, object]) -> None:
         url = f"{self._base_url}/bot{self._bot_token}/{method}"
         try:
-            response = await self._http_client.post(url, json=payload, timeout=30)
+            response = await self._http_client.post(
+                url,
+                content=orjson.dumps(payload),
+                headers=_JSON_HEADERS,
+                timeout=30,
+            )
         except (httpx.TimeoutException, httpx.NetworkError) as exc:
             raise TelegramSendError(
                 "Telegram send failed due to network error."
@@ -1,12 +1,13 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Any, Literal
 
 from signal_bot_orx.parsing import as_dict, first_non_empty_str
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class MentionSpan:
     start: int
     length: int
@@ -14,13 +15,13 @@ class MentionSpan:
     uuid: str | None = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Target:
     recipient: str | None = None
     group_id: str | None = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class IncomingMessage:
     sender: str
     text: str
@@ -77,6 +78,9 @@ def parse_incoming_webhook(
     telegram_bot_username: str | None = None,
     transport_hint: Literal["signal", "whatsapp", "telegram"] | None = None,
 ) -> IncomingMessage | None:
+    if transport_hint is None:
+        transport_hint = _transport_from_shape(payload)
+
     if transport_hint == "signal":
         return parse_signal_webhook(payload)
     if transport_hint == "whatsapp":
@@ -91,6 +95,20 @@ def parse_incoming_webhook(
     )
 
 
+def _transport_from_shape(
+    payload: dict[str, Any],
+) -> Literal["signal", "telegram"] | None:
+    # Unambiguous shapes go straight to their parser, so receipts and typing
+    # events without text are not run through every transport in turn.
+    match payload:
+        case {"envelope": dict()} | {"params": {"envelope": dict()}}:
+            return "signal"
+        case {"update_id": int()}:
+            return "telegram"
+        case _:
+            return None
+
+
 def dedupe_key(message: IncomingMessage) -> str:
     return f"{message.transport}|{message.sender}|{message.timestamp}|{message.text.strip()}"
 
@@ -100,23 +118,32 @@ def metadata_mentions_bot(
     bot_number: str,
     bot_uuid: str | None = None,
 ) -> bool:
-    normalized_bot_number = _normalize_number(bot_number)
-    normalized_bot_uuid = bot_uuid.strip().lower() if bot_uuid else None
+    if not message.mentions:
+        return False
+    normalized_bot_number, bot_uuids = _bot_identifiers(bot_number, bot_uuid)
     for mention in message.mentions:
         if (
             mention.number is not None
             and _normalize_number(mention.number) == normalized_bot_number
         ):
             return True
-        if (
-            mention.uuid is not None
-            and normalized_bot_uuid
-            and mention.uuid.strip().lower() == normalized_bot_uuid
-        ):
+        if mention.uuid is not None and mention.uuid.strip().lower() in bot_uuids:
             return True
     return False
 
 
+@lru_cache(maxsize=8)
+def _bot_identifiers(
+    bot_number: str, bot_uuid: str | None
+) -> tuple[str, frozenset[str]]:
+    # Normalized once per configured identity rather than once per message.
+    normalized_uuid = bot_uuid.strip().lower() if bot_uuid else ""
+    return (
+        _normalize_number(bot_number),
+        frozenset({normalized_uuid}) if normalized_uuid else frozenset(),
+    )
+
+
 def strip_mention_spans(text: str, mentions: tuple[MentionSpan, ...]) -> str:
     cleaned = text
     for mention in sorted(mentions, key=lambda item: item.start, reverse=True):
@@ -6,7 +6,11 @@ from orx_search.providers.weather import WeatherProvider
 
 logger = logging.getLogger(__name__)
 
-logger = logging.getLogger(__name__)
+# units -> (temperature suffix, wind speed unit) as returned by OpenWeatherMap.
+_UNIT_LABELS: dict[str, tuple[str, str]] = {
+    "metric": ("°C", "m/s"),
+    "imperial": ("°F", "mph"),
+}
 
 
 class WeatherError(Exception):
@@ -80,52 +84,56 @@ def _format_current(data: dict, units: str) -> str:
         wind = data["wind"].get("speed")
     except KeyError, IndexError, TypeError:
         return "Could not parse weather data."
-    lines = [
-        f"Weather for {city}, {country}:",
-        f"- Condition: {weather}",
-        f"- Temperature: {temp}°{'C' if units == 'metric' else 'F'}",
-        f"- Feels like: {feels}°{'C' if units == 'metric' else 'F'}",
-        f"- Humidity: {humidity}%",
-        f"- Wind: {wind} m/s",
-    ]
-    return "\n".join([line for line in lines if line])
+    temp_unit, wind_unit = _unit_labels(units)
+    return "\n".join(
+        [
+            f"Weather for {city}, {country}:",
+            f"- Condition: {weather}",
+            f"- Temperature: {temp}{temp_unit}",
+            f"- Feels like: {feels}{temp_unit}",
+            f"- Humidity: {humidity}%",
+            f"- Wind: {wind} {wind_unit}",
+        ]
+    )
 
 
 def _format_forecast(data: dict, units: str) -> str:
-    # OpenWeatherMap returns a list of 3-hour forecasts. We'll pick one per day (12:00 local time).
-    from datetime import datetime
-
+    # OpenWeatherMap returns a list of 3-hour forecasts. We'll pick one per day,
+    # the entry closest to 12:00 local time.
     try:
         city = data["city"]["name"]
         country = data["city"].get("country", "")
         entries = data["list"]
     except KeyError, TypeError:
         return "Could not parse forecast data."
-    # Group by date
-    daily: dict[str, dict] = {}
+    # Single pass: keep (distance from noon, entry) per "YYYY-MM-DD HH:MM:SS" date.
+    daily: dict[str, tuple[int, dict]] = {}
     for entry in entries:
         dt_txt = entry.get("dt_txt")
         if not dt_txt:
             continue
-        dt = datetime.fromisoformat(dt_txt.replace(" ", "T"))
-        date_key = dt.date().isoformat()
-        # Prefer the entry at 12:00 if present, otherwise first entry of the day
-        hour = dt.hour
-        if hour == 12 or date_key not in daily:
-            daily[date_key] = entry
+        hour_text = dt_txt[11:13]
+        if not hour_text.isdigit():
+            continue
+        date_key = dt_txt[:10]
+        distance = abs(int(hour_text) - 12)
+        current = daily.get(date_key)
+        if current is None or distance < current[0]:
+            daily[date_key] = (distance, entry)
     # Build output - limit to next 5 days
+    temp_unit, _ = _unit_labels(units)
     lines = [f"5-day forecast for {city}, {country}:"]
-    count = 0
-    for date_str, entry in sorted(daily.items()):
-        if count >= 5:
+    for date_str, (_, entry) in sorted(daily.items()):
+        if len(lines) > 5:
             break
         try:
             weather = entry["weather"][0]["description"].capitalize()
             temp = entry["main"]["temp"]
-            lines.append(
-                f"{date_str}: {weather}, {temp}°{'C' if units == 'metric' else 'F'}"
-            )
-            count += 1
         except KeyError, IndexError, TypeError:
             continue
+        lines.append(f"{date_str}: {weather}, {temp}{temp_unit}")
     return "\n".join(lines)
+
+
+def _unit_labels(units: str) -> tuple[str, str]:
+    return _UNIT_LABELS.get(units, _UNIT_LABELS["imperial"])
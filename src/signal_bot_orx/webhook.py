@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 import re
+import sys
+from functools import lru_cache
 from typing import Literal
 
 from fastapi import APIRouter, BackgroundTasks, Header
@@ -53,6 +56,16 @@ SEARCH_COMMANDS: dict[str, SearchMode] = {
     "/lc_cyraxx": "lolcow_cyraxx",
     "/lc_larson": "lolcow_larson",
 }
+# One anchored alternation: "source(s)/link(s) [for|to] X", "where did you get
+# [that] X", "what's the source [for] X"; group 1 is the claim.
+_SOURCE_REQUEST_RE = re.compile(
+    r"^(?:(?:sources?|links?)\s*(?:for|to)?"
+    r"|where did you get (?:that|this|it|those|these)?"
+    r"|what(?:'s| is) the source(?: for)?)"
+    r"\s*(.*)$",
+    re.IGNORECASE,
+)
+_NUMERIC_SELECTION_RE = re.compile(r"\d+")
 
 
 class WebhookHandler:
@@ -866,10 +879,14 @@ class WebhookHandler:
 
     async def _process_imagine(self, message: IncomingMessage, prompt: str) -> None:
         reply_target = resolve_reply_target(message, self._settings)
-        await self._safe_send_text(
-            message,
-            "Generating image, please wait...",
-            reply_target,
+        # Send the notice while the image is generated; it always completes
+        # before any follow-up is sent, so the chat order is unchanged.
+        notice = asyncio.create_task(
+            self._safe_send_text(
+                message,
+                "Generating image, please wait...",
+                reply_target,
+            )
         )
 
         try:
@@ -877,6 +894,7 @@ class WebhookHandler:
                 self._openrouter_image_client is None
                 or self._settings.openrouter_image_model is None
             ):
+                await notice
                 await self._safe_send_text(
                     message,
                     "Image mode is not configured on this bot.",
@@ -884,10 +902,13 @@ class WebhookHandler:
                 )
                 return
 
-            images = await self._openrouter_image_client.generate_images(
-                prompt=prompt,
-                model=self._settings.openrouter_image_model,
-            )
+            try:
+                images = await self._openrouter_image_client.generate_images(
+                    prompt=prompt,
+                    model=self._settings.openrouter_image_model,
+                )
+            finally:
+                await notice
             for index, (image_bytes, content_type) in enumerate(images):
                 await self._send_image(
                     transport=message.transport,
@@ -1399,22 +1420,25 @@ def parse_imagine_prompt(text: str) -> str | None:
 
 
 def parse_search_command(text: str) -> tuple[SearchMode, str] | None:
-    stripped = text.strip()
-    for command, mode in SEARCH_COMMANDS.items():
-        if stripped == command:
-            return mode, ""
-        if stripped.startswith(f"{command} "):
-            return mode, stripped[len(command) :].strip()
-    return None
+    head, tail = _split_command(text)
+    mode = SEARCH_COMMANDS.get(head)
+    if mode is None:
+        return None
+    return mode, tail
 
 
 def parse_source_command(text: str) -> str | None:
-    stripped = text.strip()
-    if stripped == "/source":
-        return ""
-    if stripped.startswith("/source "):
-        return stripped[len("/source") :].strip()
-    return None
+    head, tail = _split_command(text)
+    if head != "/source":
+        return None
+    return tail
+
+
+def _split_command(text: str) -> tuple[str, str]:
+    # Commands are the first space-delimited token, so one dict lookup on the
+    # head replaces a prefix scan over every known command.
+    head, _, tail = text.strip().partition(" ")
+    return head, tail.strip()
 
 
 def parse_source_request_text(text: str) -> str | None:
@@ -1422,18 +1446,8 @@ def parse_source_request_text(text: str) -> str | None:
     if not stripped:
         return None
 
-    patterns = (
-        re.compile(
-            r"^(?:source|sources|link|links)\s*(?:for|to)?\s*(.*)$", re.IGNORECASE
-        ),
-        re.compile(
-            r"^where did you get (?:that|this|it|those|these)?\s*(.*)$", re.IGNORECASE
-        ),
-        re.compile(r"^what(?:'s| is) the source(?: for)?\s*(.*)$", re.IGNORECASE),
-    )
-    for pattern in patterns:
-        if match := pattern.match(stripped):
-            return match.group(1).strip(" ?.!,:;")
+    if match := _SOURCE_REQUEST_RE.match(stripped):
+        return match.group(1).strip(" ?.!,:;")
     return None
 
 
@@ -1480,19 +1494,34 @@ def normalize_chat_prompt(message: IncomingMessage, settings: Settings) -> str:
 
 
 def text_contains_alias(text: str, aliases: tuple[str, ...]) -> bool:
-    return any(_alias_pattern(alias).search(text) for alias in aliases)
+    if not aliases:
+        return False
+    # Most group chatter never mentions the bot; with the usual "@name" aliases
+    # a substring check rejects it before any regex runs.
+    if _aliases_share_at_prefix(aliases) and "@" not in text:
+        return False
+    return _aliases_pattern(aliases).search(text) is not None
 
 
 def strip_aliases(text: str, aliases: tuple[str, ...]) -> str:
-    cleaned = text
-    for alias in aliases:
-        cleaned = _alias_pattern(alias).sub(" ", cleaned)
-    return cleaned
+    if not aliases:
+        return text
+    return _aliases_pattern(aliases).sub(" ", text)
 
 
-def _alias_pattern(alias: str) -> re.Pattern[str]:
-    escaped = re.escape(alias)
-    return re.compile(rf"(^|\s){escaped}(?=$|\s|[,:;.!?])", re.IGNORECASE)
+@lru_cache(maxsize=32)
+def _aliases_share_at_prefix(aliases: tuple[str, ...]) -> bool:
+    return all(alias.startswith("@") for alias in aliases)
+
+
+@lru_cache(maxsize=32)
+def _aliases_pattern(aliases: tuple[str, ...]) -> re.Pattern[str]:
+    # One alternation per alias tuple; longest first so no alias shadows a
+    # longer one it prefixes.
+    escaped = "|".join(
+        re.escape(alias) for alias in sorted(set(aliases), key=len, reverse=True)
+    )
+    return re.compile(rf"(^|\s)(?:{escaped})(?=$|\s|[,:;.!?])", re.IGNORECASE)
 
 
 def is_authorized_message(message: IncomingMessage, settings: Settings) -> bool:
@@ -1527,9 +1556,11 @@ def resolve_reply_target(message: IncomingMessage, settings: Settings) -> Target
 
 
 def conversation_key_for_message(message: IncomingMessage) -> str:
+    # Interned so every per-conversation store lookup for this message hits the
+    # same object (cached hash, identity fast path in dict probes).
     if message.target.group_id is not None:
-        return f"group:{message.target.group_id}"
-    return f"dm:{message.sender}"
+        return sys.intern(f"group:{message.target.group_id}")
+    return sys.intern(f"dm:{message.sender}")
 
 
 def build_search_summary_history_context(
@@ -1597,7 +1628,7 @@ def is_search_mode_enabled(mode: SearchMode, settings: Settings) -> bool:
 
 def parse_numeric_selection(text: str) -> int | None:
     stripped = text.strip()
-    if not re.fullmatch(r"\d+", stripped):
+    if not _NUMERIC_SELECTION_RE.fullmatch(stripped):
         return None
     try:
         value = int(stripped)
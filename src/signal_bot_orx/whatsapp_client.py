@@ -1,10 +1,9 @@
 from __future__ import annotations
 
-import base64
-
 import httpx
+import orjson
 
-from signal_bot_orx.messaging import MessageSendError
+from signal_bot_orx.messaging import MessageSendError, encode_base64
 from signal_bot_orx.types import Target
 
 
@@ -22,7 +21,9 @@ class WhatsAppClient:
     ) -> None:
         self._base_url = base_url.rstrip("/")
         self._http_client = http_client
-        self._token = token
+        self._headers = {"Content-Type": "application/json"}
+        if token:
+            self._headers["Authorization"] = f"Bearer {token}"
 
     async def send_text(
         self,
@@ -47,9 +48,10 @@ class WhatsAppClient:
     ) -> None:
         del fallback_recipient
         chat_id = _target_chat_id(target)
+        encoded = await encode_base64(image_bytes)
         payload: dict[str, object] = {
             "chatId": chat_id,
-            "imageBase64": base64.b64encode(image_bytes).decode("ascii"),
+            "imageBase64": encoded.decode("ascii"),
             "mimeType": content_type,
         }
         if caption:
@@ -58,15 +60,11 @@ class WhatsAppClient:
 
     async def _post_json(self, path: str, payload: dict[str, object]) -> None:
         url = f"{self._base_url}{path}"
-        headers: dict[str, str] = {}
-        if self._token:
-            headers["Authorization"] = f"Bearer {self._token}"
-
         try:
             response = await self._http_client.post(
                 url,
-                json=payload,
-                headers=headers or None,
+                content=orjson.dumps(payload),
+                headers=self._headers,
                 timeout=30,
             )
         except (httpx.TimeoutException, httpx.NetworkError) as exc:
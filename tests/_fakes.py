@@ -0,0 +1,85 @@
+"""Test doubles shared across test modules; fixtures stay in conftest.py."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Coroutine
+from typing import Any, NamedTuple
+
+import httpx
+
+from signal_bot_orx.messaging import MessengerClient
+from signal_bot_orx.types import Target
+
+MockHandler = (
+    Callable[[httpx.Request], httpx.Response]
+    | Callable[[httpx.Request], Coroutine[Any, Any, httpx.Response]]
+)
+
+
+def _ok_handler(_: httpx.Request) -> httpx.Response:
+    return httpx.Response(200)
+
+
+class MockHttp:
+    """One AsyncClient per module whose MockTransport handler is swapped per test."""
+
+    def __init__(self) -> None:
+        self._transport = httpx.MockTransport(_ok_handler)
+        self.client = httpx.AsyncClient(transport=self._transport)
+
+    def set_handler(self, handler: MockHandler) -> httpx.AsyncClient:
+        self._transport.handler = handler
+        return self.client
+
+    def reset(self) -> None:
+        self._transport.handler = _ok_handler
+
+
+class SentText(NamedTuple):
+    target: Target
+    message: str
+    fallback_recipient: str | None
+
+
+class SentImage(NamedTuple):
+    target: Target
+    caption: str | None
+
+
+class FakeMessengerClient(MessengerClient):
+    """Records what the handler sends; stands in for any transport client."""
+
+    def __init__(self) -> None:
+        self.sent_text: list[SentText] = []
+        self.sent_images: list[SentImage] = []
+
+    def reset(self) -> None:
+        self.sent_text.clear()
+        self.sent_images.clear()
+
+    @property
+    def text_messages(self) -> list[str]:
+        return [sent.message for sent in self.sent_text]
+
+    async def send_text(
+        self,
+        *,
+        target: Target,
+        message: str,
+        fallback_recipient: str | None = None,
+    ) -> None:
+        self.sent_text.append(SentText(target, message, fallback_recipient))
+
+    async def send_image(
+        self,
+        *,
+        target: Target,
+        image_bytes: bytes,
+        content_type: str,
+        caption: str | None = None,
+        fallback_recipient: str | None = None,
+    ) -> None:
+        del fallback_recipient
+        assert image_bytes
+        assert content_type == "image/png"
+        self.sent_images.append(SentImage(target, caption))
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import importlib.util
+from collections.abc import AsyncIterator, Iterator
+
+import pytest
+from _fakes import MockHttp
+
+
+@pytest.fixture(scope="module")
+def anyio_backend() -> tuple[str, dict[str, bool]]:
+    # One asyncio loop per test module, on uvloop where it is installed. Pinned
+    # to asyncio only: the bot never runs under trio.
+    return "asyncio", {"use_uvloop": importlib.util.find_spec("uvloop") is not None}
+
+
+@pytest.fixture(scope="module")
+async def _mock_http_session(anyio_backend: object) -> AsyncIterator[MockHttp]:
+    del anyio_backend
+    mock = MockHttp()
+    async with mock.client:
+        yield mock
+
+
+@pytest.fixture
+def mock_http(_mock_http_session: MockHttp) -> Iterator[MockHttp]:
+    yield _mock_http_session
+    _mock_http_session.reset()
@@ -33,3 +33,21 @@ def test_chat_context_expires_by_ttl(monkeypatch: pytest.MonkeyPatch) -> None:
 
     now = 11.0
     assert store.get_history("group:1") == ()
+
+
+def test_chat_context_reuses_history_tuple_until_next_append() -> None:
+    store = ChatContextStore(max_turns=2, ttl_seconds=1800)
+    store.append_turn("group:1", user_text="u1", assistant_text="a1")
+
+    first = store.get_history("group:1")
+    assert store.get_history("group:1") is first
+
+    store.append_turn("group:1", user_text="u2", assistant_text="a2")
+
+    assert [turn.content for turn in first] == ["u1", "a1"]
+    assert [turn.content for turn in store.get_history("group:1")] == [
+        "u1",
+        "a1",
+        "u2",
+        "a2",
+    ]
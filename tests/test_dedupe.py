@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import pytest
+
 from signal_bot_orx.dedupe import DedupeCache
 
 
@@ -9,3 +11,45 @@ def test_dedupe_accepts_first_and_rejects_duplicate() -> None:
     assert cache.mark_once("key-1") is True
     assert cache.mark_once("key-1") is False
     assert cache.mark_once("key-2") is True
+
+
+def test_dedupe_clear_forgets_seen_keys() -> None:
+    cache = DedupeCache(ttl_seconds=60)
+    cache.mark_once("key-1")
+
+    cache.clear()
+
+    assert cache.mark_once("key-1") is True
+
+
+def test_dedupe_forgets_keys_after_two_generations(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    now = 1000.0
+    monkeypatch.setattr("signal_bot_orx.dedupe.time.monotonic", lambda: now)
+    cache = DedupeCache(ttl_seconds=60)
+    cache.mark_once("key-1")
+
+    now += 60
+    assert cache.mark_once("key-1") is False
+
+    now += 60
+    assert cache.mark_once("key-1") is True
+
+
+def test_dedupe_retention_stays_below_two_ttls_with_sparse_calls(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    now = 0.0
+    monkeypatch.setattr("signal_bot_orx.dedupe.time.monotonic", lambda: now)
+    cache = DedupeCache(ttl_seconds=60)
+
+    now = 1.0
+    cache.mark_once("key-1")
+
+    # A late call must not push the next rotation past the 60s grid.
+    now = 119.0
+    assert cache.mark_once("key-1") is False
+
+    now = 120.0
+    assert cache.mark_once("key-1") is True
@@ -2,12 +2,15 @@ from __future__ import annotations
 
 import httpx
 import pytest
+from _fakes import MockHttp
 
 from signal_bot_orx.group_resolver import GroupResolver
 
 
 @pytest.mark.anyio
-async def test_group_resolver_maps_internal_id_to_canonical_id() -> None:
+async def test_group_resolver_maps_internal_id_to_canonical_id(
+    mock_http: MockHttp,
+) -> None:
     def handler(request: httpx.Request) -> httpx.Response:
         assert request.url.path.startswith("/v1/groups/")
         return httpx.Response(
@@ -20,14 +23,13 @@ async def test_group_resolver_maps_internal_id_to_canonical_id() -> None:
             ],
         )
 
-    transport = httpx.MockTransport(handler)
-    async with httpx.AsyncClient(transport=transport) as client:
-        resolver = GroupResolver(
-            base_url="http://signal.local",
-            sender_number="+1999",
-            http_client=client,
-        )
-        resolved = await resolver.resolve("abc+def/ghi=")
+    client = mock_http.set_handler(handler)
+    resolver = GroupResolver(
+        base_url="http://signal.local",
+        sender_number="+1999",
+        http_client=client,
+    )
+    resolved = await resolver.resolve("abc+def/ghi=")
 
     assert resolved.cache_refreshed is True
     assert resolved.recipients[0] == "group.YWJjK2RlZi9naGk9"
@@ -36,7 +38,7 @@ async def test_group_resolver_maps_internal_id_to_canonical_id() -> None:
 
 
 @pytest.mark.anyio
-async def test_group_resolver_accepts_alternate_key_styles() -> None:
+async def test_group_resolver_accepts_alternate_key_styles(mock_http: MockHttp) -> None:
     def handler(request: httpx.Request) -> httpx.Response:
         if request.url.path.startswith("/v1/groups/"):
             return httpx.Response(404)
@@ -52,20 +54,21 @@ async def test_group_resolver_accepts_alternate_key_styles() -> None:
             },
         )
 
-    transport = httpx.MockTransport(handler)
-    async with httpx.AsyncClient(transport=transport) as client:
-        resolver = GroupResolver(
-            base_url="http://signal.local",
-            sender_number="+1999",
-            http_client=client,
-        )
-        resolved = await resolver.resolve("abc+xyz/123=")
+    client = mock_http.set_handler(handler)
+    resolver = GroupResolver(
+        base_url="http://signal.local",
+        sender_number="+1999",
+        http_client=client,
+    )
+    resolved = await resolver.resolve("abc+xyz/123=")
 
     assert resolved.recipients[0] == "group.YWJjK3h5ei8xMjM9"
 
 
 @pytest.mark.anyio
-async def test_group_resolver_returns_deduped_ordered_candidates() -> None:
+async def test_group_resolver_returns_deduped_ordered_candidates(
+    mock_http: MockHttp,
+) -> None:
     def handler(_: httpx.Request) -> httpx.Response:
         return httpx.Response(
             200,
@@ -77,21 +80,22 @@ async def test_group_resolver_returns_deduped_ordered_candidates() -> None:
             ],
         )
 
-    transport = httpx.MockTransport(handler)
-    async with httpx.AsyncClient(transport=transport) as client:
-        resolver = GroupResolver(
-            base_url="http://signal.local",
-            sender_number="+1999",
-            http_client=client,
-        )
-        resolved = await resolver.resolve("group.YWJjK2RlZi9naGk9")
+    client = mock_http.set_handler(handler)
+    resolver = GroupResolver(
+        base_url="http://signal.local",
+        sender_number="+1999",
+        http_client=client,
+    )
+    resolved = await resolver.resolve("group.YWJjK2RlZi9naGk9")
 
     assert resolved.recipients[0] == "group.YWJjK2RlZi9naGk9"
     assert resolved.recipients.count("group.YWJjK2RlZi9naGk9") == 1
 
 
 @pytest.mark.anyio
-async def test_group_resolver_miss_does_not_refresh_again_while_ttl_is_fresh() -> None:
+async def test_group_resolver_miss_does_not_refresh_again_while_ttl_is_fresh(
+    mock_http: MockHttp,
+) -> None:
     request_count = 0
 
     def handler(_: httpx.Request) -> httpx.Response:
@@ -99,16 +103,15 @@ async def test_group_resolver_miss_does_not_refresh_again_while_ttl_is_fresh() -
         request_count += 1
         return httpx.Response(503)
 
-    transport = httpx.MockTransport(handler)
-    async with httpx.AsyncClient(transport=transport) as client:
-        resolver = GroupResolver(
-            base_url="http://signal.local",
-            sender_number="+1999",
-            http_client=client,
-            refresh_ttl_seconds=60,
-        )
-        first = await resolver.resolve("unknown-group")
-        second = await resolver.resolve("unknown-group")
+    client = mock_http.set_handler(handler)
+    resolver = GroupResolver(
+        base_url="http://signal.local",
+        sender_number="+1999",
+        http_client=client,
+        refresh_ttl_seconds=60,
+    )
+    first = await resolver.resolve("unknown-group")
+    second = await resolver.resolve("unknown-group")
 
     assert request_count == 2
     assert first.cache_refreshed is False
@@ -117,7 +120,9 @@ async def test_group_resolver_miss_does_not_refresh_again_while_ttl_is_fresh() -
 
 
 @pytest.mark.anyio
-async def test_group_resolver_miss_refreshes_again_when_ttl_is_expired() -> None:
+async def test_group_resolver_miss_refreshes_again_when_ttl_is_expired(
+    mock_http: MockHttp,
+) -> None:
     request_count = 0
 
     def handler(_: httpx.Request) -> httpx.Response:
@@ -125,15 +130,40 @@ async def test_group_resolver_miss_refreshes_again_when_ttl_is_expired() -> None
         request_count += 1
         return httpx.Response(503)
 
-    transport = httpx.MockTransport(handler)
-    async with httpx.AsyncClient(transport=transport) as client:
-        resolver = GroupResolver(
-            base_url="http://signal.local",
-            sender_number="+1999",
-            http_client=client,
-            refresh_ttl_seconds=0,
-        )
-        await resolver.resolve("unknown-group")
-        await resolver.resolve("unknown-group")
+    client = mock_http.set_handler(handler)
+    resolver = GroupResolver(
+        base_url="http://signal.local",
+        sender_number="+1999",
+        http_client=client,
+        refresh_ttl_seconds=0,
+    )
+    await resolver.resolve("unknown-group")
+    await resolver.resolve("unknown-group")
 
     assert request_count == 4
+
+
+@pytest.mark.anyio
+async def test_group_resolver_reuses_result_for_repeat_cache_hits(
+    mock_http: MockHttp,
+) -> None:
+    def handler(_: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            200,
+            json=[{"id": "group.YWJjK2RlZi9naGk9", "internal_id": "abc+def/ghi="}],
+        )
+
+    client = mock_http.set_handler(handler)
+    resolver = GroupResolver(
+        base_url="http://signal.local",
+        sender_number="+1999",
+        http_client=client,
+    )
+    refreshed = await resolver.resolve("abc+def/ghi=")
+    first_hit = await resolver.resolve("abc+def/ghi=")
+    second_hit = await resolver.resolve("abc+def/ghi=")
+
+    assert refreshed.cache_refreshed is True
+    assert first_hit.cache_refreshed is False
+    assert first_hit.recipients == refreshed.recipients
+    assert second_hit is first_hit
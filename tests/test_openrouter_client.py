@@ -5,6 +5,7 @@ import json
 
 import httpx
 import pytest
+from _fakes import MockHttp
 
 from signal_bot_orx.openrouter_client import (
     ChatReplyError,
@@ -14,8 +15,7 @@ from signal_bot_orx.openrouter_client import (
 )
 
 
-def _chat_client(transport: httpx.MockTransport) -> OpenRouterClient:
-    http_client = httpx.AsyncClient(transport=transport)
+def _chat_client(http_client: httpx.AsyncClient) -> OpenRouterClient:
     return OpenRouterClient(
         api_key="chat-key",
         model="openai/gpt-4o-mini",
@@ -27,8 +27,7 @@ def _chat_client(transport: httpx.MockTransport) -> OpenRouterClient:
     )
 
 
-def _image_client(transport: httpx.MockTransport) -> OpenRouterImageClient:
-    http_client = httpx.AsyncClient(transport=transport)
+def _image_client(http_client: httpx.AsyncClient) -> OpenRouterImageClient:
     return OpenRouterImageClient(
         api_key="image-key",
         http_client=http_client,
@@ -38,7 +37,7 @@ def _image_client(transport: httpx.MockTransport) -> OpenRouterImageClient:
 
 
 @pytest.mark.anyio
-async def test_openrouter_chat_client_success() -> None:
+async def test_openrouter_chat_client_success(mock_http: MockHttp) -> None:
     def handler(request: httpx.Request) -> httpx.Response:
         assert request.headers["Authorization"] == "Bearer chat-key"
         return httpx.Response(
@@ -54,16 +53,16 @@ async def test_openrouter_chat_client_success() -> None:
             },
         )
 
-    transport = httpx.MockTransport(handler)
-    client = _chat_client(transport)
+    client = _chat_client(mock_http.set_handler(handler))
     response = await client.generate_reply([{"role": "user", "content": "hi"}])
 
     assert response == "hello from model"
-    await client._http_client.aclose()
 
 
 @pytest.mark.anyio
-async def test_openrouter_chat_client_retries_transient_error() -> None:
+async def test_openrouter_chat_client_retries_transient_error(
+    mock_http: MockHttp,
+) -> None:
     attempts = 0
 
     def handler(_: httpx.Request) -> httpx.Response:
@@ -84,32 +83,28 @@ async def test_openrouter_chat_client_retries_transient_error() -> None:
             },
         )
 
-    transport = httpx.MockTransport(handler)
-    client = _chat_client(transport)
+    client = _chat_client(mock_http.set_handler(handler))
     response = await client.generate_reply([{"role": "user", "content": "hi"}])
 
     assert response == "recovered"
     assert attempts == 2
-    await client._http_client.aclose()
 
 
 @pytest.mark.anyio
-async def test_openrouter_chat_client_maps_auth_error() -> None:
+async def test_openrouter_chat_client_maps_auth_error(mock_http: MockHttp) -> None:
     def handler(_: httpx.Request) -> httpx.Response:
         return httpx.Response(401, json={"error": "unauthorized"})
 
-    transport = httpx.MockTransport(handler)
-    client = _chat_client(transport)
+    client = _chat_client(mock_http.set_handler(handler))
 
     with pytest.raises(ChatReplyError) as exc:
         await client.generate_reply([{"role": "user", "content": "hi"}])
 
     assert exc.value.user_message == "Chat service authorization failed."
-    await client._http_client.aclose()
 
 
 @pytest.mark.anyio
-async def test_openrouter_chat_client_maps_timeout_error() -> None:
+async def test_openrouter_chat_client_maps_timeout_error(mock_http: MockHttp) -> None:
     attempts = 0
 
     def handler(_: httpx.Request) -> httpx.Response:
@@ -117,19 +112,19 @@ async def test_openrouter_chat_client_maps_timeout_error() -> None:
         attempts += 1
         raise httpx.ReadTimeout("timed out")
 
-    transport = httpx.MockTransport(handler)
-    client = _chat_client(transport)
+    client = _chat_client(mock_http.set_handler(handler))
 
     with pytest.raises(ChatReplyError) as exc:
         await client.generate_reply([{"role": "user", "content": "hi"}])
 
     assert exc.value.user_message == "Chat service timed out. Try again."
     assert attempts == 3
-    await client._http_client.aclose()
 
 
 @pytest.mark.anyio
-async def test_openrouter_chat_client_trims_detail_from_error_body() -> None:
+async def test_openrouter_chat_client_trims_detail_from_error_body(
+    mock_http: MockHttp,
+) -> None:
     def handler(_: httpx.Request) -> httpx.Response:
         return httpx.Response(
             400,
@@ -137,19 +132,17 @@ async def test_openrouter_chat_client_trims_detail_from_error_body() -> None:
             headers={"content-type": "application/json"},
         )
 
-    transport = httpx.MockTransport(handler)
-    client = _chat_client(transport)
+    client = _chat_client(mock_http.set_handler(handler))
 
     with pytest.raises(ChatReplyError) as exc:
         await client.generate_reply([{"role": "user", "content": "hi"}])
 
     assert "Chat reply failed" in exc.value.user_message
     assert "bad request" in exc.value.user_message
-    await client._http_client.aclose()
 
 
 @pytest.mark.anyio
-async def test_openrouter_image_client_success_data_url() -> None:
+async def test_openrouter_image_client_success_data_url(mock_http: MockHttp) -> None:
     image_bytes = b"image-data"
 
     def handler(request: httpx.Request) -> httpx.Response:
@@ -181,16 +174,14 @@ async def test_openrouter_image_client_success_data_url() -> None:
             },
         )
 
-    transport = httpx.MockTransport(handler)
-    client = _image_client(transport)
+    client = _image_client(mock_http.set_handler(handler))
     images = await client.generate_images(prompt="a fox", model="openai/gpt-image-1")
 
     assert images == [(image_bytes, "image/png")]
-    await client._http_client.aclose()
 
 
 @pytest.mark.anyio
-async def test_openrouter_image_client_success_url() -> None:
+async def test_openrouter_image_client_success_url(mock_http: MockHttp) -> None:
     def handler(request: httpx.Request) -> httpx.Response:
         if request.url.path == "/api/v1/chat/completions":
             assert request.headers["Authorization"] == "Bearer image-key"
@@ -219,16 +210,16 @@ async def test_openrouter_image_client_success_url() -> None:
             headers={"content-type": "image/png"},
         )
 
-    transport = httpx.MockTransport(handler)
-    client = _image_client(transport)
+    client = _image_client(mock_http.set_handler(handler))
     images = await client.generate_images(prompt="a fox", model="openai/gpt-image-1")
 
     assert images == [(b"png-bytes", "image/png")]
-    await client._http_client.aclose()
 
 
 @pytest.mark.anyio
-async def test_openrouter_image_client_returns_all_valid_images() -> None:
+async def test_openrouter_image_client_returns_all_valid_images(
+    mock_http: MockHttp,
+) -> None:
     first_image = b"image-1"
     second_image = b"image-2"
 
@@ -264,34 +255,34 @@ async def test_openrouter_image_client_returns_all_valid_images() -> None:
             },
         )
 
-    transport = httpx.MockTransport(handler)
-    client = _image_client(transport)
+    client = _image_client(mock_http.set_handler(handler))
     images = await client.generate_images(prompt="a fox", model="openai/gpt-image-1")
 
     assert images == [
         (first_image, "image/png"),
         (second_image, "image/jpeg"),
     ]
-    await client._http_client.aclose()
 
 
 @pytest.mark.anyio
-async def test_openrouter_image_client_errors_on_missing_images() -> None:
+async def test_openrouter_image_client_errors_on_missing_images(
+    mock_http: MockHttp,
+) -> None:
     def handler(_: httpx.Request) -> httpx.Response:
         return httpx.Response(200, json={"choices": [{"message": {"content": "nope"}}]})
 
-    transport = httpx.MockTransport(handler)
-    client = _image_client(transport)
+    client = _image_client(mock_http.set_handler(handler))
 
     with pytest.raises(ImageGenerationError) as exc:
         await client.generate_images(prompt="a fox", model="openai/gpt-image-1")
 
     assert exc.value.user_message == "Image service returned an empty image payload."
-    await client._http_client.aclose()
 
 
 @pytest.mark.anyio
-async def test_openrouter_image_client_retries_transient_error() -> None:
+async def test_openrouter_image_client_retries_transient_error(
+    mock_http: MockHttp,
+) -> None:
     attempts = 0
 
     def handler(_: httpx.Request) -> httpx.Response:
@@ -321,32 +312,28 @@ async def test_openrouter_image_client_retries_transient_error() -> None:
             },
         )
 
-    transport = httpx.MockTransport(handler)
-    client = _image_client(transport)
+    client = _image_client(mock_http.set_handler(handler))
     images = await client.generate_images(prompt="a fox", model="openai/gpt-image-1")
 
     assert images == [(b"x", "image/png")]
     assert attempts == 2
-    await client._http_client.aclose()
 
 
 @pytest.mark.anyio
-async def test_openrouter_image_client_maps_auth_error() -> None:
+async def test_openrouter_image_client_maps_auth_error(mock_http: MockHttp) -> None:
     def handler(_: httpx.Request) -> httpx.Response:
         return httpx.Response(401, json={"error": "unauthorized"})
 
-    transport = httpx.MockTransport(handler)
-    client = _image_client(transport)
+    client = _image_client(mock_http.set_handler(handler))
 
     with pytest.raises(ImageGenerationError) as exc:
         await client.generate_images(prompt="a fox", model="openai/gpt-image-1")
 
     assert exc.value.user_message == "Image service authorization failed."
-    await client._http_client.aclose()
 
 
 @pytest.mark.anyio
-async def test_openrouter_image_client_maps_timeout_error() -> None:
+async def test_openrouter_image_client_maps_timeout_error(mock_http: MockHttp) -> None:
     attempts = 0
 
     def handler(_: httpx.Request) -> httpx.Response:
@@ -354,12 +341,10 @@ async def test_openrouter_image_client_maps_timeout_error() -> None:
         attempts += 1
         raise httpx.ReadTimeout("timed out")
 
-    transport = httpx.MockTransport(handler)
-    client = _image_client(transport)
+    client = _image_client(mock_http.set_handler(handler))
 
     with pytest.raises(ImageGenerationError) as exc:
         await client.generate_images(prompt="a fox", model="openai/gpt-image-1")
 
     assert exc.value.user_message == "Image generation timed out. Try again."
     assert attempts == 3
-    await client._http_client.aclose()
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import replace
+from functools import cache
 
 import pytest
 from orx_search.base import SearchResult as ProviderSearchResult
@@ -9,6 +10,7 @@ from signal_bot_orx.config import Settings
 from signal_bot_orx.search_client import SearchClient, SearchError
 
 
+@cache
 def _settings() -> Settings:
     return Settings(
         signal_api_base_url="http://localhost:8080",
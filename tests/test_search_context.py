@@ -78,6 +78,41 @@ def test_search_context_expires_records_by_ttl(monkeypatch: pytest.MonkeyPatch)
     assert store.recent_records("group:1", limit=1) == []
 
 
+def test_search_context_expires_older_records_per_conversation(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    now = 0.0
+
+    def fake_monotonic() -> float:
+        return now
+
+    monkeypatch.setattr("signal_bot_orx.search_context.time.monotonic", fake_monotonic)
+    store = SearchContextStore(ttl_seconds=5)
+
+    store.remember_results(
+        "group:1",
+        mode="search",
+        results=[_result(title="Old", url="https://old.example")],
+    )
+    store.remember_results(
+        "group:2",
+        mode="search",
+        results=[_result(title="Other", url="https://other.example")],
+    )
+    now = 3.0
+    store.remember_results(
+        "group:1",
+        mode="search",
+        results=[_result(title="New", url="https://new.example")],
+    )
+
+    now = 6.0
+    assert [item.url for item in store.recent_records("group:1")] == [
+        "https://new.example"
+    ]
+    assert store.recent_records("group:2") == []
+
+
 def test_search_context_recent_records_returns_newest_first() -> None:
     store = SearchContextStore(ttl_seconds=1800)
     store.remember_results(
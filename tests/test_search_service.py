@@ -1,11 +1,17 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
+import re
+from collections import deque
+from collections.abc import Sequence
 from dataclasses import replace
+from functools import cache
 
 import httpx
 import pytest
+from _fakes import MockHttp
 
 from signal_bot_orx.config import Settings
 from signal_bot_orx.search_client import SearchError, SearchMode, SearchResult
@@ -16,7 +22,71 @@ from signal_bot_orx.search_service import (
     SearchService,
 )
 
+_ROUTER_FALLBACK_JSON_PARSE_FAILED = re.compile(
+    r"search_debug event=router_fallback .*reason_code=json_parse_failed"
+)
+_ROUTER_DECISION_NEWS = re.compile(
+    r"search_debug event=router_decision .*mode=news .*query_len=20"
+)
+_ROUTER_DECISION_NO_SEARCH = re.compile(
+    r"search_debug event=router_decision .*reason_code=router_no_search"
+)
+_RESOLVED_HIGH = re.compile(
+    r"search_debug event=followup_resolution_resolved "
+    r".*confidence_bucket=high .*reason_code=deterministic_subject"
+)
+_SUMMARY_REQUEST = re.compile(
+    r"search_debug event=summary_request .*history_included=True "
+    r".*mode=search .*persona_enabled=True .*result_count=1"
+)
+
+
+_VIDEO_ONE = SearchResult(
+    mode="videos",
+    title="Video one",
+    url="https://youtube.com/watch?v=one",
+    snippet="",
+    image_url="https://img.example/one.jpg",
+)
+_VIDEO_TWO = SearchResult(
+    mode="videos",
+    title="Video two",
+    url="https://youtube.com/watch?v=two",
+    snippet="",
+    image_url="https://img.example/two.jpg",
+)
+_ONE_VIDEO: tuple[SearchResult, ...] = (_VIDEO_ONE,)
+_TWO_VIDEOS: tuple[SearchResult, ...] = (_VIDEO_ONE, _VIDEO_TWO)
+_FIVE_VIDEOS: tuple[SearchResult, ...] = tuple(
+    SearchResult(
+        mode="videos",
+        title=f"Video {index}",
+        url=f"https://youtube.com/watch?v={index}",
+        snippet="",
+        image_url=f"https://img.example/{index}.jpg",
+    )
+    for index in range(1, 6)
+)
+_ONE_RESULT: tuple[SearchResult, ...] = (
+    SearchResult(
+        mode="search",
+        title="Result title",
+        url="https://example.com",
+        snippet="snippet",
+    ),
+)
+
+
+def _log_blob(caplog: pytest.LogCaptureFixture) -> str:
+    return "\n".join(record.getMessage() for record in caplog.records)
+
 
+@pytest.fixture
+def search_context() -> SearchContextStore:
+    return SearchContextStore(ttl_seconds=60)
+
+
+@cache
 def _settings() -> Settings:
     return Settings(
         signal_api_base_url="http://localhost:8080",
@@ -31,7 +101,7 @@ def _settings() -> Settings:
 
 
 class _FakeSearchClient:
-    def __init__(self, results: list[SearchResult]) -> None:
+    def __init__(self, results: Sequence[SearchResult]) -> None:
         self._results = results
         self.calls: list[tuple[SearchMode, str]] = []
 
@@ -43,27 +113,30 @@ class _FakeSearchClient:
     ) -> list[SearchResult]:
         del settings
         self.calls.append((mode, query))
-        return self._results
+        return list(self._results)
 
 
 class _FakeOpenRouterClient:
     def __init__(self, replies: list[str]) -> None:
-        self._replies = replies
+        self._replies = deque(replies)
         self.seen_messages: list[list[dict[str, str]]] = []
 
     async def generate_reply(self, messages: list[dict[str, str]]) -> str:
         self.seen_messages.append(messages)
         if self._replies:
-            return self._replies.pop(0)
+            return self._replies.popleft()
         return ""
 
 
 @pytest.mark.anyio
-async def test_decide_auto_search_parses_json() -> None:
+async def test_decide_auto_search_parses_json(
+    search_context: SearchContextStore,
+    mock_http: MockHttp,
+) -> None:
     service = SearchService(
         settings=_settings(),
         search_client=_FakeSearchClient([]),
-        search_context=SearchContextStore(ttl_seconds=60),
+        search_context=search_context,
         openrouter_client=_FakeOpenRouterClient(
             [
                 json.dumps(
@@ -76,9 +149,7 @@ async def test_decide_auto_search_parses_json() -> None:
                 )
             ]
         ),
-        http_client=httpx.AsyncClient(
-            transport=httpx.MockTransport(lambda _: httpx.Response(200))
-        ),
+        http_client=mock_http.client,
     )
 
     decision = await service.decide_auto_search("what happened this week?")
@@ -92,9 +163,69 @@ async def test_decide_auto_search_parses_json() -> None:
 
 
 @pytest.mark.anyio
-async def test_decide_auto_search_router_prompt_includes_person_lookup_examples() -> (
-    None
-):
+async def test_decide_auto_search_caches_parsed_decisions_only(
+    search_context: SearchContextStore,
+    mock_http: MockHttp,
+) -> None:
+    fake_openrouter = _FakeOpenRouterClient(
+        [
+            "not json",
+            json.dumps({"should_search": True, "mode": "news", "query": "q"}),
+        ]
+    )
+    service = SearchService(
+        settings=_settings(),
+        search_client=_FakeSearchClient([]),
+        search_context=search_context,
+        openrouter_client=fake_openrouter,
+        http_client=mock_http.client,
+    )
+
+    fallback = await service.decide_auto_search("any news?")
+    decided = await service.decide_auto_search("any news?")
+    repeated = await service.decide_auto_search("  any   news? ")
+
+    assert fallback.should_search is False
+    assert decided == repeated == SearchRouteDecision(True, "news", "q")
+    assert len(fake_openrouter.seen_messages) == 2
+
+
+@pytest.mark.anyio
+async def test_decide_auto_search_shares_decisions_across_conversations(
+    search_context: SearchContextStore,
+    mock_http: MockHttp,
+) -> None:
+    fake_openrouter = _FakeOpenRouterClient(
+        [json.dumps({"should_search": True, "mode": "news", "query": "q"})]
+    )
+    service = SearchService(
+        settings=_settings(),
+        search_client=_FakeSearchClient([]),
+        search_context=search_context,
+        openrouter_client=fake_openrouter,
+        http_client=mock_http.client,
+    )
+
+    # The webhook routes the same resolved prompt for two different chats.
+    first_chat = await service.decide_auto_search("latest openrouter news")
+    second_chat = await service.decide_auto_search("latest openrouter news")
+
+    assert first_chat == second_chat == SearchRouteDecision(True, "news", "q")
+    # The router request carries nothing conversation-specific, so one
+    # decision per prompt is correct for every conversation.
+    assert [message["role"] for message in fake_openrouter.seen_messages[0]] == [
+        "system",
+        "user",
+    ]
+    assert fake_openrouter.seen_messages[0][1]["content"] == "latest openrouter news"
+    assert len(fake_openrouter.seen_messages) == 1
+
+
+@pytest.mark.anyio
+async def test_decide_auto_search_router_prompt_includes_person_lookup_examples(
+    search_context: SearchContextStore,
+    mock_http: MockHttp,
+) -> None:
     fake_openrouter = _FakeOpenRouterClient(
         [
             json.dumps(
@@ -110,11 +241,9 @@ async def test_decide_auto_search_router_prompt_includes_person_lookup_examples(
     service = SearchService(
         settings=_settings(),
         search_client=_FakeSearchClient([]),
-        search_context=SearchContextStore(ttl_seconds=60),
+        search_context=search_context,
         openrouter_client=fake_openrouter,
-        http_client=httpx.AsyncClient(
-            transport=httpx.MockTransport(lambda _: httpx.Response(200))
-        ),
+        http_client=mock_http.client,
     )
 
     await service.decide_auto_search("who is jayleno89 on tiktok?")
@@ -129,11 +258,14 @@ async def test_decide_auto_search_router_prompt_includes_person_lookup_examples(
 
 
 @pytest.mark.anyio
-async def test_decide_auto_search_forces_search_for_creator_lookup() -> None:
+async def test_decide_auto_search_forces_search_for_creator_lookup(
+    search_context: SearchContextStore,
+    mock_http: MockHttp,
+) -> None:
     service = SearchService(
         settings=_settings(),
         search_client=_FakeSearchClient([]),
-        search_context=SearchContextStore(ttl_seconds=60),
+        search_context=search_context,
         openrouter_client=_FakeOpenRouterClient(
             [
                 json.dumps(
@@ -146,9 +278,7 @@ async def test_decide_auto_search_forces_search_for_creator_lookup() -> None:
                 )
             ]
         ),
-        http_client=httpx.AsyncClient(
-            transport=httpx.MockTransport(lambda _: httpx.Response(200))
-        ),
+        http_client=mock_http.client,
     )
 
     decision = await service.decide_auto_search("who is jayleno89 on tiktok?")
@@ -157,11 +287,14 @@ async def test_decide_auto_search_forces_search_for_creator_lookup() -> None:
 
 
 @pytest.mark.anyio
-async def test_decide_auto_search_keeps_wiki_for_explicit_wikipedia_intent() -> None:
+async def test_decide_auto_search_keeps_wiki_for_explicit_wikipedia_intent(
+    search_context: SearchContextStore,
+    mock_http: MockHttp,
+) -> None:
     service = SearchService(
         settings=_settings(),
         search_client=_FakeSearchClient([]),
-        search_context=SearchContextStore(ttl_seconds=60),
+        search_context=search_context,
         openrouter_client=_FakeOpenRouterClient(
             [
                 json.dumps(
@@ -174,9 +307,7 @@ async def test_decide_auto_search_keeps_wiki_for_explicit_wikipedia_intent() ->
                 )
             ]
         ),
-        http_client=httpx.AsyncClient(
-            transport=httpx.MockTransport(lambda _: httpx.Response(200))
-        ),
+        http_client=mock_http.client,
     )
 
     decision = await service.decide_auto_search(
@@ -189,36 +320,34 @@ async def test_decide_auto_search_keeps_wiki_for_explicit_wikipedia_intent() ->
 @pytest.mark.anyio
 async def test_decide_auto_search_logs_parse_failure_when_debug_enabled(
     caplog: pytest.LogCaptureFixture,
+    search_context: SearchContextStore,
+    mock_http: MockHttp,
 ) -> None:
     service = SearchService(
         settings=replace(_settings(), bot_search_debug_logging=True),
         search_client=_FakeSearchClient([]),
-        search_context=SearchContextStore(ttl_seconds=60),
+        search_context=search_context,
         openrouter_client=_FakeOpenRouterClient(["not json"]),
-        http_client=httpx.AsyncClient(
-            transport=httpx.MockTransport(lambda _: httpx.Response(200))
-        ),
+        http_client=mock_http.client,
     )
     caplog.set_level(logging.INFO, logger="signal_bot_orx.search_service")
 
     decision = await service.decide_auto_search("who is brogan woodman?")
 
     assert decision == SearchRouteDecision(False, "search", "")
-    assert any(
-        "search_debug event=router_fallback" in record.getMessage()
-        and "reason_code=json_parse_failed" in record.getMessage()
-        for record in caplog.records
-    )
+    assert _ROUTER_FALLBACK_JSON_PARSE_FAILED.search(_log_blob(caplog))
 
 
 @pytest.mark.anyio
 async def test_decide_auto_search_logs_router_decision_when_debug_enabled(
     caplog: pytest.LogCaptureFixture,
+    search_context: SearchContextStore,
+    mock_http: MockHttp,
 ) -> None:
     service = SearchService(
         settings=replace(_settings(), bot_search_debug_logging=True),
         search_client=_FakeSearchClient([]),
-        search_context=SearchContextStore(ttl_seconds=60),
+        search_context=search_context,
         openrouter_client=_FakeOpenRouterClient(
             [
                 json.dumps(
@@ -231,9 +360,7 @@ async def test_decide_auto_search_logs_router_decision_when_debug_enabled(
                 )
             ]
         ),
-        http_client=httpx.AsyncClient(
-            transport=httpx.MockTransport(lambda _: httpx.Response(200))
-        ),
+        http_client=mock_http.client,
     )
     caplog.set_level(logging.INFO, logger="signal_bot_orx.search_service")
 
@@ -242,22 +369,19 @@ async def test_decide_auto_search_logs_router_decision_when_debug_enabled(
     )
 
     assert decision.mode == "news"
-    assert any(
-        "search_debug event=router_decision" in record.getMessage()
-        and "mode=news" in record.getMessage()
-        and "query_len=20" in record.getMessage()
-        for record in caplog.records
-    )
+    assert _ROUTER_DECISION_NEWS.search(_log_blob(caplog))
 
 
 @pytest.mark.anyio
 async def test_decide_auto_search_logs_no_search_decision_when_debug_enabled(
     caplog: pytest.LogCaptureFixture,
+    search_context: SearchContextStore,
+    mock_http: MockHttp,
 ) -> None:
     service = SearchService(
         settings=replace(_settings(), bot_search_debug_logging=True),
         search_client=_FakeSearchClient([]),
-        search_context=SearchContextStore(ttl_seconds=60),
+        search_context=search_context,
         openrouter_client=_FakeOpenRouterClient(
             [
                 json.dumps(
@@ -270,9 +394,7 @@ async def test_decide_auto_search_logs_no_search_decision_when_debug_enabled(
                 )
             ]
         ),
-        http_client=httpx.AsyncClient(
-            transport=httpx.MockTransport(lambda _: httpx.Response(200))
-        ),
+        http_client=mock_http.client,
     )
     caplog.set_level(logging.INFO, logger="signal_bot_orx.search_service")
 
@@ -284,15 +406,14 @@ async def test_decide_auto_search_logs_no_search_decision_when_debug_enabled(
         query="",
         reason="small_talk",
     )
-    assert any(
-        "search_debug event=router_decision" in record.getMessage()
-        and "reason_code=router_no_search" in record.getMessage()
-        for record in caplog.records
-    )
+    assert _ROUTER_DECISION_NO_SEARCH.search(_log_blob(caplog))
 
 
 @pytest.mark.anyio
-async def test_resolve_followup_prompt_resolves_ambiguous_pronoun() -> None:
+async def test_resolve_followup_prompt_resolves_ambiguous_pronoun(
+    search_context: SearchContextStore,
+    mock_http: MockHttp,
+) -> None:
     fake_openrouter = _FakeOpenRouterClient(
         [
             json.dumps(
@@ -309,11 +430,9 @@ async def test_resolve_followup_prompt_resolves_ambiguous_pronoun() -> None:
     service = SearchService(
         settings=_settings(),
         search_client=_FakeSearchClient([]),
-        search_context=SearchContextStore(ttl_seconds=60),
+        search_context=search_context,
         openrouter_client=fake_openrouter,
-        http_client=httpx.AsyncClient(
-            transport=httpx.MockTransport(lambda _: httpx.Response(200))
-        ),
+        http_client=mock_http.client,
     )
 
     decision = await service.resolve_followup_prompt(
@@ -344,16 +463,17 @@ async def test_resolve_followup_prompt_resolves_ambiguous_pronoun() -> None:
 
 
 @pytest.mark.anyio
-async def test_resolve_followup_prompt_clarifies_without_context() -> None:
+async def test_resolve_followup_prompt_clarifies_without_context(
+    search_context: SearchContextStore,
+    mock_http: MockHttp,
+) -> None:
     fake_openrouter = _FakeOpenRouterClient(["unused"])
     service = SearchService(
         settings=_settings(),
         search_client=_FakeSearchClient([]),
-        search_context=SearchContextStore(ttl_seconds=60),
+        search_context=search_context,
         openrouter_client=fake_openrouter,
-        http_client=httpx.AsyncClient(
-            transport=httpx.MockTransport(lambda _: httpx.Response(200))
-        ),
+        http_client=mock_http.client,
     )
 
     decision = await service.resolve_followup_prompt(
@@ -369,16 +489,17 @@ async def test_resolve_followup_prompt_clarifies_without_context() -> None:
 
 
 @pytest.mark.anyio
-async def test_resolve_followup_prompt_passthrough_for_non_followup() -> None:
+async def test_resolve_followup_prompt_passthrough_for_non_followup(
+    search_context: SearchContextStore,
+    mock_http: MockHttp,
+) -> None:
     fake_openrouter = _FakeOpenRouterClient(["unused"])
     service = SearchService(
         settings=_settings(),
         search_client=_FakeSearchClient([]),
-        search_context=SearchContextStore(ttl_seconds=60),
+        search_context=search_context,
         openrouter_client=fake_openrouter,
-        http_client=httpx.AsyncClient(
-            transport=httpx.MockTransport(lambda _: httpx.Response(200))
-        ),
+        http_client=mock_http.client,
     )
 
     decision = await service.resolve_followup_prompt(
@@ -401,15 +522,16 @@ async def test_resolve_followup_prompt_passthrough_for_non_followup() -> None:
 
 
 @pytest.mark.anyio
-async def test_resolve_followup_prompt_clarifies_on_malformed_json() -> None:
+async def test_resolve_followup_prompt_clarifies_on_malformed_json(
+    search_context: SearchContextStore,
+    mock_http: MockHttp,
+) -> None:
     service = SearchService(
         settings=_settings(),
         search_client=_FakeSearchClient([]),
-        search_context=SearchContextStore(ttl_seconds=60),
+        search_context=search_context,
         openrouter_client=_FakeOpenRouterClient(["bad json"]),
-        http_client=httpx.AsyncClient(
-            transport=httpx.MockTransport(lambda _: httpx.Response(200))
-        ),
+        http_client=mock_http.client,
     )
 
     decision = await service.resolve_followup_prompt(
@@ -428,18 +550,17 @@ async def test_resolve_followup_prompt_clarifies_on_malformed_json() -> None:
 
 
 @pytest.mark.anyio
-async def test_resolve_followup_prompt_deterministic_subject_preserves_qualifier() -> (
-    None
-):
+async def test_resolve_followup_prompt_deterministic_subject_preserves_qualifier(
+    search_context: SearchContextStore,
+    mock_http: MockHttp,
+) -> None:
     fake_openrouter = _FakeOpenRouterClient(["unused"])
     service = SearchService(
         settings=_settings(),
         search_client=_FakeSearchClient([]),
-        search_context=SearchContextStore(ttl_seconds=60),
+        search_context=search_context,
         openrouter_client=fake_openrouter,
-        http_client=httpx.AsyncClient(
-            transport=httpx.MockTransport(lambda _: httpx.Response(200))
-        ),
+        http_client=mock_http.client,
     )
 
     decision = await service.resolve_followup_prompt(
@@ -459,13 +580,14 @@ async def test_resolve_followup_prompt_deterministic_subject_preserves_qualifier
 
 
 @pytest.mark.anyio
-async def test_resolve_followup_prompt_clarifies_with_multiple_subject_candidates() -> (
-    None
-):
+async def test_resolve_followup_prompt_clarifies_with_multiple_subject_candidates(
+    search_context: SearchContextStore,
+    mock_http: MockHttp,
+) -> None:
     service = SearchService(
         settings=_settings(),
         search_client=_FakeSearchClient([]),
-        search_context=SearchContextStore(ttl_seconds=60),
+        search_context=search_context,
         openrouter_client=_FakeOpenRouterClient(
             [
                 json.dumps(
@@ -479,9 +601,7 @@ async def test_resolve_followup_prompt_clarifies_with_multiple_subject_candidate
                 )
             ]
         ),
-        http_client=httpx.AsyncClient(
-            transport=httpx.MockTransport(lambda _: httpx.Response(200))
-        ),
+        http_client=mock_http.client,
     )
 
     decision = await service.resolve_followup_prompt(
@@ -500,15 +620,16 @@ async def test_resolve_followup_prompt_clarifies_with_multiple_subject_candidate
 
 
 @pytest.mark.anyio
-async def test_resolve_pending_followup_reply_applies_subject_to_template() -> None:
+async def test_resolve_pending_followup_reply_applies_subject_to_template(
+    search_context: SearchContextStore,
+    mock_http: MockHttp,
+) -> None:
     service = SearchService(
         settings=_settings(),
         search_client=_FakeSearchClient([]),
-        search_context=SearchContextStore(ttl_seconds=60),
+        search_context=search_context,
         openrouter_client=_FakeOpenRouterClient(["unused"]),
-        http_client=httpx.AsyncClient(
-            transport=httpx.MockTransport(lambda _: httpx.Response(200))
-        ),
+        http_client=mock_http.client,
     )
 
     decision = await service.resolve_pending_followup_reply(
@@ -533,6 +654,8 @@ async def test_resolve_pending_followup_reply_applies_subject_to_template() -> N
 @pytest.mark.anyio
 async def test_resolve_followup_prompt_logs_debug_reason_codes(
     caplog: pytest.LogCaptureFixture,
+    search_context: SearchContextStore,
+    mock_http: MockHttp,
 ) -> None:
     fake_openrouter = _FakeOpenRouterClient(
         [
@@ -550,11 +673,9 @@ async def test_resolve_followup_prompt_logs_debug_reason_codes(
     service = SearchService(
         settings=replace(_settings(), bot_search_debug_logging=True),
         search_client=_FakeSearchClient([]),
-        search_context=SearchContextStore(ttl_seconds=60),
+        search_context=search_context,
         openrouter_client=fake_openrouter,
-        http_client=httpx.AsyncClient(
-            transport=httpx.MockTransport(lambda _: httpx.Response(200))
-        ),
+        http_client=mock_http.client,
     )
     caplog.set_level(logging.INFO, logger="signal_bot_orx.search_service")
 
@@ -567,21 +688,17 @@ async def test_resolve_followup_prompt_logs_debug_reason_codes(
         source_context=[{"mode": "search", "title": "Nick Land", "snippet": ""}],
     )
 
-    assert any(
-        "search_debug event=followup_resolution_detected" in record.getMessage()
-        for record in caplog.records
-    )
-    assert any(
-        "search_debug event=followup_resolution_resolved" in record.getMessage()
-        and "reason_code=deterministic_subject" in record.getMessage()
-        and "confidence_bucket=high" in record.getMessage()
-        for record in caplog.records
-    )
+    blob = _log_blob(caplog)
+    assert "search_debug event=followup_resolution_detected" in blob
+    assert _RESOLVED_HIGH.search(blob)
     assert fake_openrouter.seen_messages == []
 
 
 @pytest.mark.anyio
-async def test_summarize_search_stores_sources() -> None:
+async def test_summarize_search_stores_sources(
+    search_context: SearchContextStore,
+    mock_http: MockHttp,
+) -> None:
     results = [
         SearchResult(
             mode="search",
@@ -593,11 +710,9 @@ async def test_summarize_search_stores_sources() -> None:
     service = SearchService(
         settings=_settings(),
         search_client=_FakeSearchClient(results),
-        search_context=SearchContextStore(ttl_seconds=60),
+        search_context=search_context,
         openrouter_client=_FakeOpenRouterClient(["OpenRouter released updates."]),
-        http_client=httpx.AsyncClient(
-            transport=httpx.MockTransport(lambda _: httpx.Response(200))
-        ),
+        http_client=mock_http.client,
     )
 
     summary = await service.summarize_search(
@@ -615,7 +730,10 @@ async def test_summarize_search_stores_sources() -> None:
 
 
 @pytest.mark.anyio
-async def test_summarize_search_includes_response_style_instruction() -> None:
+async def test_summarize_search_includes_response_style_instruction(
+    search_context: SearchContextStore,
+    mock_http: MockHttp,
+) -> None:
     results = [
         SearchResult(
             mode="search",
@@ -628,11 +746,9 @@ async def test_summarize_search_includes_response_style_instruction() -> None:
     service = SearchService(
         settings=_settings(),
         search_client=_FakeSearchClient(results),
-        search_context=SearchContextStore(ttl_seconds=60),
+        search_context=search_context,
         openrouter_client=fake_openrouter,
-        http_client=httpx.AsyncClient(
-            transport=httpx.MockTransport(lambda _: httpx.Response(200))
-        ),
+        http_client=mock_http.client,
     )
 
     await service.summarize_search(
@@ -647,25 +763,18 @@ async def test_summarize_search_includes_response_style_instruction() -> None:
 
 
 @pytest.mark.anyio
-async def test_summarize_search_persona_enabled_includes_core_prompt() -> None:
-    results = [
-        SearchResult(
-            mode="search",
-            title="Result title",
-            url="https://example.com",
-            snippet="snippet",
-        )
-    ]
+async def test_summarize_search_persona_enabled_includes_core_prompt(
+    search_context: SearchContextStore,
+    mock_http: MockHttp,
+) -> None:
     settings = replace(_settings(), bot_search_persona_enabled=True)
     fake_openrouter = _FakeOpenRouterClient(["summary"])
     service = SearchService(
         settings=settings,
-        search_client=_FakeSearchClient(results),
-        search_context=SearchContextStore(ttl_seconds=60),
+        search_client=_FakeSearchClient(_ONE_RESULT),
+        search_context=search_context,
         openrouter_client=fake_openrouter,
-        http_client=httpx.AsyncClient(
-            transport=httpx.MockTransport(lambda _: httpx.Response(200))
-        ),
+        http_client=mock_http.client,
     )
 
     await service.summarize_search(
@@ -681,26 +790,17 @@ async def test_summarize_search_persona_enabled_includes_core_prompt() -> None:
 
 
 @pytest.mark.anyio
-async def test_summarize_search_persona_enabled_matches_auto_and_command_paths() -> (
-    None
-):
-    results = [
-        SearchResult(
-            mode="search",
-            title="Result title",
-            url="https://example.com",
-            snippet="snippet",
-        )
-    ]
+async def test_summarize_search_persona_enabled_matches_auto_and_command_paths(
+    search_context: SearchContextStore,
+    mock_http: MockHttp,
+) -> None:
     fake_openrouter = _FakeOpenRouterClient(["summary-one", "summary-two"])
     service = SearchService(
         settings=replace(_settings(), bot_search_persona_enabled=True),
-        search_client=_FakeSearchClient(results),
-        search_context=SearchContextStore(ttl_seconds=60),
+        search_client=_FakeSearchClient(_ONE_RESULT),
+        search_context=search_context,
         openrouter_client=fake_openrouter,
-        http_client=httpx.AsyncClient(
-            transport=httpx.MockTransport(lambda _: httpx.Response(200))
-        ),
+        http_client=mock_http.client,
     )
 
     await service.summarize_search(
@@ -723,24 +823,17 @@ async def test_summarize_search_persona_enabled_matches_auto_and_command_paths()
 
 
 @pytest.mark.anyio
-async def test_summarize_search_persona_disabled_uses_overlay_only() -> None:
-    results = [
-        SearchResult(
-            mode="search",
-            title="Result title",
-            url="https://example.com",
-            snippet="snippet",
-        )
-    ]
+async def test_summarize_search_persona_disabled_uses_overlay_only(
+    search_context: SearchContextStore,
+    mock_http: MockHttp,
+) -> None:
     fake_openrouter = _FakeOpenRouterClient(["summary"])
     service = SearchService(
         settings=_settings(),
-        search_client=_FakeSearchClient(results),
-        search_context=SearchContextStore(ttl_seconds=60),
+        search_client=_FakeSearchClient(_ONE_RESULT),
+        search_context=search_context,
         openrouter_client=fake_openrouter,
-        http_client=httpx.AsyncClient(
-            transport=httpx.MockTransport(lambda _: httpx.Response(200))
-        ),
+        http_client=mock_http.client,
     )
 
     await service.summarize_search(
@@ -755,24 +848,17 @@ async def test_summarize_search_persona_disabled_uses_overlay_only() -> None:
 
 
 @pytest.mark.anyio
-async def test_summarize_search_includes_recent_history_when_passed() -> None:
-    results = [
-        SearchResult(
-            mode="search",
-            title="Result title",
-            url="https://example.com",
-            snippet="snippet",
-        )
-    ]
+async def test_summarize_search_includes_recent_history_when_passed(
+    search_context: SearchContextStore,
+    mock_http: MockHttp,
+) -> None:
     fake_openrouter = _FakeOpenRouterClient(["summary"])
     service = SearchService(
         settings=_settings(),
-        search_client=_FakeSearchClient(results),
-        search_context=SearchContextStore(ttl_seconds=60),
+        search_client=_FakeSearchClient(_ONE_RESULT),
+        search_context=search_context,
         openrouter_client=fake_openrouter,
-        http_client=httpx.AsyncClient(
-            transport=httpx.MockTransport(lambda _: httpx.Response(200))
-        ),
+        http_client=mock_http.client,
     )
 
     await service.summarize_search(
@@ -790,24 +876,17 @@ async def test_summarize_search_includes_recent_history_when_passed() -> None:
 
 
 @pytest.mark.anyio
-async def test_summarize_search_omits_recent_history_when_not_passed() -> None:
-    results = [
-        SearchResult(
-            mode="search",
-            title="Result title",
-            url="https://example.com",
-            snippet="snippet",
-        )
-    ]
+async def test_summarize_search_omits_recent_history_when_not_passed(
+    search_context: SearchContextStore,
+    mock_http: MockHttp,
+) -> None:
     fake_openrouter = _FakeOpenRouterClient(["summary"])
     service = SearchService(
         settings=_settings(),
-        search_client=_FakeSearchClient(results),
-        search_context=SearchContextStore(ttl_seconds=60),
+        search_client=_FakeSearchClient(_ONE_RESULT),
+        search_context=search_context,
         openrouter_client=fake_openrouter,
-        http_client=httpx.AsyncClient(
-            transport=httpx.MockTransport(lambda _: httpx.Response(200))
-        ),
+        http_client=mock_http.client,
     )
 
     await service.summarize_search(
@@ -823,15 +902,9 @@ async def test_summarize_search_omits_recent_history_when_not_passed() -> None:
 @pytest.mark.anyio
 async def test_summarize_search_logs_summary_request_when_debug_enabled(
     caplog: pytest.LogCaptureFixture,
+    search_context: SearchContextStore,
+    mock_http: MockHttp,
 ) -> None:
-    results = [
-        SearchResult(
-            mode="search",
-            title="Result title",
-            url="https://example.com",
-            snippet="snippet",
-        )
-    ]
     fake_openrouter = _FakeOpenRouterClient(["summary"])
     service = SearchService(
         settings=replace(
@@ -839,12 +912,10 @@ async def test_summarize_search_logs_summary_request_when_debug_enabled(
             bot_search_debug_logging=True,
             bot_search_persona_enabled=True,
         ),
-        search_client=_FakeSearchClient(results),
-        search_context=SearchContextStore(ttl_seconds=60),
+        search_client=_FakeSearchClient(_ONE_RESULT),
+        search_context=search_context,
         openrouter_client=fake_openrouter,
-        http_client=httpx.AsyncClient(
-            transport=httpx.MockTransport(lambda _: httpx.Response(200))
-        ),
+        http_client=mock_http.client,
     )
     caplog.set_level(logging.INFO, logger="signal_bot_orx.search_service")
 
@@ -858,18 +929,14 @@ async def test_summarize_search_logs_summary_request_when_debug_enabled(
         ],
     )
 
-    assert any(
-        "search_debug event=summary_request" in record.getMessage()
-        and "mode=search" in record.getMessage()
-        and "result_count=1" in record.getMessage()
-        and "history_included=True" in record.getMessage()
-        and "persona_enabled=True" in record.getMessage()
-        for record in caplog.records
-    )
+    assert _SUMMARY_REQUEST.search(_log_blob(caplog))
 
 
 @pytest.mark.anyio
-async def test_search_image_downloads_first_valid_image() -> None:
+async def test_search_image_downloads_first_valid_image(
+    search_context: SearchContextStore,
+    mock_http: MockHttp,
+) -> None:
     results = [
         SearchResult(
             mode="images",
@@ -891,9 +958,9 @@ async def test_search_image_downloads_first_valid_image() -> None:
     service = SearchService(
         settings=_settings(),
         search_client=_FakeSearchClient(results),
-        search_context=SearchContextStore(ttl_seconds=60),
+        search_context=search_context,
         openrouter_client=_FakeOpenRouterClient([]),
-        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        http_client=mock_http.set_handler(handler),
     )
 
     image_bytes, content_type = await service.search_image(
@@ -906,32 +973,16 @@ async def test_search_image_downloads_first_valid_image() -> None:
 
 
 @pytest.mark.anyio
-async def test_video_list_reply_stores_pending_selection() -> None:
-    results = [
-        SearchResult(
-            mode="videos",
-            title="Video one",
-            url="https://youtube.com/watch?v=one",
-            snippet="",
-            image_url="https://img.example/one.jpg",
-        ),
-        SearchResult(
-            mode="videos",
-            title="Video two",
-            url="https://youtube.com/watch?v=two",
-            snippet="",
-            image_url="https://img.example/two.jpg",
-        ),
-    ]
-    context = SearchContextStore(ttl_seconds=60)
+async def test_video_list_reply_stores_pending_selection(
+    search_context: SearchContextStore,
+    mock_http: MockHttp,
+) -> None:
     service = SearchService(
         settings=_settings(),
-        search_client=_FakeSearchClient(results),
-        search_context=context,
+        search_client=_FakeSearchClient(_TWO_VIDEOS),
+        search_context=search_context,
         openrouter_client=_FakeOpenRouterClient([]),
-        http_client=httpx.AsyncClient(
-            transport=httpx.MockTransport(lambda _: httpx.Response(200))
-        ),
+        http_client=mock_http.client,
     )
 
     reply = await service.video_list_reply(
@@ -946,19 +997,14 @@ async def test_video_list_reply_stores_pending_selection() -> None:
     assert "1. Video one" in reply
     assert pending is not None
     assert len(pending.results) == 2
+    await service.aclose()
 
 
 @pytest.mark.anyio
-async def test_resolve_video_selection_downloads_thumbnail() -> None:
-    results = [
-        SearchResult(
-            mode="videos",
-            title="Video one",
-            url="https://youtube.com/watch?v=one",
-            snippet="",
-            image_url="https://img.example/one.jpg",
-        )
-    ]
+async def test_resolve_video_selection_downloads_thumbnail(
+    search_context: SearchContextStore,
+    mock_http: MockHttp,
+) -> None:
 
     def handler(request: httpx.Request) -> httpx.Response:
         assert str(request.url) == "https://img.example/one.jpg"
@@ -970,10 +1016,10 @@ async def test_resolve_video_selection_downloads_thumbnail() -> None:
 
     service = SearchService(
         settings=_settings(),
-        search_client=_FakeSearchClient(results),
-        search_context=SearchContextStore(ttl_seconds=60),
+        search_client=_FakeSearchClient(_ONE_VIDEO),
+        search_context=search_context,
         openrouter_client=_FakeOpenRouterClient([]),
-        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        http_client=mock_http.set_handler(handler),
     )
 
     await service.video_list_reply(
@@ -989,27 +1035,147 @@ async def test_resolve_video_selection_downloads_thumbnail() -> None:
     assert content_type == "image/jpeg"
     assert url == "https://youtube.com/watch?v=one"
     assert title == "Video one"
+    await service.aclose()
 
 
 @pytest.mark.anyio
-async def test_resolve_video_selection_rejects_out_of_range() -> None:
-    results = [
-        SearchResult(
-            mode="videos",
-            title="Video one",
-            url="https://youtube.com/watch?v=one",
-            snippet="",
-            image_url="https://img.example/one.jpg",
+async def test_resolve_video_selection_reuses_prefetched_thumbnail(
+    search_context: SearchContextStore,
+    mock_http: MockHttp,
+) -> None:
+    fetched: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        fetched.append(str(request.url))
+        return httpx.Response(
+            200,
+            content=b"thumb-bytes",
+            headers={"content-type": "image/jpeg"},
         )
+
+    service = SearchService(
+        settings=_settings(),
+        search_client=_FakeSearchClient(_TWO_VIDEOS),
+        search_context=search_context,
+        openrouter_client=_FakeOpenRouterClient([]),
+        http_client=mock_http.set_handler(handler),
+    )
+
+    await service.video_list_reply(
+        conversation_key="dm:+15550002222",
+        query="nick land interview",
+    )
+    for _ in range(2):
+        image_bytes, _, _, _ = await service.resolve_video_selection(
+            conversation_key="dm:+15550002222",
+            selection_number=2,
+        )
+        assert image_bytes == b"thumb-bytes"
+
+    assert fetched.count("https://img.example/two.jpg") == 1
+    await service.aclose()
+
+
+@pytest.mark.anyio
+async def test_video_list_reply_prefetches_only_top_thumbnails(
+    search_context: SearchContextStore,
+    mock_http: MockHttp,
+) -> None:
+    fetched: list[str] = []
+    top_started = asyncio.Event()
+    never = asyncio.Event()
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        fetched.append(str(request.url))
+        if len(fetched) == 3:
+            top_started.set()
+        await never.wait()
+        return httpx.Response(200)
+
+    service = SearchService(
+        settings=_settings(),
+        search_client=_FakeSearchClient(_FIVE_VIDEOS),
+        search_context=search_context,
+        openrouter_client=_FakeOpenRouterClient([]),
+        http_client=mock_http.set_handler(handler),
+    )
+
+    await service.video_list_reply(
+        conversation_key="dm:+15550002222",
+        query="nick land interview",
+    )
+    await top_started.wait()
+    # Give any further prefetch the same turn the first three had.
+    await asyncio.sleep(0)
+    await service.aclose()
+
+    assert fetched == [
+        "https://img.example/1.jpg",
+        "https://img.example/2.jpg",
+        "https://img.example/3.jpg",
     ]
+
+
+@pytest.mark.anyio
+async def test_resolve_video_selection_refetches_after_prefetch_is_cancelled(
+    search_context: SearchContextStore,
+    mock_http: MockHttp,
+) -> None:
+    prefetch_started = asyncio.Event()
+    never = asyncio.Event()
+    calls = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        del request
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            prefetch_started.set()
+            await never.wait()
+        return httpx.Response(
+            200,
+            content=b"thumb-bytes",
+            headers={"content-type": "image/jpeg"},
+        )
+
     service = SearchService(
         settings=_settings(),
-        search_client=_FakeSearchClient(results),
-        search_context=SearchContextStore(ttl_seconds=60),
+        search_client=_FakeSearchClient(_ONE_VIDEO),
+        search_context=search_context,
         openrouter_client=_FakeOpenRouterClient([]),
-        http_client=httpx.AsyncClient(
-            transport=httpx.MockTransport(lambda _: httpx.Response(200))
-        ),
+        http_client=mock_http.set_handler(handler),
+    )
+
+    await service.video_list_reply(
+        conversation_key="dm:+15550002222",
+        query="nick land interview",
+    )
+    await prefetch_started.wait()
+    pick = asyncio.create_task(
+        service.resolve_video_selection(
+            conversation_key="dm:+15550002222",
+            selection_number=1,
+        )
+    )
+    await asyncio.sleep(0)
+    await service.aclose()
+    image_bytes, _, _, _ = await pick
+
+    assert image_bytes == b"thumb-bytes"
+    assert calls == 2
+
+
+@pytest.mark.anyio
+async def test_resolve_video_selection_rejects_out_of_range(
+    search_context: SearchContextStore,
+    mock_http: MockHttp,
+) -> None:
+    service = SearchService(
+        settings=_settings(),
+        search_client=_FakeSearchClient(_ONE_VIDEO),
+        search_context=search_context,
+        openrouter_client=_FakeOpenRouterClient([]),
+        http_client=mock_http.client,
     )
     await service.video_list_reply(
         conversation_key="dm:+15550002222",
@@ -1023,12 +1189,14 @@ async def test_resolve_video_selection_rejects_out_of_range() -> None:
         )
 
     assert "between 1 and 1" in str(exc.value)
+    await service.aclose()
 
 
 @pytest.mark.anyio
-async def test_resolve_video_selection_returns_text_fallback_when_no_thumbnail() -> (
-    None
-):
+async def test_resolve_video_selection_returns_text_fallback_when_no_thumbnail(
+    search_context: SearchContextStore,
+    mock_http: MockHttp,
+) -> None:
     results = [
         SearchResult(
             mode="videos",
@@ -1041,11 +1209,9 @@ async def test_resolve_video_selection_returns_text_fallback_when_no_thumbnail()
     service = SearchService(
         settings=_settings(),
         search_client=_FakeSearchClient(results),
-        search_context=SearchContextStore(ttl_seconds=60),
+        search_context=search_context,
         openrouter_client=_FakeOpenRouterClient([]),
-        http_client=httpx.AsyncClient(
-            transport=httpx.MockTransport(lambda _: httpx.Response(200))
-        ),
+        http_client=mock_http.client,
     )
     await service.video_list_reply(
         conversation_key="dm:+15550002222",
@@ -1061,3 +1227,4 @@ async def test_resolve_video_selection_returns_text_fallback_when_no_thumbnail()
     assert content_type is None
     assert url == "https://youtube.com/watch?v=one"
     assert title == "Video one"
+    await service.aclose()
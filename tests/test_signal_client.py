@@ -1,10 +1,12 @@
 from __future__ import annotations
 
-import json
-from typing import cast
+import base64
+from typing import Any
 
 import httpx
+import orjson
 import pytest
+from _fakes import MockHttp
 
 from signal_bot_orx.group_resolver import ResolvedGroupRecipients
 from signal_bot_orx.signal_client import (
@@ -15,7 +17,7 @@ from signal_bot_orx.signal_client import (
 from signal_bot_orx.types import Target
 
 
-class StaticGroupResolver:
+class StaticGroupResolver(GroupResolverLike):
     def __init__(
         self,
         *,
@@ -27,173 +29,213 @@ class StaticGroupResolver:
             cache_refreshed=cache_refreshed,
         )
 
-    async def resolve(self, _: str) -> ResolvedGroupRecipients:
+    async def resolve(self, group_id: str) -> ResolvedGroupRecipients:
+        del group_id
         return self._resolved
 
 
+class _Capture:
+    """MockTransport handler recording send payloads, answering by recipient."""
+
+    __slots__ = ("default", "requests", "responses")
+
+    def __init__(
+        self, responses: dict[str, int] | None = None, *, default: int = 201
+    ) -> None:
+        self.requests: list[dict[str, Any]] = []
+        self.responses = responses or {}
+        self.default = default
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        payload = orjson.loads(request.content)
+        self.requests.append(payload)
+        status = self.responses.get(payload["recipients"][0], self.default)
+        if status >= 400:
+            return httpx.Response(status, json={"error": "Failed to send message"})
+        return httpx.Response(status, json={"timestamp": 1})
+
+
 def _resolver(
     *, recipients: tuple[str, ...], cache_refreshed: bool = False
 ) -> GroupResolverLike:
-    return cast(
-        GroupResolverLike,
-        StaticGroupResolver(
-            recipients=recipients,
-            cache_refreshed=cache_refreshed,
-        ),
-    )
+    return StaticGroupResolver(recipients=recipients, cache_refreshed=cache_refreshed)
 
 
 @pytest.mark.anyio
-async def test_signal_client_send_text_payload() -> None:
-    captured: list[dict[str, object]] = []
-
-    def handler(request: httpx.Request) -> httpx.Response:
-        captured.append(json.loads(request.content.decode("utf-8")))
-        return httpx.Response(201, json={"timestamp": 1})
-
-    transport = httpx.MockTransport(handler)
-    async with httpx.AsyncClient(transport=transport) as client:
-        signal = SignalClient(
-            base_url="http://signal.local",
-            sender_number="+1999",
-            http_client=client,
-            group_resolver=_resolver(recipients=("group.x",)),
-        )
-        await signal.send_text(target=Target(recipient="+1222"), message="hello")
+async def test_signal_client_send_text_payload(mock_http: MockHttp) -> None:
+    capture = _Capture()
+
+    signal = SignalClient(
+        base_url="http://signal.local",
+        sender_number="+1999",
+        http_client=mock_http.set_handler(capture),
+        group_resolver=_resolver(recipients=("group.x",)),
+    )
+    await signal.send_text(target=Target(recipient="+1222"), message="hello")
 
-    assert captured
-    payload = captured[0]
+    assert capture.requests
+    payload = capture.requests[0]
     assert payload["number"] == "+1999"
     assert payload["recipients"] == ["+1222"]
     assert payload["message"] == "hello"
 
 
 @pytest.mark.anyio
-async def test_signal_client_send_image_payload() -> None:
-    captured: list[dict[str, object]] = []
-
-    def handler(request: httpx.Request) -> httpx.Response:
-        captured.append(json.loads(request.content.decode("utf-8")))
-        return httpx.Response(201, json={"timestamp": 1})
-
-    transport = httpx.MockTransport(handler)
-    async with httpx.AsyncClient(transport=transport) as client:
-        signal = SignalClient(
-            base_url="http://signal.local",
-            sender_number="+1999",
-            http_client=client,
-            group_resolver=_resolver(recipients=("group.x",)),
-        )
-        await signal.send_image(
-            target=Target(recipient="+1222"),
-            image_bytes=b"raw",
-            content_type="image/png",
-            caption="done",
-        )
+async def test_signal_client_send_image_payload(mock_http: MockHttp) -> None:
+    capture = _Capture()
+
+    signal = SignalClient(
+        base_url="http://signal.local",
+        sender_number="+1999",
+        http_client=mock_http.set_handler(capture),
+        group_resolver=_resolver(recipients=("group.x",)),
+    )
+    await signal.send_image(
+        target=Target(recipient="+1222"),
+        image_bytes=b"raw",
+        content_type="image/png",
+        caption="done",
+    )
 
-    payload = captured[0]
+    payload = capture.requests[0]
     assert payload["number"] == "+1999"
     assert payload["message"] == "done"
     attachments = payload["base64_attachments"]
     assert isinstance(attachments, list)
-    assert attachments[0].startswith("data:image/png;filename=image.png;base64,")
+    assert attachments[0] == "data:image/png;filename=image.png;base64,cmF3"
 
 
 @pytest.mark.anyio
-async def test_signal_client_group_uses_resolver_primary_candidate() -> None:
-    captured: list[dict[str, object]] = []
+async def test_signal_client_send_large_image_payload(mock_http: MockHttp) -> None:
+    capture = _Capture()
+    image_bytes = bytes(range(256)) * 512
+
+    signal = SignalClient(
+        base_url="http://signal.local",
+        sender_number="+1999",
+        http_client=mock_http.set_handler(capture),
+        group_resolver=_resolver(recipients=("group.x",)),
+    )
+    await signal.send_image(
+        target=Target(recipient="+1222"),
+        image_bytes=image_bytes,
+        content_type="image/jpeg",
+    )
+
+    attachment = capture.requests[0]["base64_attachments"][0]
+    prefix, _, encoded = attachment.partition("base64,")
+    assert prefix == "data:image/jpeg;filename=image.jpg;"
+    assert base64.b64decode(encoded) == image_bytes
 
-    def handler(request: httpx.Request) -> httpx.Response:
-        captured.append(json.loads(request.content.decode("utf-8")))
-        return httpx.Response(201, json={"timestamp": 1})
-
-    transport = httpx.MockTransport(handler)
-    async with httpx.AsyncClient(transport=transport) as client:
-        signal = SignalClient(
-            base_url="http://signal.local",
-            sender_number="+1999",
-            http_client=client,
-            group_resolver=_resolver(
-                recipients=("group.canonical", "group.raw", "raw"),
-            ),
-        )
-        await signal.send_text(target=Target(group_id="group-abc"), message="hello")
 
-    payload = captured[0]
+@pytest.mark.anyio
+async def test_signal_client_group_uses_resolver_primary_candidate(
+    mock_http: MockHttp,
+) -> None:
+    capture = _Capture()
+
+    signal = SignalClient(
+        base_url="http://signal.local",
+        sender_number="+1999",
+        http_client=mock_http.set_handler(capture),
+        group_resolver=_resolver(
+            recipients=("group.canonical", "group.raw", "raw"),
+        ),
+    )
+    await signal.send_text(target=Target(group_id="group-abc"), message="hello")
+
+    payload = capture.requests[0]
     assert payload["number"] == "+1999"
     assert payload["recipients"] == ["group.canonical"]
 
 
 @pytest.mark.anyio
-async def test_signal_client_group_falls_back_to_next_resolver_candidate_on_400() -> (
-    None
-):
-    captured: list[dict[str, object]] = []
-
-    def handler(request: httpx.Request) -> httpx.Response:
-        payload = json.loads(request.content.decode("utf-8"))
-        captured.append(payload)
-        if len(captured) == 1:
-            return httpx.Response(400, json={"error": "Failed to send message"})
-        return httpx.Response(201, json={"timestamp": 2})
-
-    transport = httpx.MockTransport(handler)
-    async with httpx.AsyncClient(transport=transport) as client:
-        signal = SignalClient(
-            base_url="http://signal.local",
-            sender_number="+1999",
-            http_client=client,
-            group_resolver=_resolver(
-                recipients=("group.canonical", "group.raw", "raw"),
-            ),
-        )
-        await signal.send_text(target=Target(group_id="group-abc"), message="hello")
+async def test_signal_client_group_falls_back_to_next_resolver_candidate_on_400(
+    mock_http: MockHttp,
+) -> None:
+    capture = _Capture({"group.canonical": 400})
+
+    signal = SignalClient(
+        base_url="http://signal.local",
+        sender_number="+1999",
+        http_client=mock_http.set_handler(capture),
+        group_resolver=_resolver(
+            recipients=("group.canonical", "group.raw", "raw"),
+        ),
+    )
+    await signal.send_text(target=Target(group_id="group-abc"), message="hello")
 
-    assert len(captured) == 2
-    assert captured[0]["recipients"] == ["group.canonical"]
-    assert captured[1]["recipients"] == ["group.raw"]
+    assert len(capture.requests) == 2
+    assert capture.requests[0]["recipients"] == ["group.canonical"]
+    assert capture.requests[1]["recipients"] == ["group.raw"]
 
 
 @pytest.mark.anyio
-async def test_signal_client_group_terminal_error_includes_refresh_flag() -> None:
-    def handler(_: httpx.Request) -> httpx.Response:
-        return httpx.Response(400, json={"error": "Failed to send message"})
+async def test_signal_client_group_reuses_last_working_candidate(
+    mock_http: MockHttp,
+) -> None:
+    capture = _Capture({"group.canonical": 400})
+
+    signal = SignalClient(
+        base_url="http://signal.local",
+        sender_number="+1999",
+        http_client=mock_http.set_handler(capture),
+        group_resolver=_resolver(
+            recipients=("group.canonical", "group.raw", "raw"),
+        ),
+    )
+    await signal.send_text(target=Target(group_id="group-abc"), message="one")
+    await signal.send_text(target=Target(group_id="group-abc"), message="two")
 
-    transport = httpx.MockTransport(handler)
-    async with httpx.AsyncClient(transport=transport) as client:
-        signal = SignalClient(
-            base_url="http://signal.local",
-            sender_number="+1999",
-            http_client=client,
-            group_resolver=_resolver(
-                recipients=("group.canonical", "group.raw"),
-                cache_refreshed=True,
-            ),
-        )
-        with pytest.raises(SignalSendError) as exc:
-            await signal.send_text(target=Target(group_id="group-abc"), message="hello")
+    assert [item["recipients"] for item in capture.requests] == [
+        ["group.canonical"],
+        ["group.raw"],
+        ["group.raw"],
+    ]
+
+
+@pytest.mark.anyio
+async def test_signal_client_group_terminal_error_includes_refresh_flag(
+    mock_http: MockHttp,
+) -> None:
+    capture = _Capture(default=400)
+
+    signal = SignalClient(
+        base_url="http://signal.local",
+        sender_number="+1999",
+        http_client=mock_http.set_handler(capture),
+        group_resolver=_resolver(
+            recipients=("group.canonical", "group.raw"),
+            cache_refreshed=True,
+        ),
+    )
+    with pytest.raises(SignalSendError) as exc:
+        await signal.send_text(target=Target(group_id="group-abc"), message="hello")
 
     assert "status 400" in str(exc.value)
     assert "recipient=group.raw" in str(exc.value)
     assert "resolver_cache_refreshed=True" in str(exc.value)
     assert "candidate_count=2" in str(exc.value)
+    assert exc.value.status_code == 400
+    assert exc.value.recipient == "group.raw"
+    assert exc.value.detail == "Failed to send message"
+    assert exc.value.cache_refreshed is True
+    assert exc.value.candidate_count == 2
 
 
 @pytest.mark.anyio
-async def test_signal_client_includes_4xx_detail() -> None:
+async def test_signal_client_includes_4xx_detail(mock_http: MockHttp) -> None:
     def handler(_: httpx.Request) -> httpx.Response:
         return httpx.Response(400, json={"error": "recipient required"})
 
-    transport = httpx.MockTransport(handler)
-    async with httpx.AsyncClient(transport=transport) as client:
-        signal = SignalClient(
-            base_url="http://signal.local",
-            sender_number="+1999",
-            http_client=client,
-            group_resolver=_resolver(recipients=("group.x",)),
-        )
-        with pytest.raises(SignalSendError) as exc:
-            await signal.send_text(target=Target(recipient="+1222"), message="hello")
+    signal = SignalClient(
+        base_url="http://signal.local",
+        sender_number="+1999",
+        http_client=mock_http.set_handler(handler),
+        group_resolver=_resolver(recipients=("group.x",)),
+    )
+    with pytest.raises(SignalSendError) as exc:
+        await signal.send_text(target=Target(recipient="+1222"), message="hello")
 
     assert "status 400" in str(exc.value)
     assert "recipient=+1222" in str(exc.value)
@@ -201,70 +243,92 @@ async def test_signal_client_includes_4xx_detail() -> None:
 
 
 @pytest.mark.anyio
-async def test_signal_client_group_uses_dm_fallback_after_all_400s() -> None:
-    captured: list[dict[str, object]] = []
+async def test_signal_client_group_uses_dm_fallback_after_all_400s(
+    mock_http: MockHttp,
+) -> None:
+    capture = _Capture({"+1222": 201}, default=400)
+
+    signal = SignalClient(
+        base_url="http://signal.local",
+        sender_number="+1999",
+        http_client=mock_http.set_handler(capture),
+        group_resolver=_resolver(
+            recipients=("group.canonical", "group.raw"),
+            cache_refreshed=True,
+        ),
+    )
+    await signal.send_text(
+        target=Target(group_id="group-abc"),
+        message="hello",
+        fallback_recipient="+1222",
+    )
 
-    def handler(request: httpx.Request) -> httpx.Response:
-        payload = json.loads(request.content.decode("utf-8"))
-        captured.append(payload)
-        recipient = payload["recipients"][0]
-        if recipient == "+1222":
-            return httpx.Response(201, json={"timestamp": 3})
-        return httpx.Response(400, json={"error": "Failed to send message"})
+    assert len(capture.requests) == 3
+    assert capture.requests[0]["recipients"] == ["group.canonical"]
+    assert capture.requests[1]["recipients"] == ["group.raw"]
+    assert capture.requests[2]["recipients"] == ["+1222"]
 
-    transport = httpx.MockTransport(handler)
-    async with httpx.AsyncClient(transport=transport) as client:
-        signal = SignalClient(
-            base_url="http://signal.local",
-            sender_number="+1999",
-            http_client=client,
-            group_resolver=_resolver(
-                recipients=("group.canonical", "group.raw"),
-                cache_refreshed=True,
-            ),
-        )
+
+@pytest.mark.anyio
+async def test_signal_client_group_dm_fallback_failure_raises_original_group_error(
+    mock_http: MockHttp,
+) -> None:
+    capture = _Capture(default=400)
+
+    signal = SignalClient(
+        base_url="http://signal.local",
+        sender_number="+1999",
+        http_client=mock_http.set_handler(capture),
+        group_resolver=_resolver(
+            recipients=("group.canonical", "group.raw"),
+            cache_refreshed=False,
+        ),
+    )
+    with pytest.raises(SignalSendError) as exc:
         await signal.send_text(
             target=Target(group_id="group-abc"),
             message="hello",
             fallback_recipient="+1222",
         )
 
-    assert len(captured) == 3
-    assert captured[0]["recipients"] == ["group.canonical"]
-    assert captured[1]["recipients"] == ["group.raw"]
-    assert captured[2]["recipients"] == ["+1222"]
+    assert len(capture.requests) == 3
+    assert capture.requests[2]["recipients"] == ["+1222"]
+    assert "recipient=group.raw" in str(exc.value)
+    assert "candidate_count=2" in str(exc.value)
 
 
 @pytest.mark.anyio
-async def test_signal_client_group_dm_fallback_failure_raises_original_group_error() -> (
-    None
-):
-    captured: list[dict[str, object]] = []
+async def test_signal_client_group_retries_send_identical_payload_bodies(
+    mock_http: MockHttp,
+) -> None:
+    bodies: list[bytes] = []
 
     def handler(request: httpx.Request) -> httpx.Response:
-        payload = json.loads(request.content.decode("utf-8"))
-        captured.append(payload)
+        bodies.append(request.content)
         return httpx.Response(400, json={"error": "Failed to send message"})
 
-    transport = httpx.MockTransport(handler)
-    async with httpx.AsyncClient(transport=transport) as client:
-        signal = SignalClient(
-            base_url="http://signal.local",
-            sender_number="+1999",
-            http_client=client,
-            group_resolver=_resolver(
-                recipients=("group.canonical", "group.raw"),
-                cache_refreshed=False,
-            ),
+    signal = SignalClient(
+        base_url="http://signal.local",
+        sender_number="+1999",
+        http_client=mock_http.set_handler(handler),
+        group_resolver=_resolver(recipients=("group.canonical", "group.raw")),
+    )
+    with pytest.raises(SignalSendError):
+        await signal.send_image(
+            target=Target(group_id="group-abc"),
+            image_bytes=b"raw",
+            content_type="image/png",
+            caption="done",
         )
-        with pytest.raises(SignalSendError) as exc:
-            await signal.send_text(
-                target=Target(group_id="group-abc"),
-                message="hello",
-                fallback_recipient="+1222",
-            )
-
-    assert len(captured) == 3
-    assert captured[2]["recipients"] == ["+1222"]
-    assert "recipient=group.raw" in str(exc.value)
-    assert "candidate_count=2" in str(exc.value)
+
+    assert bodies == [
+        orjson.dumps(
+            {
+                "number": "+1999",
+                "recipients": [recipient],
+                "message": "done",
+                "base64_attachments": ["data:image/png;filename=image.png;base64,cmF3"],
+            }
+        )
+        for recipient in ("group.canonical", "group.raw")
+    ]
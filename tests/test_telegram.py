@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from typing import Any
+
 from signal_bot_orx.telegram import parse_telegram_webhook
 
 
@@ -67,6 +69,32 @@ def test_parse_telegram_webhook_reply_to_bot_sets_directed() -> None:
     assert parsed.directed_to_bot is True
 
 
+def test_parse_telegram_webhook_matches_bot_username_case_insensitively() -> None:
+    message: dict[str, Any] = {
+        "message_id": 12,
+        "date": 1730000000,
+        "text": "@SigBot summarize",
+        "entities": [{"type": "mention", "offset": 0, "length": 7}],
+        "from": {"id": 12345, "is_bot": False},
+        "chat": {"id": -10099, "type": "supergroup"},
+    }
+    mentioned = parse_telegram_webhook(
+        {"update_id": 1, "message": message}, bot_username="@SigBot"
+    )
+    message["entities"] = []
+    message["reply_to_message"] = {
+        "from": {"id": 999, "is_bot": True, "username": "SIGBOT"}
+    }
+    replied = parse_telegram_webhook(
+        {"update_id": 2, "message": message}, bot_username="sigbot"
+    )
+
+    assert mentioned is not None
+    assert mentioned.directed_to_bot is True
+    assert replied is not None
+    assert replied.directed_to_bot is True
+
+
 def test_parse_telegram_webhook_ignores_non_text_updates() -> None:
     payload = {
         "update_id": 1,
@@ -33,6 +33,7 @@ def test_format_current_imperial() -> None:
     assert "- Condition: Sunny" in out
     assert "- Temperature: 50.0°F" in out
     assert "- Feels like: 48.0°F" in out
+    assert "- Wind: 3.0 mph" in out
 
 
 def test_format_current_missing_fields() -> None:
@@ -105,3 +106,23 @@ def test_format_forecast_malformed() -> None:
     data = {}
     out = _format_forecast(data, "metric")
     assert out == "Could not parse forecast data."
+
+
+def test_format_forecast_prefers_entry_closest_to_noon() -> None:
+    city = {"name": "Oslo", "country": "NO"}
+    entries = [
+        {
+            "dt_txt": "2025-02-16 06:00:00",
+            "weather": [{"description": "fog"}],
+            "main": {"temp": -2},
+        },
+        {
+            "dt_txt": "2025-02-16 15:00:00",
+            "weather": [{"description": "overcast"}],
+            "main": {"temp": 1},
+        },
+    ]
+    data = {"city": city, "list": entries}
+    out = _format_forecast(data, "metric")
+    assert "2025-02-16: Overcast, 1°C" in out
+    assert "Fog" not in out
@@ -1,19 +1,26 @@
 from __future__ import annotations
 
+from functools import lru_cache
+
 from signal_bot_orx.config import Settings
 from signal_bot_orx.types import IncomingMessage, Target
 from signal_bot_orx.webhook import is_authorized_message
 
+_EMPTY: frozenset[str] = frozenset()
+_NUMBERS = frozenset({"+15550002222"})
+_GROUPS = frozenset({"group-123"})
+
 
+@lru_cache(maxsize=16)
 def _settings(
-    *, numbers: set[str], groups: set[str], disable_auth: bool = False
+    *, numbers: frozenset[str], groups: frozenset[str], disable_auth: bool = False
 ) -> Settings:
     return Settings(
         signal_api_base_url="http://localhost:8080",
         signal_sender_number="+15550001111",
         signal_sender_uuid=None,
-        signal_allowed_numbers=frozenset(numbers),
-        signal_allowed_group_ids=frozenset(groups),
+        signal_allowed_numbers=numbers,
+        signal_allowed_group_ids=groups,
         signal_disable_auth=disable_auth,
         openrouter_chat_api_key="or-key-chat",
         openrouter_model="openai/gpt-4o-mini",
@@ -21,7 +28,7 @@ def _settings(
 
 
 def test_authorized_by_number() -> None:
-    settings = _settings(numbers={"+15550002222"}, groups=set())
+    settings = _settings(numbers=_NUMBERS, groups=_EMPTY)
     message = IncomingMessage(
         sender="+15550002222",
         text="hello",
@@ -33,7 +40,7 @@ def test_authorized_by_number() -> None:
 
 
 def test_authorized_by_group_id() -> None:
-    settings = _settings(numbers=set(), groups={"group-123"})
+    settings = _settings(numbers=_EMPTY, groups=_GROUPS)
     message = IncomingMessage(
         sender="+19999999999",
         text="hello",
@@ -44,8 +51,20 @@ def test_authorized_by_group_id() -> None:
     assert is_authorized_message(message, settings) is True
 
 
+def test_authorized_by_number_in_unlisted_group() -> None:
+    settings = _settings(numbers=_NUMBERS, groups=_GROUPS)
+    message = IncomingMessage(
+        sender="+15550002222",
+        text="hello",
+        timestamp=1,
+        target=Target(recipient="+15550002222", group_id="group-999"),
+    )
+
+    assert is_authorized_message(message, settings) is True
+
+
 def test_unauthorized_when_not_in_any_allowlist() -> None:
-    settings = _settings(numbers={"+15550002222"}, groups={"group-123"})
+    settings = _settings(numbers=_NUMBERS, groups=_GROUPS)
     message = IncomingMessage(
         sender="+17777777777",
         text="hello",
@@ -57,7 +76,7 @@ def test_unauthorized_when_not_in_any_allowlist() -> None:
 
 
 def test_authorized_when_disable_auth_enabled() -> None:
-    settings = _settings(numbers=set(), groups=set(), disable_auth=True)
+    settings = _settings(numbers=_EMPTY, groups=_EMPTY, disable_auth=True)
     message = IncomingMessage(
         sender="+17777777777",
         text="hello",
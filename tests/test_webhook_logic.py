@@ -1,20 +1,25 @@
 from __future__ import annotations
 
-import inspect
-import json
 import logging
-from typing import Any, Literal, cast
+import re
+from collections.abc import Callable, Iterator
+from functools import cache
+from typing import Any, Literal, NamedTuple
 
 import httpx
+import orjson
 import pytest
-from fastapi import BackgroundTasks
+from _fakes import FakeMessengerClient, SentImage, SentText
+from fastapi import BackgroundTasks, FastAPI
 
 from signal_bot_orx.chat_context import ChatTurn
 from signal_bot_orx.config import Settings
 from signal_bot_orx.dedupe import DedupeCache
 from signal_bot_orx.group_resolver import ResolvedGroupRecipients
+from signal_bot_orx.openrouter_client import ImageGenerationError
 from signal_bot_orx.search_service import (
     FollowupResolutionDecision,
+    OpenRouterClientLike,
     SearchRouteDecision,
 )
 from signal_bot_orx.signal_client import GroupResolverLike, SignalClient
@@ -27,6 +32,7 @@ from signal_bot_orx.types import (
 )
 from signal_bot_orx.webhook import (
     WebhookHandler,
+    build_router,
     normalize_chat_prompt,
     parse_imagine_prompt,
     parse_numeric_selection,
@@ -35,8 +41,30 @@ from signal_bot_orx.webhook import (
     parse_source_request_text,
     resolve_reply_target,
     should_handle_chat_mention,
+    strip_aliases,
+    text_contains_alias,
 )
 
+pytestmark = pytest.mark.anyio
+
+_WEBHOOK_LOGGER = "signal_bot_orx.webhook"
+
+# Each pattern must match within one formatted record (one line of the blob).
+_ROUTE_SLASH_SEARCH_SUMMARY = re.compile(
+    r"search_route_debug .*slash_command=/search .*final_path=search_summary"
+)
+_ROUTE_AUTO_NEWS_SUMMARY = re.compile(
+    r"search_route_debug .*auto_should_search=True .*auto_mode=news "
+    r".*final_path=search_summary"
+)
+
+_USER = "+15550002222"
+_GROUP = "group-1"
+_TELEGRAM_SECRET = "s3cr3t"
+_DM_KEY = f"dm:{_USER}"
+_GROUP_TARGET = Target(recipient=_USER, group_id=_GROUP)
+_DM_TARGET = Target(recipient=_USER, group_id=None)
+
 
 def test_parse_imagine_prompt_valid() -> None:
     assert parse_imagine_prompt("/imagine cat astronaut") == "cat astronaut"
@@ -80,6 +108,8 @@ def test_parse_source_request_text() -> None:
     assert parse_source_request_text("source for that claim") == "that claim"
     assert parse_source_request_text("where did you get that") == ""
     assert parse_source_request_text("no source request") is None
+    assert parse_source_request_text("Links to the study?") == "the study"
+    assert parse_source_request_text("What's the source for this") == "this"
 
 
 def test_parse_signal_webhook_common_shape() -> None:
@@ -161,6 +191,34 @@ def test_parse_signal_webhook_accepts_whatsapp_shape() -> None:
     assert parsed.text == "hello from whatsapp"
 
 
+def test_parse_incoming_webhook_routes_by_payload_shape() -> None:
+    telegram = parse_incoming_webhook(
+        {
+            "update_id": 1,
+            "message": {
+                "text": "hi",
+                "from": {"id": 12345},
+                "chat": {"id": 12345, "type": "private"},
+            },
+        }
+    )
+    receipt = parse_incoming_webhook(
+        {"envelope": {"sourceNumber": "+15557654321", "receiptMessage": {}}}
+    )
+
+    assert telegram is not None
+    assert telegram.transport == "telegram"
+    assert receipt is None
+
+
+_ALLOWED_NUMS = frozenset({_USER})
+_ALLOWED_GROUPS = frozenset({_GROUP})
+_WHATSAPP_ALLOWED = frozenset({"user@c.us"})
+_TELEGRAM_USERS = frozenset({"12345"})
+_TELEGRAM_CHATS = frozenset({"-10099"})
+
+
+@cache
 def _settings(
     *,
     mode: Literal["group", "dm_fallback"],
@@ -189,8 +247,8 @@ def _settings(
         signal_api_base_url="http://localhost:8080",
         signal_sender_number="+15550001111",
         signal_sender_uuid=sender_uuid,
-        signal_allowed_numbers=frozenset({"+15550002222"}),
-        signal_allowed_group_ids=frozenset({"group-1"}),
+        signal_allowed_numbers=_ALLOWED_NUMS,
+        signal_allowed_group_ids=_ALLOWED_GROUPS,
         openrouter_chat_api_key="or-key-chat",
         openrouter_model="openai/gpt-4o-mini",
         signal_enabled=signal_enabled,
@@ -211,85 +269,86 @@ def _settings(
         bot_mention_aliases=("@bot",),
         whatsapp_enabled=whatsapp_enabled,
         whatsapp_bridge_base_url="http://localhost:3001" if whatsapp_enabled else None,
-        whatsapp_allowed_numbers=frozenset({"user@c.us"}),
+        whatsapp_allowed_numbers=_WHATSAPP_ALLOWED,
         whatsapp_disable_auth=whatsapp_disable_auth,
         telegram_enabled=telegram_enabled,
         telegram_bot_token="telegram-token" if telegram_enabled else None,
         telegram_webhook_secret=telegram_secret,
-        telegram_allowed_user_ids=frozenset({"12345"}),
-        telegram_allowed_chat_ids=frozenset({"-10099"}),
+        telegram_allowed_user_ids=_TELEGRAM_USERS,
+        telegram_allowed_chat_ids=_TELEGRAM_CHATS,
         telegram_disable_auth=telegram_disable_auth,
         telegram_bot_username="sigbot",
     )
 
 
-def test_resolve_reply_target_group_dm_fallback_mode() -> None:
-    message = IncomingMessage(
-        sender="+15550002222",
-        text="@bot hi",
-        timestamp=1,
-        target=Target(recipient="+15550002222", group_id="group-1"),
-    )
+_GROUP_SETTINGS = _settings(mode="group")
 
-    target = resolve_reply_target(message, _settings(mode="dm_fallback"))
+_TELEGRAM_SETTINGS = _settings(
+    mode="group",
+    telegram_enabled=True,
+    telegram_disable_auth=False,
+    telegram_secret=_TELEGRAM_SECRET,
+)
 
-    assert target == Target(recipient="+15550002222", group_id=None)
+_MSG_GROUP_ALIAS = IncomingMessage(
+    sender=_USER,
+    text="@bot hi",
+    timestamp=1,
+    target=_GROUP_TARGET,
+)
+_MSG_DM_ALIAS = IncomingMessage(
+    sender=_USER,
+    text="@bot hi",
+    timestamp=1,
+    target=_DM_TARGET,
+)
+_MSG_GROUP_SUMMARIZE = IncomingMessage(
+    sender=_USER,
+    text="@bot summarize",
+    timestamp=1,
+    target=_GROUP_TARGET,
+)
 
 
-def test_resolve_reply_target_group_group_mode() -> None:
-    message = IncomingMessage(
-        sender="+15550002222",
-        text="@bot hi",
-        timestamp=1,
-        target=Target(recipient="+15550002222", group_id="group-1"),
-    )
+def test_resolve_reply_target_group_dm_fallback_mode() -> None:
+    target = resolve_reply_target(_MSG_GROUP_ALIAS, _settings(mode="dm_fallback"))
 
-    target = resolve_reply_target(message, _settings(mode="group"))
+    assert target == _DM_TARGET
 
-    assert target == message.target
 
+def test_resolve_reply_target_group_group_mode() -> None:
+    target = resolve_reply_target(_MSG_GROUP_ALIAS, _GROUP_SETTINGS)
 
-def test_resolve_reply_target_dm_message_unchanged() -> None:
-    message = IncomingMessage(
-        sender="+15550002222",
-        text="@bot hi",
-        timestamp=1,
-        target=Target(recipient="+15550002222", group_id=None),
-    )
+    assert target == _MSG_GROUP_ALIAS.target
 
-    target = resolve_reply_target(message, _settings(mode="dm_fallback"))
 
-    assert target == message.target
+def test_resolve_reply_target_dm_message_unchanged() -> None:
+    target = resolve_reply_target(_MSG_DM_ALIAS, _settings(mode="dm_fallback"))
 
+    assert target == _MSG_DM_ALIAS.target
 
-def test_should_handle_chat_mention_true_for_dm() -> None:
-    message = IncomingMessage(
-        sender="+15550002222",
-        text="@bot hi",
-        timestamp=1,
-        target=Target(recipient="+15550002222", group_id=None),
-    )
 
-    assert should_handle_chat_mention(message, _settings(mode="group")) is True
+def test_should_handle_chat_mention_true_for_dm() -> None:
+    assert should_handle_chat_mention(_MSG_DM_ALIAS, _GROUP_SETTINGS) is True
 
 
 def test_should_handle_chat_mention_true_for_alias_fallback() -> None:
     message = IncomingMessage(
-        sender="+15550002222",
+        sender=_USER,
         text="@bot summarize that",
         timestamp=1,
-        target=Target(recipient="+15550002222", group_id="group-1"),
+        target=_GROUP_TARGET,
     )
 
-    assert should_handle_chat_mention(message, _settings(mode="group")) is True
+    assert should_handle_chat_mention(message, _GROUP_SETTINGS) is True
 
 
 def test_should_handle_chat_mention_true_for_metadata_uuid_match() -> None:
     message = IncomingMessage(
-        sender="+15550002222",
+        sender=_USER,
         text="ping",
         timestamp=1,
-        target=Target(recipient="+15550002222", group_id="group-1"),
+        target=_GROUP_TARGET,
         mentions=(MentionSpan(start=0, length=4, uuid="bot-uuid"),),
     )
 
@@ -302,110 +361,54 @@ def test_should_handle_chat_mention_true_for_metadata_uuid_match() -> None:
     )
 
 
-def test_normalize_chat_prompt_removes_alias() -> None:
+def test_should_handle_chat_mention_matches_uuid_case_insensitively() -> None:
     message = IncomingMessage(
-        sender="+15550002222",
-        text="@bot, summarize this please",
+        sender=_USER,
+        text="ping",
         timestamp=1,
-        target=Target(recipient="+15550002222", group_id="group-1"),
+        target=_GROUP_TARGET,
+        mentions=(
+            MentionSpan(start=0, length=4, uuid="someone-else"),
+            MentionSpan(start=0, length=4, uuid=" BOT-UUID "),
+        ),
     )
 
-    prompt = normalize_chat_prompt(message, _settings(mode="group"))
-
-    assert prompt == "summarize this please"
-
-
-class _FakeSignalClient:
-    def __init__(self) -> None:
-        self.text_targets: list[Target] = []
-        self.text_messages: list[str] = []
-        self.text_fallback_recipients: list[str | None] = []
-        self.image_targets: list[Target] = []
-        self.image_captions: list[str | None] = []
-
-    async def send_text(
-        self,
-        *,
-        target: Target,
-        message: str,
-        fallback_recipient: str | None = None,
-    ) -> None:
-        self.text_targets.append(target)
-        self.text_messages.append(message)
-        self.text_fallback_recipients.append(fallback_recipient)
+    settings = _settings(mode="group", sender_uuid="Bot-Uuid")
+    assert should_handle_chat_mention(message, settings) is True
 
-    async def send_image(
-        self,
-        *,
-        target: Target,
-        image_bytes: bytes,
-        content_type: str,
-        caption: str | None = None,
-    ) -> None:
-        self.image_targets.append(target)
-        self.image_captions.append(caption)
-        assert image_bytes
-        assert content_type == "image/png"
 
+def test_normalize_chat_prompt_removes_alias() -> None:
+    message = IncomingMessage(
+        sender=_USER,
+        text="@bot, summarize this please",
+        timestamp=1,
+        target=_GROUP_TARGET,
+    )
 
-class _FakeWhatsAppClient:
-    def __init__(self) -> None:
-        self.text_messages: list[str] = []
-        self.image_captions: list[str | None] = []
+    prompt = normalize_chat_prompt(message, _GROUP_SETTINGS)
 
-    async def send_text(
-        self,
-        *,
-        target: Target,
-        message: str,
-        fallback_recipient: str | None = None,
-    ) -> None:
-        del target, fallback_recipient
-        self.text_messages.append(message)
+    assert prompt == "summarize this please"
 
-    async def send_image(
-        self,
-        *,
-        target: Target,
-        image_bytes: bytes,
-        content_type: str,
-        caption: str | None = None,
-        fallback_recipient: str | None = None,
-    ) -> None:
-        del target, fallback_recipient
-        assert image_bytes
-        assert content_type == "image/png"
-        self.image_captions.append(caption)
 
+def test_strip_aliases_handles_prefix_overlapping_aliases() -> None:
+    aliases = ("@bot", "@botty", "@signalbot")
 
-class _FakeTelegramClient:
-    def __init__(self) -> None:
-        self.text_messages: list[str] = []
-        self.image_captions: list[str | None] = []
+    assert strip_aliases("@BOTTY hi @signalbot, and @bot?", aliases).split() == [
+        "hi",
+        ",",
+        "and",
+        "?",
+    ]
+    assert text_contains_alias("hello @botty", aliases) is True
+    assert text_contains_alias("mail@bot.com", aliases) is False
+    assert text_contains_alias("hey bot", ("bot",)) is True
+    assert text_contains_alias("hey bot", aliases) is False
 
-    async def send_text(
-        self,
-        *,
-        target: Target,
-        message: str,
-        fallback_recipient: str | None = None,
-    ) -> None:
-        del target, fallback_recipient
-        self.text_messages.append(message)
 
-    async def send_image(
-        self,
-        *,
-        target: Target,
-        image_bytes: bytes,
-        content_type: str,
-        caption: str | None = None,
-        fallback_recipient: str | None = None,
-    ) -> None:
-        del target, fallback_recipient
-        assert image_bytes
-        assert content_type == "image/png"
-        self.image_captions.append(caption)
+_FAKE_IMAGES: list[tuple[bytes, str]] = [
+    (b"image-1", "image/png"),
+    (b"image-2", "image/png"),
+]
 
 
 class _FakeOpenRouterImageClient:
@@ -414,17 +417,25 @@ class _FakeOpenRouterImageClient:
     ) -> list[tuple[bytes, str]]:
         assert prompt
         assert model
-        return [
-            (b"image-1", "image/png"),
-            (b"image-2", "image/png"),
-        ]
+        return _FAKE_IMAGES
+
+
+class _FailingOpenRouterImageClient:
+    async def generate_images(
+        self, *, prompt: str, model: str
+    ) -> list[tuple[bytes, str]]:
+        del prompt, model
+        raise ImageGenerationError("Image generation failed.")
 
 
-class _FakeOpenRouterClient:
+class _FakeOpenRouterClient(OpenRouterClientLike):
     def __init__(self, *, reply: str = "chat-response") -> None:
         self._reply = reply
         self.seen_messages: list[list[dict[str, str]]] = []
 
+    def reset(self) -> None:
+        self.seen_messages.clear()
+
     async def generate_reply(self, messages: list[dict[str, str]]) -> str:
         assert messages
         self.seen_messages.append(messages)
@@ -432,9 +443,14 @@ class _FakeOpenRouterClient:
 
 
 class _FakeChatContextStore:
+    __slots__ = ("appended",)
+
     def __init__(self) -> None:
         self.appended: list[tuple[str, str, str]] = []
 
+    def reset(self) -> None:
+        self.appended.clear()
+
     def get_history(self, _: str) -> tuple[ChatTurn, ...]:
         return (
             ChatTurn(role="user", content="older question"),
@@ -454,6 +470,28 @@ class _FakeChatContextStore:
 
 
 class _FakeSearchService:
+    __slots__ = (
+        "_decision",
+        "_followup_resolution",
+        "_pending_reply_resolution",
+        "_pending_state",
+        "_source_context",
+        "_source_text",
+        "_summary",
+        "decide_prompts",
+        "followup_calls",
+        "image_calls",
+        "pending_jmail",
+        "pending_reply_calls",
+        "pending_video",
+        "search_calls",
+        "search_history_contexts",
+        "search_user_requests",
+        "source_calls",
+        "video_list_calls",
+        "video_selection_calls",
+    )
+
     def __init__(
         self,
         *,
@@ -664,153 +702,340 @@ class _FakeSearchService:
         return self._source_text
 
 
-class _StaticGroupResolver:
+class _StaticGroupResolver(GroupResolverLike):
     def __init__(self, recipients: tuple[str, ...], cache_refreshed: bool) -> None:
         self._resolved = ResolvedGroupRecipients(
             recipients=recipients,
             cache_refreshed=cache_refreshed,
         )
 
-    async def resolve(self, _: str) -> ResolvedGroupRecipients:
+    async def resolve(self, group_id: str) -> ResolvedGroupRecipients:
+        del group_id
         return self._resolved
 
 
+def _signal_payload(
+    message: str,
+    *,
+    group_id: str | None = None,
+    timestamp: int = 1730000000001,
+    mentions: list[dict[str, object]] | None = None,
+) -> dict[str, object]:
+    data_message: dict[str, object] = {"message": message, "timestamp": timestamp}
+    if mentions is not None:
+        data_message["mentions"] = mentions
+    if group_id is not None:
+        data_message["groupInfo"] = {"groupId": group_id}
+    return {
+        "envelope": {
+            "sourceNumber": _USER,
+            "timestamp": timestamp,
+            "dataMessage": data_message,
+        }
+    }
+
+
+def _telegram_payload(
+    text: str,
+    *,
+    chat_id: int = 12345,
+    entities: list[dict[str, object]] | None = None,
+) -> dict[str, object]:
+    message: dict[str, object] = {
+        "message_id": 12,
+        "date": 1730000000,
+        "text": text,
+        "from": {"id": 12345, "is_bot": False},
+        "chat": {"id": chat_id, "type": "private" if chat_id > 0 else "supergroup"},
+    }
+    if entities is not None:
+        message["entities"] = entities
+    return {"update_id": 1, "message": message}
+
+
+# Read-only webhook payloads shared by several tests; handle_webhook never
+# mutates its input.
+_PAYLOAD_DM_SEARCH_COMMAND = _signal_payload("/search latest openrouter news")
+_PAYLOAD_DM_AUTO_SEARCH = _signal_payload("what happened with openrouter this week?")
+_PAYLOAD_DM_VIDEOS_COMMAND = _signal_payload("/videos nick land interview")
+_PAYLOAD_DM_PRONOUN_FOLLOWUP = _signal_payload("what's he up to now")
+_PAYLOAD_DM_AMBIGUOUS_FOLLOWUP = _signal_payload("who is he in islam")
+
+_NEWS_DECISION_OPENROUTER = SearchRouteDecision(
+    should_search=True,
+    mode="news",
+    query="openrouter this week",
+    reason="current_events",
+)
+_AMBIGUOUS_ISLAM_RESOLUTION = FollowupResolutionDecision(
+    resolved_prompt="who is he in islam",
+    needs_clarification=True,
+    clarification_text="Who are you referring to?",
+    reason="low_confidence",
+    used_context=True,
+    confidence=0.4,
+    subject_hint=None,
+)
+
+
+# The fakes, dedupe cache and task list are built once per module and reset in
+# place after each test instead of being reallocated.
+@pytest.fixture(scope="module")
+def _fake_signal_session() -> FakeMessengerClient:
+    return FakeMessengerClient()
+
+
+@pytest.fixture
+def fake_signal(
+    _fake_signal_session: FakeMessengerClient,
+) -> Iterator[FakeMessengerClient]:
+    yield _fake_signal_session
+    _fake_signal_session.reset()
+
+
+@pytest.fixture(scope="module")
+def _fake_context_session() -> _FakeChatContextStore:
+    return _FakeChatContextStore()
+
+
+@pytest.fixture
+def fake_context(
+    _fake_context_session: _FakeChatContextStore,
+) -> Iterator[_FakeChatContextStore]:
+    yield _fake_context_session
+    _fake_context_session.reset()
+
+
+@pytest.fixture(scope="module")
+def _fake_openrouter_session() -> _FakeOpenRouterClient:
+    return _FakeOpenRouterClient()
+
+
+@pytest.fixture
+def fake_openrouter(
+    _fake_openrouter_session: _FakeOpenRouterClient,
+) -> Iterator[_FakeOpenRouterClient]:
+    yield _fake_openrouter_session
+    _fake_openrouter_session.reset()
+
+
+@pytest.fixture(scope="module")
+def _dedupe_session() -> DedupeCache:
+    return DedupeCache(ttl_seconds=60)
+
+
+@pytest.fixture
+def dedupe(_dedupe_session: DedupeCache) -> Iterator[DedupeCache]:
+    yield _dedupe_session
+    _dedupe_session.clear()
+
+
+@pytest.fixture(scope="module")
+def _background_tasks_session() -> BackgroundTasks:
+    return BackgroundTasks()
+
+
+@pytest.fixture
+def background_tasks(
+    _background_tasks_session: BackgroundTasks,
+) -> Iterator[BackgroundTasks]:
+    yield _background_tasks_session
+    _background_tasks_session.tasks.clear()
+
+
+_HandlerFactory = Callable[..., WebhookHandler]
+
+
+@pytest.fixture
+def make_handler(
+    fake_signal: FakeMessengerClient,
+    fake_context: _FakeChatContextStore,
+    fake_openrouter: _FakeOpenRouterClient,
+    dedupe: DedupeCache,
+) -> _HandlerFactory:
+    def _make(*, settings: Settings, **overrides: Any) -> WebhookHandler:
+        # Defaults wire in this test's fakes; overrides replace any of them.
+        kwargs: dict[str, Any] = {
+            "signal_client": fake_signal,
+            "openrouter_client": fake_openrouter,
+            "chat_context": fake_context,
+            "openrouter_image_client": None,
+            "dedupe": dedupe,
+            **overrides,
+        }
+        return WebhookHandler(settings=settings, **kwargs)
+
+    return _make
+
+
+def _log_blob(caplog: pytest.LogCaptureFixture, logger: str = _WEBHOOK_LOGGER) -> str:
+    return "\n".join(
+        record.getMessage() for record in caplog.records if record.name == logger
+    )
+
+
 async def _run_background_tasks(background_tasks: BackgroundTasks) -> None:
+    # Every task the handler queues is an async method, so await directly.
     for task in background_tasks.tasks:
-        result = task.func(*task.args, **task.kwargs)
-        if inspect.isawaitable(result):
-            await result
+        await task.func(*task.args, **task.kwargs)
 
 
-@pytest.mark.anyio
-async def test_handle_webhook_ignores_non_mention_group_message() -> None:
-    payload = {
-        "envelope": {
-            "sourceNumber": "+15550002222",
-            "timestamp": 1730000000001,
-            "dataMessage": {
-                "message": "hello everyone",
-                "timestamp": 1730000000001,
-                "groupInfo": {"groupId": "group-1"},
-            },
-        }
-    }
+async def _prime_video_list(
+    handler: WebhookHandler, background_tasks: BackgroundTasks
+) -> None:
+    await handler.handle_webhook(_PAYLOAD_DM_VIDEOS_COMMAND, background_tasks)
+    await _run_background_tasks(background_tasks)
+    background_tasks.tasks.clear()
+
 
-    handler = WebhookHandler(
-        settings=_settings(mode="group"),
-        signal_client=cast(Any, _FakeSignalClient()),
-        openrouter_client=cast(Any, _FakeOpenRouterClient()),
-        chat_context=cast(Any, _FakeChatContextStore()),
-        openrouter_image_client=None,
-        dedupe=DedupeCache(ttl_seconds=60),
+async def _prime_pending_followup(
+    handler: WebhookHandler, background_tasks: BackgroundTasks
+) -> dict[str, str]:
+    response = await handler.handle_webhook(
+        _PAYLOAD_DM_AMBIGUOUS_FOLLOWUP, background_tasks
     )
+    await _run_background_tasks(background_tasks)
+    background_tasks.tasks.clear()
+    return response
 
-    response = await handler.handle_webhook(payload, BackgroundTasks())
 
-    assert response == {"status": "ignored", "reason": "non_mention"}
+async def _handle_telegram(
+    handler: WebhookHandler,
+    payload: dict[str, object],
+    background_tasks: BackgroundTasks,
+    *,
+    secret: str = _TELEGRAM_SECRET,
+) -> dict[str, str]:
+    return await handler.handle_webhook(
+        payload,
+        background_tasks,
+        transport_hint="telegram",
+        telegram_secret=secret,
+    )
+
+
+class _ReplyCase(NamedTuple):
+    id: str
+    text: str
+    group_id: str | None
+    expected: dict[str, str]
+    replies: tuple[str, ...]
+
+
+# Webhooks answered without search: one Signal message in, fixed reply out.
+_REPLY_CASES = (
+    _ReplyCase(
+        "group_without_mention_is_ignored",
+        "hello everyone",
+        _GROUP,
+        {"status": "ignored", "reason": "non_mention"},
+        (),
+    ),
+    _ReplyCase(
+        "empty_dm_prompt_sends_usage",
+        "@bot",
+        None,
+        {"status": "accepted", "reason": "chat_usage_sent"},
+        ("Send a prompt, for example: summarize today's discussion.",),
+    ),
+    _ReplyCase(
+        "empty_group_mention_sends_usage",
+        "@bot",
+        _GROUP,
+        {"status": "accepted", "reason": "chat_usage_sent"},
+        ("Tag me with a prompt, for example: @bot summarize today's discussion.",),
+    ),
+    _ReplyCase(
+        "imagine_without_image_config_reports_unavailable",
+        "/imagine test prompt",
+        _GROUP,
+        {"status": "accepted", "reason": "image_unavailable"},
+        ("Image mode is not configured on this bot.",),
+    ),
+)
 
 
-@pytest.mark.anyio
-async def test_handle_webhook_alias_mention_triggers_chat_reply() -> None:
-    payload = {
-        "envelope": {
-            "sourceNumber": "+15550002222",
-            "timestamp": 1730000000001,
-            "dataMessage": {
-                "message": "@bot what is the summary?",
-                "timestamp": 1730000000001,
-                "groupInfo": {"groupId": "group-1"},
-            },
-        }
-    }
+@pytest.mark.parametrize("case", _REPLY_CASES, ids=[case.id for case in _REPLY_CASES])
+async def test_handle_webhook_fixed_replies(
+    case: _ReplyCase,
+    fake_signal: FakeMessengerClient,
+    make_handler: _HandlerFactory,
+    background_tasks: BackgroundTasks,
+) -> None:
+    payload = _signal_payload(case.text, group_id=case.group_id)
+    handler = make_handler(settings=_GROUP_SETTINGS)
+
+    response = await handler.handle_webhook(payload, background_tasks)
+    await _run_background_tasks(background_tasks)
+
+    assert response == case.expected
+    assert fake_signal.text_messages == list(case.replies)
+
+
+async def test_handle_webhook_alias_mention_triggers_chat_reply(
+    fake_signal: FakeMessengerClient,
+    fake_context: _FakeChatContextStore,
+    fake_openrouter: _FakeOpenRouterClient,
+    make_handler: _HandlerFactory,
+    background_tasks: BackgroundTasks,
+) -> None:
+    payload = _signal_payload("@bot what is the summary?", group_id=_GROUP)
 
-    fake_signal = _FakeSignalClient()
-    fake_context = _FakeChatContextStore()
-    fake_openrouter = _FakeOpenRouterClient()
-    handler = WebhookHandler(
-        settings=_settings(mode="group", system_prompt="custom system prompt"),
-        signal_client=cast(Any, fake_signal),
-        openrouter_client=cast(Any, fake_openrouter),
-        chat_context=cast(Any, fake_context),
-        openrouter_image_client=None,
-        dedupe=DedupeCache(ttl_seconds=60),
+    handler = make_handler(
+        settings=_settings(mode="group", system_prompt="custom system prompt")
     )
 
-    background_tasks = BackgroundTasks()
     response = await handler.handle_webhook(payload, background_tasks)
     await _run_background_tasks(background_tasks)
 
     assert response == {"status": "accepted", "reason": "chat_queued"}
-    assert fake_signal.text_messages == ["chat-response"]
-    assert fake_signal.text_fallback_recipients == ["+15550002222"]
+    assert fake_signal.sent_text == [
+        SentText(
+            _GROUP_TARGET,
+            "chat-response",
+            _USER,
+        )
+    ]
     assert fake_openrouter.seen_messages
     assert fake_openrouter.seen_messages[0][0]["content"] == "custom system prompt"
     assert fake_context.appended
 
 
-@pytest.mark.anyio
-async def test_handle_webhook_dm_without_mention_triggers_chat_reply() -> None:
-    payload = {
-        "envelope": {
-            "sourceNumber": "+15550002222",
-            "timestamp": 1730000000001,
-            "dataMessage": {
-                "message": "what is the summary?",
-                "timestamp": 1730000000001,
-            },
-        }
-    }
-
-    fake_signal = _FakeSignalClient()
-    fake_context = _FakeChatContextStore()
-    fake_openrouter = _FakeOpenRouterClient()
-    handler = WebhookHandler(
-        settings=_settings(mode="group", system_prompt="custom system prompt"),
-        signal_client=cast(Any, fake_signal),
-        openrouter_client=cast(Any, fake_openrouter),
-        chat_context=cast(Any, fake_context),
-        openrouter_image_client=None,
-        dedupe=DedupeCache(ttl_seconds=60),
+async def test_handle_chat_mention_dm_replies_without_fallback(
+    fake_signal: FakeMessengerClient,
+    fake_context: _FakeChatContextStore,
+    fake_openrouter: _FakeOpenRouterClient,
+    make_handler: _HandlerFactory,
+) -> None:
+    handler = make_handler(
+        settings=_settings(mode="group", system_prompt="custom system prompt")
+    )
+    message = IncomingMessage(
+        sender=_USER,
+        text="what is the summary?",
+        timestamp=1730000000001,
+        target=_DM_TARGET,
     )
 
-    background_tasks = BackgroundTasks()
-    response = await handler.handle_webhook(payload, background_tasks)
-    await _run_background_tasks(background_tasks)
+    await handler.handle_chat_mention(message, "what is the summary?")
 
-    assert response == {"status": "accepted", "reason": "chat_queued"}
-    assert fake_signal.text_messages == ["chat-response"]
-    assert fake_signal.text_fallback_recipients == [None]
+    assert fake_signal.sent_text == [SentText(message.target, "chat-response", None)]
     assert fake_openrouter.seen_messages
     assert fake_openrouter.seen_messages[0][0]["content"] == "custom system prompt"
     assert fake_context.appended
 
 
-@pytest.mark.anyio
-async def test_handle_webhook_search_command_queues_summary() -> None:
-    payload = {
-        "envelope": {
-            "sourceNumber": "+15550002222",
-            "timestamp": 1730000000001,
-            "dataMessage": {
-                "message": "/search latest openrouter news",
-                "timestamp": 1730000000001,
-            },
-        }
-    }
-    fake_signal = _FakeSignalClient()
+async def test_handle_webhook_search_command_queues_summary(
+    fake_signal: FakeMessengerClient,
+    make_handler: _HandlerFactory,
+    background_tasks: BackgroundTasks,
+) -> None:
     fake_search = _FakeSearchService(summary="summary-only")
-    handler = WebhookHandler(
-        settings=_settings(mode="group"),
-        signal_client=cast(Any, fake_signal),
-        openrouter_client=cast(Any, _FakeOpenRouterClient()),
-        chat_context=cast(Any, _FakeChatContextStore()),
-        openrouter_image_client=None,
-        dedupe=DedupeCache(ttl_seconds=60),
-        search_service=cast(Any, fake_search),
-    )
+    handler = make_handler(settings=_GROUP_SETTINGS, search_service=fake_search)
 
-    background_tasks = BackgroundTasks()
-    response = await handler.handle_webhook(payload, background_tasks)
+    response = await handler.handle_webhook(
+        _PAYLOAD_DM_SEARCH_COMMAND, background_tasks
+    )
     await _run_background_tasks(background_tasks)
 
     assert response == {"status": "accepted", "reason": "search_queued"}
@@ -821,33 +1046,27 @@ async def test_handle_webhook_search_command_queues_summary() -> None:
     assert fake_signal.text_messages == ["summary-only"]
 
 
-@pytest.mark.anyio
-async def test_handle_webhook_whatsapp_search_command_queues_summary() -> None:
+async def test_handle_webhook_whatsapp_search_command_queues_summary(
+    make_handler: _HandlerFactory, background_tasks: BackgroundTasks
+) -> None:
     payload = {
         "from": "user@c.us",
         "chatId": "user@c.us",
         "text": "/search latest openrouter news",
         "timestamp": 1730000000001,
     }
-    fake_signal = _FakeSignalClient()
-    fake_whatsapp = _FakeWhatsAppClient()
+    fake_whatsapp = FakeMessengerClient()
     fake_search = _FakeSearchService(summary="summary-only")
-    handler = WebhookHandler(
+    handler = make_handler(
         settings=_settings(
             mode="group",
             whatsapp_enabled=True,
             whatsapp_disable_auth=True,
         ),
-        signal_client=cast(Any, fake_signal),
-        whatsapp_client=cast(Any, fake_whatsapp),
-        openrouter_client=cast(Any, _FakeOpenRouterClient()),
-        chat_context=cast(Any, _FakeChatContextStore()),
-        openrouter_image_client=None,
-        dedupe=DedupeCache(ttl_seconds=60),
-        search_service=cast(Any, fake_search),
+        whatsapp_client=fake_whatsapp,
+        search_service=fake_search,
     )
 
-    background_tasks = BackgroundTasks()
     response = await handler.handle_webhook(payload, background_tasks)
     await _run_background_tasks(background_tasks)
 
@@ -855,44 +1074,19 @@ async def test_handle_webhook_whatsapp_search_command_queues_summary() -> None:
     assert fake_search.search_calls == [("search", "latest openrouter news")]
 
 
-@pytest.mark.anyio
-async def test_handle_webhook_telegram_dm_search_command_queues_summary() -> None:
-    payload = {
-        "update_id": 1,
-        "message": {
-            "message_id": 12,
-            "date": 1730000000,
-            "text": "/search latest openrouter news",
-            "from": {"id": 12345, "is_bot": False},
-            "chat": {"id": 12345, "type": "private"},
-        },
-    }
-    fake_signal = _FakeSignalClient()
-    fake_telegram = _FakeTelegramClient()
+async def test_handle_webhook_telegram_dm_search_command_queues_summary(
+    make_handler: _HandlerFactory, background_tasks: BackgroundTasks
+) -> None:
+    payload = _telegram_payload("/search latest openrouter news")
+    fake_telegram = FakeMessengerClient()
     fake_search = _FakeSearchService(summary="summary-only")
-    handler = WebhookHandler(
-        settings=_settings(
-            mode="group",
-            telegram_enabled=True,
-            telegram_disable_auth=False,
-            telegram_secret="s3cr3t",
-        ),
-        signal_client=cast(Any, fake_signal),
-        telegram_client=cast(Any, fake_telegram),
-        openrouter_client=cast(Any, _FakeOpenRouterClient()),
-        chat_context=cast(Any, _FakeChatContextStore()),
-        openrouter_image_client=None,
-        dedupe=DedupeCache(ttl_seconds=60),
-        search_service=cast(Any, fake_search),
+    handler = make_handler(
+        settings=_TELEGRAM_SETTINGS,
+        telegram_client=fake_telegram,
+        search_service=fake_search,
     )
 
-    background_tasks = BackgroundTasks()
-    response = await handler.handle_webhook(
-        payload,
-        background_tasks,
-        transport_hint="telegram",
-        telegram_secret="s3cr3t",
-    )
+    response = await _handle_telegram(handler, payload, background_tasks)
     await _run_background_tasks(background_tasks)
 
     assert response == {"status": "accepted", "reason": "search_queued"}
@@ -900,227 +1094,107 @@ async def test_handle_webhook_telegram_dm_search_command_queues_summary() -> Non
     assert fake_telegram.text_messages == ["summary-only"]
 
 
-@pytest.mark.anyio
-async def test_handle_webhook_telegram_group_requires_direction() -> None:
-    payload = {
-        "update_id": 1,
-        "message": {
-            "message_id": 12,
-            "date": 1730000000,
-            "text": "hello there",
-            "from": {"id": 12345, "is_bot": False},
-            "chat": {"id": -10099, "type": "supergroup"},
-        },
-    }
-    handler = WebhookHandler(
-        settings=_settings(
-            mode="group",
-            telegram_enabled=True,
-            telegram_disable_auth=False,
-            telegram_secret="s3cr3t",
-        ),
-        signal_client=cast(Any, _FakeSignalClient()),
-        telegram_client=cast(Any, _FakeTelegramClient()),
-        openrouter_client=cast(Any, _FakeOpenRouterClient()),
-        chat_context=cast(Any, _FakeChatContextStore()),
-        openrouter_image_client=None,
-        dedupe=DedupeCache(ttl_seconds=60),
+async def test_handle_webhook_telegram_group_requires_direction(
+    make_handler: _HandlerFactory, background_tasks: BackgroundTasks
+) -> None:
+    payload = _telegram_payload("hello there", chat_id=-10099)
+    handler = make_handler(
+        settings=_TELEGRAM_SETTINGS,
+        telegram_client=FakeMessengerClient(),
     )
 
-    response = await handler.handle_webhook(
-        payload,
-        BackgroundTasks(),
-        transport_hint="telegram",
-        telegram_secret="s3cr3t",
-    )
+    response = await _handle_telegram(handler, payload, background_tasks)
 
     assert response == {"status": "ignored", "reason": "non_mention"}
 
 
-@pytest.mark.anyio
-async def test_handle_webhook_telegram_group_mention_triggers_chat() -> None:
-    payload = {
-        "update_id": 1,
-        "message": {
-            "message_id": 12,
-            "date": 1730000000,
-            "text": "@sigbot summarize this",
-            "entities": [{"type": "mention", "offset": 0, "length": 7}],
-            "from": {"id": 12345, "is_bot": False},
-            "chat": {"id": -10099, "type": "supergroup"},
-        },
-    }
-    fake_telegram = _FakeTelegramClient()
-    handler = WebhookHandler(
-        settings=_settings(
-            mode="group",
-            telegram_enabled=True,
-            telegram_disable_auth=False,
-            telegram_secret="s3cr3t",
-        ),
-        signal_client=cast(Any, _FakeSignalClient()),
-        telegram_client=cast(Any, fake_telegram),
-        openrouter_client=cast(Any, _FakeOpenRouterClient()),
-        chat_context=cast(Any, _FakeChatContextStore()),
-        openrouter_image_client=None,
-        dedupe=DedupeCache(ttl_seconds=60),
+async def test_handle_webhook_telegram_group_mention_triggers_chat(
+    make_handler: _HandlerFactory, background_tasks: BackgroundTasks
+) -> None:
+    payload = _telegram_payload(
+        "@sigbot summarize this",
+        chat_id=-10099,
+        entities=[{"type": "mention", "offset": 0, "length": 7}],
     )
-
-    background_tasks = BackgroundTasks()
-    response = await handler.handle_webhook(
-        payload,
-        background_tasks,
-        transport_hint="telegram",
-        telegram_secret="s3cr3t",
+    fake_telegram = FakeMessengerClient()
+    handler = make_handler(
+        settings=_TELEGRAM_SETTINGS,
+        telegram_client=fake_telegram,
     )
+
+    response = await _handle_telegram(handler, payload, background_tasks)
     await _run_background_tasks(background_tasks)
 
     assert response == {"status": "accepted", "reason": "chat_queued"}
     assert fake_telegram.text_messages == ["chat-response"]
 
 
-@pytest.mark.anyio
-async def test_handle_webhook_telegram_secret_mismatch_is_ignored() -> None:
-    payload = {
-        "update_id": 1,
-        "message": {
-            "message_id": 12,
-            "date": 1730000000,
-            "text": "/search test",
-            "from": {"id": 12345, "is_bot": False},
-            "chat": {"id": 12345, "type": "private"},
-        },
-    }
-    handler = WebhookHandler(
-        settings=_settings(
-            mode="group",
-            telegram_enabled=True,
-            telegram_disable_auth=False,
-            telegram_secret="s3cr3t",
-        ),
-        signal_client=cast(Any, _FakeSignalClient()),
-        telegram_client=cast(Any, _FakeTelegramClient()),
-        openrouter_client=cast(Any, _FakeOpenRouterClient()),
-        chat_context=cast(Any, _FakeChatContextStore()),
-        openrouter_image_client=None,
-        dedupe=DedupeCache(ttl_seconds=60),
+async def test_handle_webhook_telegram_secret_mismatch_is_ignored(
+    make_handler: _HandlerFactory, background_tasks: BackgroundTasks
+) -> None:
+    payload = _telegram_payload("/search test")
+    handler = make_handler(
+        settings=_TELEGRAM_SETTINGS,
+        telegram_client=FakeMessengerClient(),
     )
 
-    response = await handler.handle_webhook(
-        payload,
-        BackgroundTasks(),
-        transport_hint="telegram",
-        telegram_secret="wrong",
+    response = await _handle_telegram(
+        handler, payload, background_tasks, secret="wrong"
     )
 
     assert response == {"status": "ignored", "reason": "invalid_telegram_secret"}
 
 
-@pytest.mark.anyio
-async def test_handle_webhook_explicit_search_command_clears_pending_followup() -> None:
-    payload = {
-        "envelope": {
-            "sourceNumber": "+15550002222",
-            "timestamp": 1730000000001,
-            "dataMessage": {
-                "message": "/search latest openrouter news",
-                "timestamp": 1730000000001,
-            },
-        }
-    }
-    fake_signal = _FakeSignalClient()
+async def test_handle_webhook_explicit_search_command_clears_pending_followup(
+    make_handler: _HandlerFactory, background_tasks: BackgroundTasks
+) -> None:
     fake_search = _FakeSearchService(summary="summary-only")
     fake_search.set_pending_followup_state(
-        conversation_key="dm:+15550002222",
+        conversation_key=_DM_KEY,
         original_prompt="who is he in islam",
         template_prompt="who is {subject} in islam",
         reason="low_confidence",
     )
-    handler = WebhookHandler(
-        settings=_settings(mode="group"),
-        signal_client=cast(Any, fake_signal),
-        openrouter_client=cast(Any, _FakeOpenRouterClient()),
-        chat_context=cast(Any, _FakeChatContextStore()),
-        openrouter_image_client=None,
-        dedupe=DedupeCache(ttl_seconds=60),
-        search_service=cast(Any, fake_search),
-    )
+    handler = make_handler(settings=_GROUP_SETTINGS, search_service=fake_search)
 
-    background_tasks = BackgroundTasks()
-    await handler.handle_webhook(payload, background_tasks)
+    await handler.handle_webhook(_PAYLOAD_DM_SEARCH_COMMAND, background_tasks)
     await _run_background_tasks(background_tasks)
 
-    assert (
-        fake_search.get_pending_followup_state(conversation_key="dm:+15550002222")
-        is None
-    )
+    assert fake_search.get_pending_followup_state(conversation_key=_DM_KEY) is None
 
 
-@pytest.mark.anyio
 async def test_handle_webhook_search_command_logs_route_debug(
     caplog: pytest.LogCaptureFixture,
+    make_handler: _HandlerFactory,
+    background_tasks: BackgroundTasks,
 ) -> None:
-    payload = {
-        "envelope": {
-            "sourceNumber": "+15550002222",
-            "timestamp": 1730000000001,
-            "dataMessage": {
-                "message": "/search latest openrouter news",
-                "timestamp": 1730000000001,
-            },
-        }
-    }
-    fake_signal = _FakeSignalClient()
     fake_search = _FakeSearchService(summary="summary-only")
-    handler = WebhookHandler(
+    handler = make_handler(
         settings=_settings(mode="group", search_debug_logging=True),
-        signal_client=cast(Any, fake_signal),
-        openrouter_client=cast(Any, _FakeOpenRouterClient()),
-        chat_context=cast(Any, _FakeChatContextStore()),
-        openrouter_image_client=None,
-        dedupe=DedupeCache(ttl_seconds=60),
-        search_service=cast(Any, fake_search),
+        search_service=fake_search,
     )
-    caplog.set_level(logging.INFO, logger="signal_bot_orx.webhook")
+    caplog.set_level(logging.INFO, logger=_WEBHOOK_LOGGER)
 
-    background_tasks = BackgroundTasks()
-    await handler.handle_webhook(payload, background_tasks)
+    await handler.handle_webhook(_PAYLOAD_DM_SEARCH_COMMAND, background_tasks)
     await _run_background_tasks(background_tasks)
 
-    assert any(
-        "search_route_debug" in record.getMessage()
-        and "slash_command=/search" in record.getMessage()
-        and "final_path=search_summary" in record.getMessage()
-        for record in caplog.records
-    )
+    assert _ROUTE_SLASH_SEARCH_SUMMARY.search(_log_blob(caplog))
 
 
-@pytest.mark.anyio
-async def test_handle_webhook_search_command_mode_disabled() -> None:
-    payload = {
-        "envelope": {
-            "sourceNumber": "+15550002222",
-            "timestamp": 1730000000001,
-            "dataMessage": {
-                "message": "/search latest openrouter news",
-                "timestamp": 1730000000001,
-            },
-        }
-    }
-    fake_signal = _FakeSignalClient()
+async def test_handle_webhook_search_command_mode_disabled(
+    fake_signal: FakeMessengerClient,
+    make_handler: _HandlerFactory,
+    background_tasks: BackgroundTasks,
+) -> None:
     fake_search = _FakeSearchService(summary="summary-only")
-    handler = WebhookHandler(
+    handler = make_handler(
         settings=_settings(mode="group", search_mode_search_enabled=False),
-        signal_client=cast(Any, fake_signal),
-        openrouter_client=cast(Any, _FakeOpenRouterClient()),
-        chat_context=cast(Any, _FakeChatContextStore()),
-        openrouter_image_client=None,
-        dedupe=DedupeCache(ttl_seconds=60),
-        search_service=cast(Any, fake_search),
+        search_service=fake_search,
     )
 
-    background_tasks = BackgroundTasks()
-    response = await handler.handle_webhook(payload, background_tasks)
+    response = await handler.handle_webhook(
+        _PAYLOAD_DM_SEARCH_COMMAND, background_tasks
+    )
     await _run_background_tasks(background_tasks)
 
     assert response == {"status": "accepted", "reason": "search_mode_disabled"}
@@ -1128,34 +1202,18 @@ async def test_handle_webhook_search_command_mode_disabled() -> None:
     assert fake_signal.text_messages == ["/search is disabled on this bot."]
 
 
-@pytest.mark.anyio
-async def test_handle_webhook_search_command_passes_history_context_when_enabled() -> (
-    None
-):
-    payload = {
-        "envelope": {
-            "sourceNumber": "+15550002222",
-            "timestamp": 1730000000001,
-            "dataMessage": {
-                "message": "/search latest openrouter news",
-                "timestamp": 1730000000001,
-            },
-        }
-    }
-    fake_signal = _FakeSignalClient()
+async def test_handle_webhook_search_command_passes_history_context_when_enabled(
+    make_handler: _HandlerFactory, background_tasks: BackgroundTasks
+) -> None:
     fake_search = _FakeSearchService(summary="summary-only")
-    handler = WebhookHandler(
+    handler = make_handler(
         settings=_settings(mode="group", search_use_history_for_summary=True),
-        signal_client=cast(Any, fake_signal),
-        openrouter_client=cast(Any, _FakeOpenRouterClient()),
-        chat_context=cast(Any, _FakeChatContextStore()),
-        openrouter_image_client=None,
-        dedupe=DedupeCache(ttl_seconds=60),
-        search_service=cast(Any, fake_search),
+        search_service=fake_search,
     )
 
-    background_tasks = BackgroundTasks()
-    response = await handler.handle_webhook(payload, background_tasks)
+    response = await handler.handle_webhook(
+        _PAYLOAD_DM_SEARCH_COMMAND, background_tasks
+    )
     await _run_background_tasks(background_tasks)
 
     assert response == {"status": "accepted", "reason": "search_queued"}
@@ -1165,159 +1223,111 @@ async def test_handle_webhook_search_command_passes_history_context_when_enabled
     assert len(fake_search.search_history_contexts[0] or []) == 4
 
 
-@pytest.mark.anyio
-async def test_handle_webhook_images_command_sends_attachment() -> None:
-    payload = {
-        "envelope": {
-            "sourceNumber": "+15550002222",
-            "timestamp": 1730000000001,
-            "dataMessage": {
-                "message": "/images red fox",
-                "timestamp": 1730000000001,
-            },
-        }
-    }
-    fake_signal = _FakeSignalClient()
-    fake_search = _FakeSearchService()
-    handler = WebhookHandler(
-        settings=_settings(mode="group"),
-        signal_client=cast(Any, fake_signal),
-        openrouter_client=cast(Any, _FakeOpenRouterClient()),
-        chat_context=cast(Any, _FakeChatContextStore()),
-        openrouter_image_client=None,
-        dedupe=DedupeCache(ttl_seconds=60),
-        search_service=cast(Any, fake_search),
-    )
-
-    background_tasks = BackgroundTasks()
-    response = await handler.handle_webhook(payload, background_tasks)
-    await _run_background_tasks(background_tasks)
-
-    assert response == {"status": "accepted", "reason": "search_image_queued"}
-    assert fake_search.image_calls == ["red fox"]
-    assert fake_signal.image_targets
+class _SlashCase(NamedTuple):
+    id: str
+    text: str
+    reason: str
+    # (image_calls, video_list_calls, source_calls) recorded by the fake.
+    calls: tuple[list[str], list[str], list[str]]
+    image_count: int
+    text_messages: list[str]
+
+
+_SLASH_CASES = (
+    _SlashCase(
+        "images",
+        "/images red fox",
+        "search_image_queued",
+        (["red fox"], [], []),
+        1,
+        [],
+    ),
+    _SlashCase(
+        "videos",
+        "/videos nick land interview",
+        "search_videos_queued",
+        ([], ["nick land interview"], []),
+        0,
+        [
+            "Videos:\n1. First video\n2. Second video\n"
+            "Reply with a number to send the thumbnail and URL."
+        ],
+    ),
+    _SlashCase(
+        "source",
+        "/source openrouter claim",
+        "source_queued",
+        ([], [], ["openrouter claim"]),
+        0,
+        ["Sources:\n1. Title - https://example.com"],
+    ),
+)
 
 
-@pytest.mark.anyio
-async def test_handle_webhook_videos_command_sends_numbered_list() -> None:
-    payload = {
-        "envelope": {
-            "sourceNumber": "+15550002222",
-            "timestamp": 1730000000001,
-            "dataMessage": {
-                "message": "/videos nick land interview",
-                "timestamp": 1730000000001,
-            },
-        }
-    }
-    fake_signal = _FakeSignalClient()
-    fake_search = _FakeSearchService()
-    handler = WebhookHandler(
-        settings=_settings(mode="group"),
-        signal_client=cast(Any, fake_signal),
-        openrouter_client=cast(Any, _FakeOpenRouterClient()),
-        chat_context=cast(Any, _FakeChatContextStore()),
-        openrouter_image_client=None,
-        dedupe=DedupeCache(ttl_seconds=60),
-        search_service=cast(Any, fake_search),
+@pytest.mark.parametrize("case", _SLASH_CASES, ids=[case.id for case in _SLASH_CASES])
+async def test_handle_webhook_slash_commands(
+    case: _SlashCase,
+    fake_signal: FakeMessengerClient,
+    make_handler: _HandlerFactory,
+    background_tasks: BackgroundTasks,
+) -> None:
+    fake_search = _FakeSearchService(
+        source_text="Sources:\n1. Title - https://example.com"
     )
+    handler = make_handler(settings=_GROUP_SETTINGS, search_service=fake_search)
 
-    background_tasks = BackgroundTasks()
-    response = await handler.handle_webhook(payload, background_tasks)
+    response = await handler.handle_webhook(
+        _signal_payload(case.text), background_tasks
+    )
     await _run_background_tasks(background_tasks)
 
-    assert response == {"status": "accepted", "reason": "search_videos_queued"}
-    assert fake_search.video_list_calls == ["nick land interview"]
-    assert fake_signal.text_messages
-    assert fake_signal.text_messages[0].startswith("Videos:")
-
-
-@pytest.mark.anyio
-async def test_handle_webhook_numeric_video_selection_sends_image_and_url() -> None:
-    first_payload = {
-        "envelope": {
-            "sourceNumber": "+15550002222",
-            "timestamp": 1730000000001,
-            "dataMessage": {
-                "message": "/videos nick land interview",
-                "timestamp": 1730000000001,
-            },
-        }
-    }
-    second_payload = {
-        "envelope": {
-            "sourceNumber": "+15550002222",
-            "timestamp": 1730000000002,
-            "dataMessage": {
-                "message": "1",
-                "timestamp": 1730000000002,
-            },
-        }
-    }
-    fake_signal = _FakeSignalClient()
+    assert response == {"status": "accepted", "reason": case.reason}
+    assert (
+        fake_search.image_calls,
+        fake_search.video_list_calls,
+        fake_search.source_calls,
+    ) == case.calls
+    assert len(fake_signal.sent_images) == case.image_count
+    assert fake_signal.text_messages == case.text_messages
+
+
+async def test_handle_webhook_numeric_video_selection_sends_image_and_url(
+    fake_signal: FakeMessengerClient,
+    make_handler: _HandlerFactory,
+    background_tasks: BackgroundTasks,
+) -> None:
+    second_payload = _signal_payload("1", timestamp=1730000000002)
     fake_search = _FakeSearchService()
-    handler = WebhookHandler(
-        settings=_settings(mode="group"),
-        signal_client=cast(Any, fake_signal),
-        openrouter_client=cast(Any, _FakeOpenRouterClient()),
-        chat_context=cast(Any, _FakeChatContextStore()),
-        openrouter_image_client=None,
-        dedupe=DedupeCache(ttl_seconds=60),
-        search_service=cast(Any, fake_search),
-    )
+    handler = make_handler(settings=_GROUP_SETTINGS, search_service=fake_search)
 
-    first_tasks = BackgroundTasks()
-    await handler.handle_webhook(first_payload, first_tasks)
-    await _run_background_tasks(first_tasks)
+    await _prime_video_list(handler, background_tasks)
 
-    second_tasks = BackgroundTasks()
-    response = await handler.handle_webhook(second_payload, second_tasks)
-    await _run_background_tasks(second_tasks)
+    response = await handler.handle_webhook(second_payload, background_tasks)
+    await _run_background_tasks(background_tasks)
 
     assert response == {
         "status": "accepted",
         "reason": "search_video_selection_queued",
     }
     assert fake_search.video_selection_calls == [1]
-    assert len(fake_signal.image_targets) == 1
-    assert fake_signal.image_captions[-1] is not None
-    assert "https://youtube.com/watch?v=abc123" in (
-        fake_signal.image_captions[-1] or ""
-    )
+    assert len(fake_signal.sent_images) == 1
+    caption = fake_signal.sent_images[-1].caption
+    assert caption is not None
+    assert "https://youtube.com/watch?v=abc123" in caption
     assert not any(
         "https://youtube.com/watch?v=abc123" in msg for msg in fake_signal.text_messages
     )
 
 
-@pytest.mark.anyio
-async def test_handle_webhook_numeric_message_without_pending_video_is_not_hijacked() -> (
-    None
-):
-    payload = {
-        "envelope": {
-            "sourceNumber": "+15550002222",
-            "timestamp": 1730000000001,
-            "dataMessage": {
-                "message": "1",
-                "timestamp": 1730000000001,
-            },
-        }
-    }
-    fake_signal = _FakeSignalClient()
-    fake_context = _FakeChatContextStore()
-    fake_openrouter = _FakeOpenRouterClient(reply="chat-response")
+async def test_handle_webhook_numeric_message_without_pending_video_is_not_hijacked(
+    fake_signal: FakeMessengerClient,
+    make_handler: _HandlerFactory,
+    background_tasks: BackgroundTasks,
+) -> None:
+    payload = _signal_payload("1")
     fake_search = _FakeSearchService()
-    handler = WebhookHandler(
-        settings=_settings(mode="group"),
-        signal_client=cast(Any, fake_signal),
-        openrouter_client=cast(Any, fake_openrouter),
-        chat_context=cast(Any, fake_context),
-        openrouter_image_client=None,
-        dedupe=DedupeCache(ttl_seconds=60),
-        search_service=cast(Any, fake_search),
-    )
+    handler = make_handler(settings=_GROUP_SETTINGS, search_service=fake_search)
 
-    background_tasks = BackgroundTasks()
     response = await handler.handle_webhook(payload, background_tasks)
     await _run_background_tasks(background_tasks)
 
@@ -1326,76 +1336,22 @@ async def test_handle_webhook_numeric_message_without_pending_video_is_not_hijac
     assert fake_signal.text_messages == ["chat-response"]
 
 
-@pytest.mark.anyio
-async def test_handle_webhook_source_command_returns_sources() -> None:
-    payload = {
-        "envelope": {
-            "sourceNumber": "+15550002222",
-            "timestamp": 1730000000001,
-            "dataMessage": {
-                "message": "/source openrouter claim",
-                "timestamp": 1730000000001,
-            },
-        }
-    }
-    fake_signal = _FakeSignalClient()
-    fake_search = _FakeSearchService(
-        source_text="Sources:\n1. Title - https://example.com"
-    )
-    handler = WebhookHandler(
-        settings=_settings(mode="group"),
-        signal_client=cast(Any, fake_signal),
-        openrouter_client=cast(Any, _FakeOpenRouterClient()),
-        chat_context=cast(Any, _FakeChatContextStore()),
-        openrouter_image_client=None,
-        dedupe=DedupeCache(ttl_seconds=60),
-        search_service=cast(Any, fake_search),
-    )
-
-    background_tasks = BackgroundTasks()
-    response = await handler.handle_webhook(payload, background_tasks)
-    await _run_background_tasks(background_tasks)
-
-    assert response == {"status": "accepted", "reason": "source_queued"}
-    assert fake_search.source_calls == ["openrouter claim"]
-    assert fake_signal.text_messages == ["Sources:\n1. Title - https://example.com"]
-
-
-@pytest.mark.anyio
-async def test_handle_webhook_auto_search_from_dm() -> None:
-    payload = {
-        "envelope": {
-            "sourceNumber": "+15550002222",
-            "timestamp": 1730000000001,
-            "dataMessage": {
-                "message": "what happened with openrouter this week?",
-                "timestamp": 1730000000001,
-            },
-        }
-    }
-    fake_signal = _FakeSignalClient()
-    fake_context = _FakeChatContextStore()
+async def test_handle_webhook_auto_search_from_dm(
+    fake_signal: FakeMessengerClient,
+    fake_context: _FakeChatContextStore,
+    make_handler: _HandlerFactory,
+    background_tasks: BackgroundTasks,
+) -> None:
     fake_search = _FakeSearchService(
-        decision=SearchRouteDecision(
-            should_search=True,
-            mode="news",
-            query="openrouter this week",
-            reason="current_events",
-        ),
+        decision=_NEWS_DECISION_OPENROUTER,
         summary="news summary",
     )
-    handler = WebhookHandler(
+    handler = make_handler(
         settings=_settings(mode="group", search_context_mode="context"),
-        signal_client=cast(Any, fake_signal),
-        openrouter_client=cast(Any, _FakeOpenRouterClient()),
-        chat_context=cast(Any, fake_context),
-        openrouter_image_client=None,
-        dedupe=DedupeCache(ttl_seconds=60),
-        search_service=cast(Any, fake_search),
+        search_service=fake_search,
     )
 
-    background_tasks = BackgroundTasks()
-    response = await handler.handle_webhook(payload, background_tasks)
+    response = await handler.handle_webhook(_PAYLOAD_DM_AUTO_SEARCH, background_tasks)
     await _run_background_tasks(background_tasks)
 
     assert response == {"status": "accepted", "reason": "search_queued"}
@@ -1410,21 +1366,11 @@ async def test_handle_webhook_auto_search_from_dm() -> None:
     assert fake_context.appended[0][1] == "what happened with openrouter this week?"
 
 
-@pytest.mark.anyio
-async def test_handle_webhook_auto_search_resolves_followup_prompt_before_routing() -> (
-    None
-):
-    payload = {
-        "envelope": {
-            "sourceNumber": "+15550002222",
-            "timestamp": 1730000000001,
-            "dataMessage": {
-                "message": "what's he up to now",
-                "timestamp": 1730000000001,
-            },
-        }
-    }
-    fake_signal = _FakeSignalClient()
+async def test_handle_webhook_auto_search_resolves_followup_prompt_before_routing(
+    fake_signal: FakeMessengerClient,
+    make_handler: _HandlerFactory,
+    background_tasks: BackgroundTasks,
+) -> None:
     fake_search = _FakeSearchService(
         decision=SearchRouteDecision(
             should_search=True,
@@ -1446,18 +1392,14 @@ async def test_handle_webhook_auto_search_resolves_followup_prompt_before_routin
         ],
         summary="summary",
     )
-    handler = WebhookHandler(
+    handler = make_handler(
         settings=_settings(mode="group", search_context_mode="context"),
-        signal_client=cast(Any, fake_signal),
-        openrouter_client=cast(Any, _FakeOpenRouterClient()),
-        chat_context=cast(Any, _FakeChatContextStore()),
-        openrouter_image_client=None,
-        dedupe=DedupeCache(ttl_seconds=60),
-        search_service=cast(Any, fake_search),
+        search_service=fake_search,
     )
 
-    background_tasks = BackgroundTasks()
-    response = await handler.handle_webhook(payload, background_tasks)
+    response = await handler.handle_webhook(
+        _PAYLOAD_DM_PRONOUN_FOLLOWUP, background_tasks
+    )
     await _run_background_tasks(background_tasks)
 
     assert response == {"status": "accepted", "reason": "search_queued"}
@@ -1467,19 +1409,11 @@ async def test_handle_webhook_auto_search_resolves_followup_prompt_before_routin
     assert fake_signal.text_messages == ["summary"]
 
 
-@pytest.mark.anyio
-async def test_handle_webhook_auto_search_clarifies_unresolved_followup() -> None:
-    payload = {
-        "envelope": {
-            "sourceNumber": "+15550002222",
-            "timestamp": 1730000000001,
-            "dataMessage": {
-                "message": "what's he up to now",
-                "timestamp": 1730000000001,
-            },
-        }
-    }
-    fake_signal = _FakeSignalClient()
+async def test_handle_webhook_auto_search_clarifies_unresolved_followup(
+    fake_signal: FakeMessengerClient,
+    make_handler: _HandlerFactory,
+    background_tasks: BackgroundTasks,
+) -> None:
     fake_search = _FakeSearchService(
         decision=SearchRouteDecision(
             should_search=True,
@@ -1497,18 +1431,14 @@ async def test_handle_webhook_auto_search_clarifies_unresolved_followup() -> Non
             subject_hint=None,
         ),
     )
-    handler = WebhookHandler(
+    handler = make_handler(
         settings=_settings(mode="group", search_context_mode="context"),
-        signal_client=cast(Any, fake_signal),
-        openrouter_client=cast(Any, _FakeOpenRouterClient()),
-        chat_context=cast(Any, _FakeChatContextStore()),
-        openrouter_image_client=None,
-        dedupe=DedupeCache(ttl_seconds=60),
-        search_service=cast(Any, fake_search),
+        search_service=fake_search,
     )
 
-    background_tasks = BackgroundTasks()
-    response = await handler.handle_webhook(payload, background_tasks)
+    response = await handler.handle_webhook(
+        _PAYLOAD_DM_PRONOUN_FOLLOWUP, background_tasks
+    )
     await _run_background_tasks(background_tasks)
 
     assert response == {
@@ -1520,29 +1450,12 @@ async def test_handle_webhook_auto_search_clarifies_unresolved_followup() -> Non
     assert fake_signal.text_messages == ["Who are you referring to?"]
 
 
-@pytest.mark.anyio
-async def test_handle_webhook_pending_followup_reply_autofills_and_routes() -> None:
-    first_payload = {
-        "envelope": {
-            "sourceNumber": "+15550002222",
-            "timestamp": 1730000000001,
-            "dataMessage": {
-                "message": "who is he in islam",
-                "timestamp": 1730000000001,
-            },
-        }
-    }
-    second_payload = {
-        "envelope": {
-            "sourceNumber": "+15550002222",
-            "timestamp": 1730000000002,
-            "dataMessage": {
-                "message": "god",
-                "timestamp": 1730000000002,
-            },
-        }
-    }
-    fake_signal = _FakeSignalClient()
+async def test_handle_webhook_pending_followup_reply_autofills_and_routes(
+    fake_signal: FakeMessengerClient,
+    make_handler: _HandlerFactory,
+    background_tasks: BackgroundTasks,
+) -> None:
+    second_payload = _signal_payload("god", timestamp=1730000000002)
     fake_search = _FakeSearchService(
         decision=SearchRouteDecision(
             should_search=True,
@@ -1550,15 +1463,7 @@ async def test_handle_webhook_pending_followup_reply_autofills_and_routes() -> N
             query="god islam",
             reason="person_lookup",
         ),
-        followup_resolution=FollowupResolutionDecision(
-            resolved_prompt="who is he in islam",
-            needs_clarification=True,
-            clarification_text="Who are you referring to?",
-            reason="low_confidence",
-            used_context=True,
-            confidence=0.4,
-            subject_hint=None,
-        ),
+        followup_resolution=_AMBIGUOUS_ISLAM_RESOLUTION,
         pending_reply_resolution=FollowupResolutionDecision(
             resolved_prompt="who is god in islam",
             needs_clarification=False,
@@ -1570,27 +1475,19 @@ async def test_handle_webhook_pending_followup_reply_autofills_and_routes() -> N
         ),
         summary="answer",
     )
-    handler = WebhookHandler(
+    handler = make_handler(
         settings=_settings(mode="group", search_context_mode="context"),
-        signal_client=cast(Any, fake_signal),
-        openrouter_client=cast(Any, _FakeOpenRouterClient()),
-        chat_context=cast(Any, _FakeChatContextStore()),
-        openrouter_image_client=None,
-        dedupe=DedupeCache(ttl_seconds=60),
-        search_service=cast(Any, fake_search),
+        search_service=fake_search,
     )
 
-    first_tasks = BackgroundTasks()
-    first_response = await handler.handle_webhook(first_payload, first_tasks)
-    await _run_background_tasks(first_tasks)
+    first_response = await _prime_pending_followup(handler, background_tasks)
     assert first_response == {
         "status": "accepted",
         "reason": "search_followup_clarification",
     }
 
-    second_tasks = BackgroundTasks()
-    second_response = await handler.handle_webhook(second_payload, second_tasks)
-    await _run_background_tasks(second_tasks)
+    second_response = await handler.handle_webhook(second_payload, background_tasks)
+    await _run_background_tasks(background_tasks)
 
     assert second_response == {"status": "accepted", "reason": "search_queued"}
     assert fake_search.pending_reply_calls
@@ -1599,41 +1496,14 @@ async def test_handle_webhook_pending_followup_reply_autofills_and_routes() -> N
     assert fake_signal.text_messages == ["Who are you referring to?", "answer"]
 
 
-@pytest.mark.anyio
-async def test_handle_webhook_pending_followup_second_failure_requests_rephrase() -> (
-    None
-):
-    first_payload = {
-        "envelope": {
-            "sourceNumber": "+15550002222",
-            "timestamp": 1730000000001,
-            "dataMessage": {
-                "message": "who is he in islam",
-                "timestamp": 1730000000001,
-            },
-        }
-    }
-    second_payload = {
-        "envelope": {
-            "sourceNumber": "+15550002222",
-            "timestamp": 1730000000002,
-            "dataMessage": {
-                "message": "not sure",
-                "timestamp": 1730000000002,
-            },
-        }
-    }
-    fake_signal = _FakeSignalClient()
+async def test_handle_webhook_pending_followup_second_failure_requests_rephrase(
+    fake_signal: FakeMessengerClient,
+    make_handler: _HandlerFactory,
+    background_tasks: BackgroundTasks,
+) -> None:
+    second_payload = _signal_payload("not sure", timestamp=1730000000002)
     fake_search = _FakeSearchService(
-        followup_resolution=FollowupResolutionDecision(
-            resolved_prompt="who is he in islam",
-            needs_clarification=True,
-            clarification_text="Who are you referring to?",
-            reason="low_confidence",
-            used_context=True,
-            confidence=0.4,
-            subject_hint=None,
-        ),
+        followup_resolution=_AMBIGUOUS_ISLAM_RESOLUTION,
         pending_reply_resolution=FollowupResolutionDecision(
             resolved_prompt="who is he in islam",
             needs_clarification=True,
@@ -1644,23 +1514,15 @@ async def test_handle_webhook_pending_followup_second_failure_requests_rephrase(
             subject_hint=None,
         ),
     )
-    handler = WebhookHandler(
+    handler = make_handler(
         settings=_settings(mode="group", search_context_mode="context"),
-        signal_client=cast(Any, fake_signal),
-        openrouter_client=cast(Any, _FakeOpenRouterClient()),
-        chat_context=cast(Any, _FakeChatContextStore()),
-        openrouter_image_client=None,
-        dedupe=DedupeCache(ttl_seconds=60),
-        search_service=cast(Any, fake_search),
+        search_service=fake_search,
     )
 
-    first_tasks = BackgroundTasks()
-    await handler.handle_webhook(first_payload, first_tasks)
-    await _run_background_tasks(first_tasks)
+    await _prime_pending_followup(handler, background_tasks)
 
-    second_tasks = BackgroundTasks()
-    second_response = await handler.handle_webhook(second_payload, second_tasks)
-    await _run_background_tasks(second_tasks)
+    second_response = await handler.handle_webhook(second_payload, background_tasks)
+    await _run_background_tasks(background_tasks)
 
     assert second_response == {
         "status": "accepted",
@@ -1670,96 +1532,48 @@ async def test_handle_webhook_pending_followup_second_failure_requests_rephrase(
     assert "Please restate your full question" in fake_signal.text_messages[-1]
 
 
-@pytest.mark.anyio
 async def test_handle_webhook_auto_search_logs_route_debug(
     caplog: pytest.LogCaptureFixture,
+    make_handler: _HandlerFactory,
+    background_tasks: BackgroundTasks,
 ) -> None:
-    payload = {
-        "envelope": {
-            "sourceNumber": "+15550002222",
-            "timestamp": 1730000000001,
-            "dataMessage": {
-                "message": "what happened with openrouter this week?",
-                "timestamp": 1730000000001,
-            },
-        }
-    }
-    fake_signal = _FakeSignalClient()
     fake_search = _FakeSearchService(
-        decision=SearchRouteDecision(
-            should_search=True,
-            mode="news",
-            query="openrouter this week",
-            reason="current_events",
-        ),
+        decision=_NEWS_DECISION_OPENROUTER,
         summary="news summary",
     )
-    handler = WebhookHandler(
+    handler = make_handler(
         settings=_settings(
             mode="group",
             search_context_mode="context",
             search_debug_logging=True,
         ),
-        signal_client=cast(Any, fake_signal),
-        openrouter_client=cast(Any, _FakeOpenRouterClient()),
-        chat_context=cast(Any, _FakeChatContextStore()),
-        openrouter_image_client=None,
-        dedupe=DedupeCache(ttl_seconds=60),
-        search_service=cast(Any, fake_search),
+        search_service=fake_search,
     )
-    caplog.set_level(logging.INFO, logger="signal_bot_orx.webhook")
+    caplog.set_level(logging.INFO, logger=_WEBHOOK_LOGGER)
 
-    background_tasks = BackgroundTasks()
-    await handler.handle_webhook(payload, background_tasks)
+    await handler.handle_webhook(_PAYLOAD_DM_AUTO_SEARCH, background_tasks)
     await _run_background_tasks(background_tasks)
 
-    assert any(
-        "search_route_debug" in record.getMessage()
-        and "auto_should_search=True" in record.getMessage()
-        and "auto_mode=news" in record.getMessage()
-        and "final_path=search_summary" in record.getMessage()
-        for record in caplog.records
-    )
+    assert _ROUTE_AUTO_NEWS_SUMMARY.search(_log_blob(caplog))
 
 
-@pytest.mark.anyio
-async def test_handle_webhook_auto_search_passes_history_context_when_enabled() -> None:
-    payload = {
-        "envelope": {
-            "sourceNumber": "+15550002222",
-            "timestamp": 1730000000001,
-            "dataMessage": {
-                "message": "what happened with openrouter this week?",
-                "timestamp": 1730000000001,
-            },
-        }
-    }
-    fake_signal = _FakeSignalClient()
+async def test_handle_webhook_auto_search_passes_history_context_when_enabled(
+    make_handler: _HandlerFactory, background_tasks: BackgroundTasks
+) -> None:
     fake_search = _FakeSearchService(
-        decision=SearchRouteDecision(
-            should_search=True,
-            mode="news",
-            query="openrouter this week",
-            reason="current_events",
-        ),
+        decision=_NEWS_DECISION_OPENROUTER,
         summary="news summary",
     )
-    handler = WebhookHandler(
+    handler = make_handler(
         settings=_settings(
             mode="group",
             search_context_mode="context",
             search_use_history_for_summary=True,
         ),
-        signal_client=cast(Any, fake_signal),
-        openrouter_client=cast(Any, _FakeOpenRouterClient()),
-        chat_context=cast(Any, _FakeChatContextStore()),
-        openrouter_image_client=None,
-        dedupe=DedupeCache(ttl_seconds=60),
-        search_service=cast(Any, fake_search),
+        search_service=fake_search,
     )
 
-    background_tasks = BackgroundTasks()
-    response = await handler.handle_webhook(payload, background_tasks)
+    response = await handler.handle_webhook(_PAYLOAD_DM_AUTO_SEARCH, background_tasks)
     await _run_background_tasks(background_tasks)
 
     assert response == {"status": "accepted", "reason": "search_queued"}
@@ -1768,83 +1582,28 @@ async def test_handle_webhook_auto_search_passes_history_context_when_enabled()
     assert len(fake_search.search_history_contexts[0] or []) == 4
 
 
-@pytest.mark.anyio
-async def test_handle_webhook_no_context_mode_skips_auto_search() -> None:
-    payload = {
-        "envelope": {
-            "sourceNumber": "+15550002222",
-            "timestamp": 1730000000001,
-            "dataMessage": {
-                "message": "what happened with openrouter this week?",
-                "timestamp": 1730000000001,
-            },
-        }
-    }
-    fake_signal = _FakeSignalClient()
-    fake_search = _FakeSearchService(
-        decision=SearchRouteDecision(
-            should_search=True,
-            mode="news",
-            query="openrouter this week",
-            reason="current_events",
-        ),
-    )
-    handler = WebhookHandler(
-        settings=_settings(mode="group", search_context_mode="no_context"),
-        signal_client=cast(Any, fake_signal),
-        openrouter_client=cast(Any, _FakeOpenRouterClient(reply="chat-response")),
-        chat_context=cast(Any, _FakeChatContextStore()),
-        openrouter_image_client=None,
-        dedupe=DedupeCache(ttl_seconds=60),
-        search_service=cast(Any, fake_search),
-    )
-
-    background_tasks = BackgroundTasks()
-    response = await handler.handle_webhook(payload, background_tasks)
-    await _run_background_tasks(background_tasks)
-
-    assert response == {"status": "accepted", "reason": "chat_queued"}
-    assert fake_search.search_calls == []
-    assert fake_signal.text_messages == ["chat-response"]
-
-
-@pytest.mark.anyio
-async def test_handle_webhook_context_mode_skips_disabled_auto_search_mode() -> None:
-    payload = {
-        "envelope": {
-            "sourceNumber": "+15550002222",
-            "timestamp": 1730000000001,
-            "dataMessage": {
-                "message": "what happened with openrouter this week?",
-                "timestamp": 1730000000001,
-            },
-        }
-    }
-    fake_signal = _FakeSignalClient()
-    fake_search = _FakeSearchService(
-        decision=SearchRouteDecision(
-            should_search=True,
-            mode="news",
-            query="openrouter this week",
-            reason="current_events",
-        ),
-    )
-    handler = WebhookHandler(
-        settings=_settings(
+@pytest.mark.parametrize(
+    "settings",
+    [
+        _settings(mode="group", search_context_mode="no_context"),
+        _settings(
             mode="group",
             search_context_mode="context",
             search_mode_news_enabled=False,
         ),
-        signal_client=cast(Any, fake_signal),
-        openrouter_client=cast(Any, _FakeOpenRouterClient(reply="chat-response")),
-        chat_context=cast(Any, _FakeChatContextStore()),
-        openrouter_image_client=None,
-        dedupe=DedupeCache(ttl_seconds=60),
-        search_service=cast(Any, fake_search),
-    )
+    ],
+    ids=["no_context_mode", "news_mode_disabled"],
+)
+async def test_handle_webhook_skips_auto_search(
+    settings: Settings,
+    fake_signal: FakeMessengerClient,
+    make_handler: _HandlerFactory,
+    background_tasks: BackgroundTasks,
+) -> None:
+    fake_search = _FakeSearchService(decision=_NEWS_DECISION_OPENROUTER)
+    handler = make_handler(settings=settings, search_service=fake_search)
 
-    background_tasks = BackgroundTasks()
-    response = await handler.handle_webhook(payload, background_tasks)
+    response = await handler.handle_webhook(_PAYLOAD_DM_AUTO_SEARCH, background_tasks)
     await _run_background_tasks(background_tasks)
 
     assert response == {"status": "accepted", "reason": "chat_queued"}
@@ -1852,71 +1611,19 @@ async def test_handle_webhook_context_mode_skips_disabled_auto_search_mode() ->
     assert fake_signal.text_messages == ["chat-response"]
 
 
-@pytest.mark.anyio
-async def test_handle_webhook_empty_dm_prompt_sends_usage() -> None:
-    payload = {
-        "envelope": {
-            "sourceNumber": "+15550002222",
-            "timestamp": 1730000000001,
-            "dataMessage": {
-                "message": "@bot",
-                "timestamp": 1730000000001,
-            },
-        }
-    }
-
-    fake_signal = _FakeSignalClient()
-    handler = WebhookHandler(
-        settings=_settings(mode="group"),
-        signal_client=cast(Any, fake_signal),
-        openrouter_client=cast(Any, _FakeOpenRouterClient()),
-        chat_context=cast(Any, _FakeChatContextStore()),
-        openrouter_image_client=None,
-        dedupe=DedupeCache(ttl_seconds=60),
+async def test_handle_webhook_metadata_mention_triggers_chat_reply(
+    fake_signal: FakeMessengerClient,
+    make_handler: _HandlerFactory,
+    background_tasks: BackgroundTasks,
+) -> None:
+    payload = _signal_payload(
+        "@someone can you help?",
+        group_id=_GROUP,
+        mentions=[{"start": 0, "length": 8, "recipientNumber": "+15550001111"}],
     )
 
-    background_tasks = BackgroundTasks()
-    response = await handler.handle_webhook(payload, background_tasks)
-    await _run_background_tasks(background_tasks)
-
-    assert response == {"status": "accepted", "reason": "chat_usage_sent"}
-    assert fake_signal.text_messages == [
-        "Send a prompt, for example: summarize today's discussion."
-    ]
-
+    handler = make_handler(settings=_GROUP_SETTINGS)
 
-@pytest.mark.anyio
-async def test_handle_webhook_metadata_mention_triggers_chat_reply() -> None:
-    payload = {
-        "envelope": {
-            "sourceNumber": "+15550002222",
-            "timestamp": 1730000000001,
-            "dataMessage": {
-                "message": "@someone can you help?",
-                "mentions": [
-                    {
-                        "start": 0,
-                        "length": 8,
-                        "recipientNumber": "+15550001111",
-                    }
-                ],
-                "timestamp": 1730000000001,
-                "groupInfo": {"groupId": "group-1"},
-            },
-        }
-    }
-
-    fake_signal = _FakeSignalClient()
-    handler = WebhookHandler(
-        settings=_settings(mode="group"),
-        signal_client=cast(Any, fake_signal),
-        openrouter_client=cast(Any, _FakeOpenRouterClient()),
-        chat_context=cast(Any, _FakeChatContextStore()),
-        openrouter_image_client=None,
-        dedupe=DedupeCache(ttl_seconds=60),
-    )
-
-    background_tasks = BackgroundTasks()
     response = await handler.handle_webhook(payload, background_tasks)
     await _run_background_tasks(background_tasks)
 
@@ -1924,15 +1631,16 @@ async def test_handle_webhook_metadata_mention_triggers_chat_reply() -> None:
     assert fake_signal.text_messages == ["chat-response"]
 
 
-@pytest.mark.anyio
-async def test_handle_chat_mention_group_400_uses_dm_fallback() -> None:
+async def test_handle_chat_mention_group_400_uses_dm_fallback(
+    make_handler: _HandlerFactory,
+) -> None:
     captured: list[dict[str, object]] = []
 
     def handler(request: httpx.Request) -> httpx.Response:
-        payload = json.loads(request.content.decode("utf-8"))
+        payload = orjson.loads(request.content)
         captured.append(payload)
         recipient = payload["recipients"][0]
-        if recipient == "+15550002222":
+        if recipient == _USER:
             return httpx.Response(201, json={"timestamp": 3})
         return httpx.Response(400, json={"error": "Failed to send message"})
 
@@ -1942,60 +1650,36 @@ async def test_handle_chat_mention_group_400_uses_dm_fallback() -> None:
             base_url="http://signal.local",
             sender_number="+15550001111",
             http_client=http_client,
-            group_resolver=cast(
-                GroupResolverLike,
-                _StaticGroupResolver(
-                    recipients=("group.invalid", "raw"),
-                    cache_refreshed=True,
-                ),
+            group_resolver=_StaticGroupResolver(
+                recipients=("group.invalid", "raw"),
+                cache_refreshed=True,
             ),
         )
-        handler_obj = WebhookHandler(
-            settings=_settings(mode="group"),
-            signal_client=signal_client,
-            openrouter_client=cast(Any, _FakeOpenRouterClient()),
-            chat_context=cast(Any, _FakeChatContextStore()),
-            openrouter_image_client=None,
-            dedupe=DedupeCache(ttl_seconds=60),
-        )
-        message = IncomingMessage(
-            sender="+15550002222",
-            text="@bot summarize",
-            timestamp=1,
-            target=Target(recipient="+15550002222", group_id="group-1"),
+        handler_obj = make_handler(
+            settings=_GROUP_SETTINGS, signal_client=signal_client
         )
-        await handler_obj.handle_chat_mention(message, "summarize")
+        await handler_obj.handle_chat_mention(_MSG_GROUP_SUMMARIZE, "summarize")
 
     assert [payload["recipients"] for payload in captured] == [
         ["group.invalid"],
         ["raw"],
-        ["+15550002222"],
+        [_USER],
     ]
 
 
-@pytest.mark.anyio
-async def test_handle_chat_mention_enforces_plain_text_reply() -> None:
+async def test_handle_chat_mention_enforces_plain_text_reply(
+    fake_signal: FakeMessengerClient,
+    fake_context: _FakeChatContextStore,
+    make_handler: _HandlerFactory,
+) -> None:
     markdown_reply = (
         "# Summary\n- **hello** from `sigbot`\n> [ref](https://example.com)"
     )
-    fake_signal = _FakeSignalClient()
-    fake_context = _FakeChatContextStore()
-    handler = WebhookHandler(
-        settings=_settings(mode="group"),
-        signal_client=cast(Any, fake_signal),
-        openrouter_client=cast(Any, _FakeOpenRouterClient(reply=markdown_reply)),
-        chat_context=cast(Any, fake_context),
-        openrouter_image_client=None,
-        dedupe=DedupeCache(ttl_seconds=60),
-    )
-    message = IncomingMessage(
-        sender="+15550002222",
-        text="@bot summarize",
-        timestamp=1,
-        target=Target(recipient="+15550002222", group_id="group-1"),
+    handler = make_handler(
+        settings=_GROUP_SETTINGS,
+        openrouter_client=_FakeOpenRouterClient(reply=markdown_reply),
     )
-
-    await handler.handle_chat_mention(message, "summarize")
+    await handler.handle_chat_mention(_MSG_GROUP_SUMMARIZE, "summarize")
 
     assert fake_signal.text_messages == [
         "Summary\nhello from sigbot\nref (https://example.com)"
@@ -2003,76 +1687,10 @@ async def test_handle_chat_mention_enforces_plain_text_reply() -> None:
     assert fake_context.appended[0][2] == fake_signal.text_messages[0]
 
 
-@pytest.mark.anyio
-async def test_handle_webhook_empty_mention_sends_usage() -> None:
-    payload = {
-        "envelope": {
-            "sourceNumber": "+15550002222",
-            "timestamp": 1730000000001,
-            "dataMessage": {
-                "message": "@bot",
-                "timestamp": 1730000000001,
-                "groupInfo": {"groupId": "group-1"},
-            },
-        }
-    }
-
-    fake_signal = _FakeSignalClient()
-    handler = WebhookHandler(
-        settings=_settings(mode="group"),
-        signal_client=cast(Any, fake_signal),
-        openrouter_client=cast(Any, _FakeOpenRouterClient()),
-        chat_context=cast(Any, _FakeChatContextStore()),
-        openrouter_image_client=None,
-        dedupe=DedupeCache(ttl_seconds=60),
-    )
-
-    background_tasks = BackgroundTasks()
-    response = await handler.handle_webhook(payload, background_tasks)
-    await _run_background_tasks(background_tasks)
-
-    assert response == {"status": "accepted", "reason": "chat_usage_sent"}
-    assert fake_signal.text_messages
-    assert "Tag me with a prompt" in fake_signal.text_messages[0]
-
-
-@pytest.mark.anyio
-async def test_handle_webhook_imagine_without_image_config_reports_unavailable() -> (
-    None
-):
-    payload = {
-        "envelope": {
-            "sourceNumber": "+15550002222",
-            "timestamp": 1730000000001,
-            "dataMessage": {
-                "message": "/imagine test prompt",
-                "timestamp": 1730000000001,
-                "groupInfo": {"groupId": "group-1"},
-            },
-        }
-    }
-
-    fake_signal = _FakeSignalClient()
-    handler = WebhookHandler(
-        settings=_settings(mode="group"),
-        signal_client=cast(Any, fake_signal),
-        openrouter_client=cast(Any, _FakeOpenRouterClient()),
-        chat_context=cast(Any, _FakeChatContextStore()),
-        openrouter_image_client=None,
-        dedupe=DedupeCache(ttl_seconds=60),
-    )
-
-    background_tasks = BackgroundTasks()
-    response = await handler.handle_webhook(payload, background_tasks)
-    await _run_background_tasks(background_tasks)
-
-    assert response == {"status": "accepted", "reason": "image_unavailable"}
-    assert fake_signal.text_messages == ["Image mode is not configured on this bot."]
-
-
-@pytest.mark.anyio
 async def test_process_imagine_reuses_single_resolved_reply_target(
     monkeypatch: pytest.MonkeyPatch,
+    fake_signal: FakeMessengerClient,
+    make_handler: _HandlerFactory,
 ) -> None:
     resolve_calls = 0
 
@@ -2084,29 +1702,107 @@ async def test_process_imagine_reuses_single_resolved_reply_target(
     monkeypatch.setattr("signal_bot_orx.webhook.resolve_reply_target", _resolve_once)
 
     message = IncomingMessage(
-        sender="+15550002222",
+        sender=_USER,
         text="/imagine fox",
         timestamp=1,
-        target=Target(recipient="+15550002222", group_id="group-1"),
+        target=_GROUP_TARGET,
     )
-    fake_signal = _FakeSignalClient()
-    handler = WebhookHandler(
+    handler = make_handler(
         settings=_settings(
             mode="dm_fallback",
             image_api_key="or-key-image",
             image_model="openai/gpt-image-1",
         ),
-        signal_client=cast(Any, fake_signal),
-        openrouter_client=cast(Any, _FakeOpenRouterClient()),
-        chat_context=cast(Any, _FakeChatContextStore()),
-        openrouter_image_client=cast(Any, _FakeOpenRouterImageClient()),
-        dedupe=DedupeCache(ttl_seconds=60),
+        openrouter_image_client=_FakeOpenRouterImageClient(),
     )
 
     await handler._process_imagine(message, "fox")
 
     assert resolve_calls == 1
     expected_target = Target(recipient=message.sender, group_id=None)
-    assert fake_signal.text_targets == [expected_target]
-    assert fake_signal.image_targets == [expected_target, expected_target]
-    assert fake_signal.image_captions == ["/imagine fox", None]
+    assert [sent.target for sent in fake_signal.sent_text] == [expected_target]
+    assert fake_signal.sent_images == [
+        SentImage(expected_target, "/imagine fox"),
+        SentImage(expected_target, None),
+    ]
+
+
+async def test_webhook_router_validates_json_object_bodies(
+    make_handler: _HandlerFactory,
+) -> None:
+    app = FastAPI()
+    app.include_router(build_router(make_handler(settings=_GROUP_SETTINGS)))
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bot") as client:
+        unsupported = await client.post("/webhook/signal", json={"method": "x"})
+        not_object = await client.post("/webhook/signal", json=[1, 2])
+        invalid = await client.post(
+            "/webhook/signal",
+            content=b"{",
+            headers={"Content-Type": "application/json"},
+        )
+        plain_text = await client.post(
+            "/webhook/signal",
+            content=b'{"method":"x"}',
+            headers={"Content-Type": "text/plain"},
+        )
+        empty = await client.post("/webhook/signal")
+
+    assert unsupported.json() == {"status": "ignored", "reason": "unsupported_event"}
+    assert not_object.status_code == 422
+    assert not_object.json() == {
+        "detail": [
+            {
+                "type": "dict_type",
+                "loc": ["body"],
+                "msg": "Input should be a valid dictionary",
+                "input": [1, 2],
+            }
+        ]
+    }
+    assert invalid.status_code == 422
+    [invalid_error] = invalid.json()["detail"]
+    assert invalid_error["type"] == "json_invalid"
+    assert invalid_error["loc"][0] == "body"
+    assert invalid_error["msg"] == "JSON decode error"
+    assert plain_text.status_code == 422
+    assert plain_text.json()["detail"][0]["type"] == "dict_type"
+    assert plain_text.json()["detail"][0]["input"] == '{"method":"x"}'
+    assert empty.status_code == 422
+    assert empty.json()["detail"][0]["type"] == "missing"
+
+
+def test_webhook_router_documents_json_object_bodies(
+    make_handler: _HandlerFactory,
+) -> None:
+    app = FastAPI()
+    app.include_router(build_router(make_handler(settings=_GROUP_SETTINGS)))
+
+    paths = app.openapi()["paths"]
+
+    for path in ("/webhook/signal", "/webhook/whatsapp", "/webhook/telegram"):
+        body = paths[path]["post"]["requestBody"]
+        assert body["required"] is True
+        assert body["content"]["application/json"]["schema"]["type"] == "object"
+
+
+async def test_process_imagine_sends_notice_before_generation_error(
+    fake_signal: FakeMessengerClient,
+    make_handler: _HandlerFactory,
+) -> None:
+    handler = make_handler(
+        settings=_settings(
+            mode="group",
+            image_api_key="or-key-image",
+            image_model="openai/gpt-image-1",
+        ),
+        openrouter_image_client=_FailingOpenRouterImageClient(),
+    )
+
+    await handler._process_imagine(_MSG_GROUP_ALIAS, "fox")
+
+    assert fake_signal.text_messages == [
+        "Generating image, please wait...",
+        "Image generation failed.",
+    ]
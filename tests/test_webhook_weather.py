@@ -1,164 +1,200 @@
 from __future__ import annotations
 
+from collections.abc import Mapping
+from dataclasses import replace
+from functools import cache
+from types import MappingProxyType
 from typing import cast
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import MagicMock
 
 import pytest
+from _fakes import FakeMessengerClient
 from fastapi import BackgroundTasks
 
 from signal_bot_orx.chat_context import ChatContextStore
 from signal_bot_orx.config import Settings
 from signal_bot_orx.dedupe import DedupeCache
 from signal_bot_orx.signal_client import SignalClient
+from signal_bot_orx.weather_client import OpenWeatherClient
 from signal_bot_orx.webhook import WebhookHandler
 
+pytestmark = pytest.mark.anyio
 
+# Minimal settings with weather enabled
+_BASE_SETTINGS = Settings(
+    signal_api_base_url="http://localhost:8080",
+    signal_sender_number="+15550001111",
+    signal_sender_uuid=None,
+    signal_allowed_numbers=frozenset(["+15550002222"]),
+    signal_allowed_group_ids=frozenset(),
+    openrouter_chat_api_key="sk-or-test",
+    openrouter_model="openai/gpt-4o-mini",
+    signal_enabled=True,
+    signal_disable_auth=False,
+    telegram_enabled=False,
+    telegram_bot_token=None,
+    telegram_webhook_secret=None,
+    telegram_allowed_user_ids=frozenset(),
+    telegram_allowed_chat_ids=frozenset(),
+    telegram_disable_auth=False,
+    telegram_bot_username=None,
+    whatsapp_enabled=False,
+    whatsapp_bridge_base_url=None,
+    whatsapp_bridge_token=None,
+    whatsapp_allowed_numbers=frozenset(),
+    whatsapp_disable_auth=False,
+    openrouter_image_api_key=None,
+    openrouter_image_model=None,
+    openrouter_image_timeout_seconds=90.0,
+    openrouter_base_url="https://openrouter.ai/api/v1",
+    openrouter_timeout_seconds=45.0,
+    openrouter_max_output_tokens=300,
+    openrouter_http_referer=None,
+    openrouter_app_title=None,
+    bot_chat_temperature=0.6,
+    bot_chat_context_turns=6,
+    bot_chat_context_ttl_seconds=1800,
+    bot_chat_system_prompt="You are a bot.",
+    bot_chat_force_plain_text=True,
+    bot_mention_aliases=("@signalbot", "@bot"),
+    bot_max_prompt_chars=700,
+    bot_search_enabled=True,
+    bot_search_context_mode="no_context",
+    bot_search_mode_search_enabled=True,
+    bot_search_mode_news_enabled=True,
+    bot_search_mode_wiki_enabled=True,
+    bot_search_mode_images_enabled=True,
+    bot_search_mode_videos_enabled=True,
+    bot_search_debug_logging=False,
+    bot_search_persona_enabled=False,
+    bot_search_use_history_for_summary=False,
+    bot_search_region="us-en",
+    bot_search_safesearch="moderate",
+    bot_search_backend_search="auto",
+    bot_search_backend_news="auto",
+    bot_search_backend_videos="youtube",
+    bot_search_backend_strategy="first_non_empty",
+    bot_search_backend_search_order=(
+        "duckduckgo",
+        "bing",
+        "google",
+        "yandex",
+        "grokipedia",
+    ),
+    bot_search_backend_news_order=("duckduckgo", "bing", "yahoo"),
+    bot_search_backend_wiki="wikipedia",
+    bot_search_backend_images="duckduckgo",
+    bot_search_text_max_results=5,
+    bot_search_news_max_results=5,
+    bot_search_wiki_max_results=3,
+    bot_search_images_max_results=3,
+    bot_search_videos_max_results=5,
+    bot_search_timeout_seconds=8.0,
+    bot_search_source_ttl_seconds=1800,
+    weather_api_key="testkey",
+    weather_units="metric",  # valid literal
+    weather_default_location="",
+    bot_group_reply_mode="group",
+    bot_webhook_host="127.0.0.1",
+    bot_webhook_port=8001,
+)
+
+
+@cache
 def make_settings(
     weather_api_key: str = "testkey",
     weather_default_location: str = "",
 ) -> Settings:
-    # Minimal settings with weather enabled
-    return Settings(
-        signal_api_base_url="http://localhost:8080",
-        signal_sender_number="+15550001111",
-        signal_sender_uuid=None,
-        signal_allowed_numbers=frozenset(["+15550002222"]),
-        signal_allowed_group_ids=frozenset(),
-        openrouter_chat_api_key="sk-or-test",
-        openrouter_model="openai/gpt-4o-mini",
-        signal_enabled=True,
-        signal_disable_auth=False,
-        telegram_enabled=False,
-        telegram_bot_token=None,
-        telegram_webhook_secret=None,
-        telegram_allowed_user_ids=frozenset(),
-        telegram_allowed_chat_ids=frozenset(),
-        telegram_disable_auth=False,
-        telegram_bot_username=None,
-        whatsapp_enabled=False,
-        whatsapp_bridge_base_url=None,
-        whatsapp_bridge_token=None,
-        whatsapp_allowed_numbers=frozenset(),
-        whatsapp_disable_auth=False,
-        openrouter_image_api_key=None,
-        openrouter_image_model=None,
-        openrouter_image_timeout_seconds=90.0,
-        openrouter_base_url="https://openrouter.ai/api/v1",
-        openrouter_timeout_seconds=45.0,
-        openrouter_max_output_tokens=300,
-        openrouter_http_referer=None,
-        openrouter_app_title=None,
-        bot_chat_temperature=0.6,
-        bot_chat_context_turns=6,
-        bot_chat_context_ttl_seconds=1800,
-        bot_chat_system_prompt="You are a bot.",
-        bot_chat_force_plain_text=True,
-        bot_mention_aliases=("@signalbot", "@bot"),
-        bot_max_prompt_chars=700,
-        bot_search_enabled=True,
-        bot_search_context_mode="no_context",
-        bot_search_mode_search_enabled=True,
-        bot_search_mode_news_enabled=True,
-        bot_search_mode_wiki_enabled=True,
-        bot_search_mode_images_enabled=True,
-        bot_search_mode_videos_enabled=True,
-        bot_search_debug_logging=False,
-        bot_search_persona_enabled=False,
-        bot_search_use_history_for_summary=False,
-        bot_search_region="us-en",
-        bot_search_safesearch="moderate",
-        bot_search_backend_search="auto",
-        bot_search_backend_news="auto",
-        bot_search_backend_videos="youtube",
-        bot_search_backend_strategy="first_non_empty",
-        bot_search_backend_search_order=(
-            "duckduckgo",
-            "bing",
-            "google",
-            "yandex",
-            "grokipedia",
-        ),
-        bot_search_backend_news_order=("duckduckgo", "bing", "yahoo"),
-        bot_search_backend_wiki="wikipedia",
-        bot_search_backend_images="duckduckgo",
-        bot_search_text_max_results=5,
-        bot_search_news_max_results=5,
-        bot_search_wiki_max_results=3,
-        bot_search_images_max_results=3,
-        bot_search_videos_max_results=5,
-        bot_search_timeout_seconds=8.0,
-        bot_search_source_ttl_seconds=1800,
+    return replace(
+        _BASE_SETTINGS,
         weather_api_key=weather_api_key,
-        weather_units="metric",  # valid literal
         weather_default_location=weather_default_location,
-        bot_group_reply_mode="group",
-        bot_webhook_host="127.0.0.1",
-        bot_webhook_port=8001,
     )
 
 
+# Shared by every test; the handler only reads them and never mutates them.
+_CURRENT_PAYLOAD = MappingProxyType(
+    {
+        "name": "London",
+        "sys": {"country": "GB"},
+        "weather": [{"description": "light rain"}],
+        "main": {"temp": 10.5, "feels_like": 9.0, "humidity": 85},
+        "wind": {"speed": 5.5},
+    }
+)
+_FORECAST_PAYLOAD = MappingProxyType(
+    {
+        "city": {"name": "Tokyo", "country": "JP"},
+        "list": (
+            {
+                "dt_txt": "2025-02-16 12:00:00",
+                "weather": [{"description": "sunny"}],
+                "main": {"temp": 15},
+            },
+            {
+                "dt_txt": "2025-02-17 12:00:00",
+                "weather": [{"description": "cloudy"}],
+                "main": {"temp": 12},
+            },
+            {
+                "dt_txt": "2025-02-18 12:00:00",
+                "weather": [{"description": "rain"}],
+                "main": {"temp": 10},
+            },
+            {
+                "dt_txt": "2025-02-19 12:00:00",
+                "weather": [{"description": "storm"}],
+                "main": {"temp": 8},
+            },
+            {
+                "dt_txt": "2025-02-20 12:00:00",
+                "weather": [{"description": "snow"}],
+                "main": {"temp": 2},
+            },
+        ),
+    }
+)
+
+
+class _FakeWeatherClient:
+    def __init__(self) -> None:
+        self.current_calls: list[str] = []
+        self.forecast_calls: list[str] = []
+
+    async def current(self, location: str) -> Mapping[str, object]:
+        self.current_calls.append(location)
+        return _CURRENT_PAYLOAD
+
+    async def forecast(self, location: str) -> Mapping[str, object]:
+        self.forecast_calls.append(location)
+        return _FORECAST_PAYLOAD
+
+
+@pytest.fixture
+def fake_signal() -> FakeMessengerClient:
+    return FakeMessengerClient()
+
+
+@pytest.fixture
+def fake_weather() -> _FakeWeatherClient:
+    return _FakeWeatherClient()
+
+
 def make_handler(
-    settings: Settings | None = None, weather_enabled: bool = True
+    signal_client: FakeMessengerClient,
+    weather_client: _FakeWeatherClient | None,
+    settings: Settings | None = None,
 ) -> WebhookHandler:
-    settings = settings or make_settings()
-    signal_client = MagicMock(spec=SignalClient)
-    signal_client.send_text = AsyncMock()
-    weather_client = MagicMock()
-    weather_client.current = AsyncMock(
-        return_value={
-            "name": "London",
-            "sys": {"country": "GB"},
-            "weather": [{"description": "light rain"}],
-            "main": {"temp": 10.5, "feels_like": 9.0, "humidity": 85},
-            "wind": {"speed": 5.5},
-        }
-    )
-    weather_client.forecast = AsyncMock(
-        return_value={
-            "city": {"name": "Tokyo", "country": "JP"},
-            "list": [
-                {
-                    "dt_txt": "2025-02-16 12:00:00",
-                    "weather": [{"description": "sunny"}],
-                    "main": {"temp": 15},
-                },
-                {
-                    "dt_txt": "2025-02-17 12:00:00",
-                    "weather": [{"description": "cloudy"}],
-                    "main": {"temp": 12},
-                },
-                {
-                    "dt_txt": "2025-02-18 12:00:00",
-                    "weather": [{"description": "rain"}],
-                    "main": {"temp": 10},
-                },
-                {
-                    "dt_txt": "2025-02-19 12:00:00",
-                    "weather": [{"description": "storm"}],
-                    "main": {"temp": 8},
-                },
-                {
-                    "dt_txt": "2025-02-20 12:00:00",
-                    "weather": [{"description": "snow"}],
-                    "main": {"temp": 2},
-                },
-            ],
-        }
-    )
-    if not weather_enabled:
-        weather_client = None
-    chat_context = ChatContextStore(max_turns=6, ttl_seconds=1800)
-    dedupe = DedupeCache(ttl_seconds=300)
     return WebhookHandler(
-        settings=settings,
-        signal_client=signal_client,
+        settings=settings or make_settings(),
+        signal_client=cast(SignalClient, signal_client),
         whatsapp_client=None,
         telegram_client=None,
         openrouter_client=MagicMock(),
         openrouter_image_client=None,
-        chat_context=chat_context,
-        dedupe=dedupe,
-        weather_client=weather_client,
+        chat_context=ChatContextStore(max_turns=6, ttl_seconds=1800),
+        dedupe=DedupeCache(ttl_seconds=300),
+        weather_client=cast(OpenWeatherClient | None, weather_client),
         search_service=None,
     )
 
@@ -180,9 +216,10 @@ async def run_background_tasks(tasks: BackgroundTasks) -> None:
         await func(*task.args, **task.kwargs)
 
 
-@pytest.mark.asyncio
-async def test_weather_current_command() -> None:
-    handler = make_handler()
+async def test_weather_current_command(
+    fake_signal: FakeMessengerClient, fake_weather: _FakeWeatherClient
+) -> None:
+    handler = make_handler(fake_signal, fake_weather)
     payload = make_signal_webhook(sender="+15550002222", text="/weather London")
     background_tasks = BackgroundTasks()
     result = await handler.handle_webhook(
@@ -192,18 +229,16 @@ async def test_weather_current_command() -> None:
     assert result["reason"] == "weather_queued"
     await run_background_tasks(background_tasks)
 
-    # Cast to MagicMock for type checking
-    signal_client = cast(MagicMock, handler._signal_client)
-    signal_client.send_text.assert_awaited_once()
-    _, kwargs = signal_client.send_text.call_args
-    reply_text = kwargs["message"]
+    assert len(fake_signal.text_messages) == 1
+    reply_text = fake_signal.text_messages[0]
     assert "Weather for London" in reply_text
     assert "10.5°C" in reply_text
 
 
-@pytest.mark.asyncio
-async def test_weather_forecast_command() -> None:
-    handler = make_handler()
+async def test_weather_forecast_command(
+    fake_signal: FakeMessengerClient, fake_weather: _FakeWeatherClient
+) -> None:
+    handler = make_handler(fake_signal, fake_weather)
     payload = make_signal_webhook(sender="+15550002222", text="/forecast Tokyo")
     background_tasks = BackgroundTasks()
     result = await handler.handle_webhook(
@@ -213,17 +248,17 @@ async def test_weather_forecast_command() -> None:
     assert result["reason"] == "forecast_queued"
     await run_background_tasks(background_tasks)
 
-    signal_client = cast(MagicMock, handler._signal_client)
-    signal_client.send_text.assert_awaited_once()
-    _, kwargs = signal_client.send_text.call_args
-    reply_text = kwargs["message"]
+    assert len(fake_signal.text_messages) == 1
+    reply_text = fake_signal.text_messages[0]
     assert "5-day forecast for Tokyo" in reply_text
+    assert fake_weather.forecast_calls == ["Tokyo"]
 
 
-@pytest.mark.asyncio
-async def test_weather_missing_location_uses_default() -> None:
+async def test_weather_missing_location_uses_default(
+    fake_signal: FakeMessengerClient, fake_weather: _FakeWeatherClient
+) -> None:
     settings = make_settings(weather_default_location="Paris")
-    handler = make_handler(settings=settings)
+    handler = make_handler(fake_signal, fake_weather, settings=settings)
     payload = make_signal_webhook(sender="+15550002222", text="/weather")
     background_tasks = BackgroundTasks()
     result = await handler.handle_webhook(
@@ -233,21 +268,19 @@ async def test_weather_missing_location_uses_default() -> None:
     assert result["reason"] == "weather_queued"
     await run_background_tasks(background_tasks)
 
-    signal_client = cast(MagicMock, handler._signal_client)
-    signal_client.send_text.assert_awaited_once()
+    assert len(fake_signal.text_messages) == 1
 
-    weather_client = cast(MagicMock, handler._weather_client)
-    weather_client.current.assert_awaited_with("Paris")
+    assert fake_weather.current_calls == ["Paris"]
 
-    _, kwargs = signal_client.send_text.call_args
-    reply_text = kwargs["message"]
-    # Mock returns London data regardless of input
+    reply_text = fake_signal.text_messages[0]
+    # The fake returns London data regardless of input
     assert "Weather for London" in reply_text
 
 
-@pytest.mark.asyncio
-async def test_weather_disabled_when_no_client() -> None:
-    handler = make_handler(weather_enabled=False)
+async def test_weather_disabled_when_no_client(
+    fake_signal: FakeMessengerClient,
+) -> None:
+    handler = make_handler(fake_signal, None)
     payload = make_signal_webhook(sender="+15550002222", text="/weather London")
     background_tasks = BackgroundTasks()
     result = await handler.handle_webhook(
@@ -257,8 +290,6 @@ async def test_weather_disabled_when_no_client() -> None:
     assert result["reason"] == "weather_disabled"
     await run_background_tasks(background_tasks)
 
-    signal_client = cast(MagicMock, handler._signal_client)
-    signal_client.send_text.assert_awaited_once()
-    _, kwargs = signal_client.send_text.call_args
-    reply_text = kwargs["message"]
+    assert len(fake_signal.text_messages) == 1
+    reply_text = fake_signal.text_messages[0]
     assert "Weather is not configured on this bot." in reply_text
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import base64
+
+import httpx
+import orjson
+import pytest
+from _fakes import MockHttp
+
+from signal_bot_orx.types import Target
+from signal_bot_orx.whatsapp_client import WhatsAppClient, WhatsAppSendError
+
+
+@pytest.mark.anyio
+async def test_whatsapp_client_send_text_posts_json_with_token(
+    mock_http: MockHttp,
+) -> None:
+    async def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.path == "/send/text"
+        assert request.headers["Authorization"] == "Bearer bridge-token"
+        assert request.headers["Content-Type"] == "application/json"
+        assert orjson.loads(request.content) == {
+            "chatId": "user@c.us",
+            "text": "hello",
+        }
+        return httpx.Response(200)
+
+    client = WhatsAppClient(
+        base_url="http://bridge.local/",
+        http_client=mock_http.set_handler(handler),
+        token="bridge-token",
+    )
+    await client.send_text(target=Target(recipient="user@c.us"), message="hello")
+
+
+@pytest.mark.anyio
+async def test_whatsapp_client_send_image_encodes_base64(mock_http: MockHttp) -> None:
+    async def handler(request: httpx.Request) -> httpx.Response:
+        assert "Authorization" not in request.headers
+        assert orjson.loads(request.content) == {
+            "chatId": "123@g.us",
+            "imageBase64": base64.b64encode(b"img").decode("ascii"),
+            "mimeType": "image/png",
+            "caption": "cap",
+        }
+        return httpx.Response(200)
+
+    client = WhatsAppClient(
+        base_url="http://bridge.local",
+        http_client=mock_http.set_handler(handler),
+    )
+    await client.send_image(
+        target=Target(group_id="123@g.us"),
+        image_bytes=b"img",
+        content_type="image/png",
+        caption="cap",
+    )
+
+
+@pytest.mark.anyio
+async def test_whatsapp_client_http_error_maps_to_send_error(
+    mock_http: MockHttp,
+) -> None:
+    async def handler(_: httpx.Request) -> httpx.Response:
+        return httpx.Response(502, text="bridge down")
+
+    client = WhatsAppClient(
+        base_url="http://bridge.local",
+        http_client=mock_http.set_handler(handler),
+    )
+    with pytest.raises(WhatsAppSendError, match="bridge down"):
+        await client.send_text(target=Target(recipient="user@c.us"), message="hi")